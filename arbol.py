@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo del Árbol de Huffman
+
+Este módulo contiene el árbol, la generación de códigos y los códigos
+canónicos, que comparten el codificador y el decodificador. No depende del
+resto del códec, así que decodificar no carga el codificador (ni NumPy ni
+los módulos de procesos en paralelo).
+"""
+
+import heapq
+
+# --------------------------------------------------
+# Estructuras de Datos
+# --------------------------------------------------
+class NodoArbol:
+    """
+    Nodo del árbol de Huffman.
+    
+    Usa ``__slots__`` para que cada nodo ocupe lo mínimo: el árbol de un
+    alfabeto grande tiene decenas de miles de nodos y el diccionario de
+    atributos de cada instancia pesaba más que los propios datos.
+    """
+    
+    __slots__ = ('caracter', 'frecuencia', 'izquierda', 'derecha')
+    
+    def __init__(self, caracter, frecuencia):
+        self.caracter = caracter
+        self.frecuencia = frecuencia
+        self.izquierda = None
+        self.derecha = None
+    
+    def __lt__(self, otro):
+        """Permite comparar nodos por frecuencia para el heap."""
+        return self.frecuencia < otro.frecuencia
+
+# --------------------------------------------------
+# Construcción del Árbol
+# --------------------------------------------------
+def construir_arbol(frecuencias):
+    """
+    Construye el árbol de Huffman a partir de las frecuencias.
+    
+    Args:
+        frecuencias (dict): Diccionario de frecuencias de caracteres
+        
+    Returns:
+        NodoHuffman: Raíz del árbol construido, o None si no hay frecuencias
+    """
+    if not frecuencias:
+        return None
+    
+    # Crear nodos iniciales
+    monticulo = [NodoArbol(caracter, freq) for caracter, freq in frecuencias.items()]
+    heapq.heapify(monticulo)
+    
+    # Construir árbol combinando nodos
+    while len(monticulo) > 1:
+        izquierda = heapq.heappop(monticulo)
+        derecha = heapq.heappop(monticulo)
+        
+        # Crear nodo padre
+        nodo_padre = NodoArbol(None, izquierda.frecuencia + derecha.frecuencia)
+        nodo_padre.izquierda = izquierda
+        nodo_padre.derecha = derecha
+        
+        heapq.heappush(monticulo, nodo_padre)
+    
+    return monticulo[0] if monticulo else None
+
+# --------------------------------------------------
+# Generación de Códigos
+# --------------------------------------------------
+def generar_codigos_enteros(raiz):
+    """
+    Genera los códigos de Huffman como pares (valor, longitud).
+    
+    Recorre el árbol con una pila explícita, así que un árbol degenerado
+    (frecuencias tipo Fibonacci) no agota el límite de recursión, y cada
+    código es un entero que se extiende con un desplazamiento en lugar de
+    copiar un string por nivel. Los caracteres quedan en el mismo orden que
+    el recorrido recursivo (primero la rama izquierda).
+    
+    Args:
+        raiz (NodoArbol): Raíz del árbol de Huffman
+        
+    Returns:
+        dict: Diccionario {caracter: (valor_entero, longitud_en_bits)}. Un
+        árbol de un solo nodo recibe el código vacío (0, 0).
+    """
+    if raiz is None:
+        return {}
+    
+    codigos = {}
+    pendientes = [(raiz, 0, 0)]
+    while pendientes:
+        nodo, valor, longitud = pendientes.pop()
+        if nodo is None:
+            # Rama vacía (árbol canónico de un solo símbolo)
+            continue
+        if nodo.caracter is not None:
+            codigos[nodo.caracter] = (valor, longitud)
+        else:
+            valor <<= 1
+            pendientes.append((nodo.derecha, valor | 1, longitud + 1))
+            pendientes.append((nodo.izquierda, valor, longitud + 1))
+    return codigos
+
+def generar_codigos(raiz, codigo_actual="", codigos=None):
+    """
+    Genera los códigos de Huffman para cada carácter.
+    
+    Los códigos se calculan como enteros (ver `generar_codigos_enteros`) y
+    se pasan a string una sola vez por hoja, para mostrarlos o escribirlos.
+    
+    Args:
+        raiz (NodoHuffman): Raíz del árbol de Huffman
+        codigo_actual (str): Prefijo que se antepone a todos los códigos
+        codigos (dict): Diccionario donde agregar los códigos (opcional)
+        
+    Returns:
+        dict: Diccionario con caracteres como claves y códigos binarios como valores
+    """
+    if codigos is None:
+        codigos = {}
+    
+    if raiz is None:
+        return {}
+    
+    for caracter, codigo in codigos_a_texto(generar_codigos_enteros(raiz)).items():
+        codigos[caracter] = codigo_actual + codigo
+    
+    return codigos
+
+# --------------------------------------------------
+# Códigos Canónicos
+# --------------------------------------------------
+def longitudes_desde_arbol(raiz):
+    """
+    Obtiene la longitud del código de cada carácter (profundidad de su hoja).
+    
+    Args:
+        raiz (NodoArbol): Raíz del árbol de Huffman
+        
+    Returns:
+        dict: Diccionario {caracter: longitud_en_bits}. Un árbol de un solo
+        nodo recibe longitud 1 para que el código no sea vacío.
+    """
+    if raiz is None:
+        return {}
+    if raiz.caracter is not None:
+        return {raiz.caracter: 1}
+    
+    longitudes = {}
+    pendientes = [(raiz, 0)]
+    while pendientes:
+        nodo, profundidad = pendientes.pop()
+        if nodo.caracter is not None:
+            longitudes[nodo.caracter] = profundidad
+        else:
+            pendientes.append((nodo.derecha, profundidad + 1))
+            pendientes.append((nodo.izquierda, profundidad + 1))
+    return longitudes
+
+def codigos_canonicos(longitudes):
+    """
+    Asigna los códigos de Huffman canónicos a partir de sus longitudes.
+    
+    Los símbolos se ordenan por (longitud, símbolo) y reciben códigos
+    consecutivos, así que el resultado depende solo de las longitudes y no
+    del desempate del montículo.
+    
+    Args:
+        longitudes (dict): Diccionario {simbolo: longitud_en_bits}
+        
+    Returns:
+        dict: Diccionario {simbolo: (valor, longitud)} en orden canónico
+        
+    Raises:
+        ValueError: Si las longitudes no pueden formar un código prefijo
+    """
+    codigos = {}
+    codigo = 0
+    longitud_anterior = 0
+    for simbolo, longitud in sorted(longitudes.items(), key=lambda par: (par[1], par[0])):
+        if longitud < 1:
+            raise ValueError("Las longitudes de código deben ser positivas")
+        codigo <<= longitud - longitud_anterior
+        if codigo >= 1 << longitud:
+            raise ValueError("Las longitudes no forman un código prefijo válido")
+        codigos[simbolo] = (codigo, longitud)
+        codigo += 1
+        longitud_anterior = longitud
+    return codigos
+
+def codigos_a_texto(codigos):
+    """
+    Convierte códigos (valor, longitud) al formato de string de '0'/'1'.
+    
+    Args:
+        codigos (dict): Diccionario {simbolo: (valor, longitud)}
+        
+    Returns:
+        dict: Diccionario {simbolo: código binario como string}
+    """
+    return {simbolo: format(valor, f'0{longitud}b') if longitud else ''
+            for simbolo, (valor, longitud) in codigos.items()}
+
+def arbol_desde_codigos(codigos, frecuencias=None):
+    """
+    Construye el árbol que corresponde a un conjunto de códigos.
+    
+    Args:
+        codigos (dict): Diccionario {caracter: (valor, longitud)}
+        frecuencias (dict): Frecuencias para etiquetar las hojas (opcional)
+        
+    Returns:
+        NodoArbol: Raíz del árbol, con las frecuencias internas sumadas
+    """
+    if not codigos:
+        return None
+    
+    frecuencias = frecuencias or {}
+    raiz = NodoArbol(None, 0)
+    for caracter, (valor, longitud) in codigos.items():
+        nodo = raiz
+        for posicion in range(longitud - 1, -1, -1):
+            if (valor >> posicion) & 1:
+                if nodo.derecha is None:
+                    nodo.derecha = NodoArbol(None, 0)
+                nodo = nodo.derecha
+            else:
+                if nodo.izquierda is None:
+                    nodo.izquierda = NodoArbol(None, 0)
+                nodo = nodo.izquierda
+        nodo.caracter = caracter
+        nodo.frecuencia = frecuencias.get(caracter, 0)
+    
+    # Sumar frecuencias hacia arriba (recorrido en postorden iterativo)
+    pendientes = [(raiz, False)]
+    while pendientes:
+        nodo, visitado = pendientes.pop()
+        if nodo.caracter is not None:
+            continue
+        if visitado:
+            nodo.frecuencia = sum(
+                hijo.frecuencia for hijo in (nodo.izquierda, nodo.derecha) if hijo is not None
+            )
+        else:
+            pendientes.append((nodo, True))
+            for hijo in (nodo.izquierda, nodo.derecha):
+                if hijo is not None:
+                    pendientes.append((hijo, False))
+    return raiz
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Codificación Asíncrona
+
+Este módulo contiene variantes async de codificar_mensaje() y
+decodificar_archivo() para usar el códec dentro de un servicio asyncio sin
+bloquear el bucle de eventos:
+
+- Los archivos se leen de una vez en un hilo y se escriben por trozos, con
+  un punto de cancelación entre trozo y trozo. La salida se escribe en un
+  archivo temporal que reemplaza al destino solo al terminar, así que una
+  tarea cancelada no deja archivos a medio escribir.
+- El trabajo de CPU (frecuencias, códigos, bits y decodificación) se envía a
+  un ejecutor configurable. Con el ejecutor por defecto (hilos) el bucle
+  sigue respondiendo pero comparte el GIL; para mensajes grandes conviene un
+  ProcessPoolExecutor.
+- Un semáforo limita cuántas operaciones corren a la vez; las demás esperan
+  su turno sin ocupar el ejecutor.
+- Los diccionarios de los registros de versión 4 se indican al crear el
+  códec y cada proceso del ejecutor los carga la primera vez que decodifica.
+- Los mensajes de más de un bloque se guardan, salvo que se pida otra
+  versión, en el contenedor de versión 3: cada bloque lleva su CRC32 y uno
+  dañado se detecta, con su posición, sin decodificar el resto.
+
+Uso:
+    codec = CodecAsincrono(ejecutor=ProcessPoolExecutor(4), max_concurrentes=8)
+    resumen = await codec.codificar_mensaje(texto, 'mensaje.bin')
+    texto = await codec.decodificar_archivo('mensaje.bin')
+"""
+
+import asyncio
+import io
+import os
+import uuid
+from contextlib import nullcontext
+
+from codificador import codificar_en_memoria, codificar_binario, codificar_paralelo
+from decodificador import decodificar_registro, cargar_diccionario
+from formato import VERSION_ACTUAL, VERSION_CANONICA, VERSION_BLOQUES
+
+# Tamaño de cada escritura de archivo (entre trozos se puede cancelar)
+TAMAÑO_TROZO = 1 << 20
+
+# Símbolos por bloque del contenedor de versión 3
+TAMAÑO_BLOQUE = 1 << 20
+
+# Diccionarios ya cargados en este proceso (cada proceso del pool tiene el suyo)
+_diccionarios_cargados = set()
+
+# --------------------------------------------------
+# Trabajo en el Ejecutor
+# --------------------------------------------------
+def _codificar(mensaje, version, longitud_maxima, suma_verificacion, tamaño_bloque):
+    """
+    Codifica en el ejecutor devolviendo solo lo que se usa fuera de él.
+
+    El árbol y la SecuenciaBits no se devuelven: con un pool de procesos
+    habría que serializarlos y los datos viajarían dos veces.
+
+    Returns:
+        tuple: (cabecera, datos, codigos, bits_totales). En la versión 3 el
+        contenedor completo va en `datos` y `codigos` es la tabla compartida
+    """
+    if version is None:
+        version = VERSION_BLOQUES if len(mensaje) > tamaño_bloque else VERSION_ACTUAL
+    if version == VERSION_BLOQUES:
+        contenedor = io.BytesIO()
+        resumen = codificar_paralelo(mensaje, contenedor, tamaño_bloque, procesos=1,
+                                     longitud_maxima=longitud_maxima,
+                                     suma_verificacion=suma_verificacion)
+        return b"", contenedor.getvalue(), resumen['codigos'], resumen['bits_totales']
+
+    if not isinstance(mensaje, str):
+        if version != VERSION_CANONICA:
+            raise ValueError("Los datos binarios se guardan con la versión 2 o 3")
+        archivo = io.BytesIO()
+        _, codigos, bits = codificar_binario(mensaje, archivo, longitud_maxima,
+                                             suma_verificacion)
+        return b"", archivo.getvalue(), codigos, len(bits)
+
+    cabecera, datos, _, codigos, bits = codificar_en_memoria(mensaje, version, longitud_maxima,
+                                                             suma_verificacion)
+    return cabecera, datos, codigos, len(bits)
+
+def _decodificar(datos, diccionarios):
+    """
+    Decodifica en el ejecutor, cargando antes los diccionarios que falten.
+
+    En un pool de procesos cada proceso empieza sin diccionarios: se cargan
+    la primera vez que ese proceso decodifica y quedan registrados.
+    """
+    for ruta in diccionarios:
+        if ruta not in _diccionarios_cargados:
+            cargar_diccionario(ruta)
+            _diccionarios_cargados.add(ruta)
+    return decodificar_registro(datos)
+
+def _leer_archivo(nombre_archivo):
+    """Abre, lee y cierra un archivo en el mismo hilo del ejecutor."""
+    with open(nombre_archivo, 'rb') as archivo:
+        return archivo.read()
+
+def _crear_temporal(nombre_archivo):
+    """
+    Crea un archivo temporal con nombre único junto al destino.
+
+    Se crea con 0o666 y el sistema aplica la umask, como a cualquier archivo
+    nuevo (mkstemp lo dejaría solo para el dueño).
+
+    Returns:
+        tuple: (descriptor, ruta del temporal)
+    """
+    directorio, base = os.path.split(os.path.abspath(nombre_archivo))
+    modo = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        temporal = os.path.join(directorio, f"{base}.{uuid.uuid4().hex[:12]}.parcial")
+        try:
+            return os.open(temporal, modo, 0o666), temporal
+        except FileExistsError:
+            continue
+
+# --------------------------------------------------
+# Códec Asíncrono
+# --------------------------------------------------
+class CodecAsincrono:
+    """
+    Codificador y decodificador para asyncio.
+
+    Cancelar la tarea que espera una operación la interrumpe en el siguiente
+    trozo de escritura; una lectura o un trabajo que ya empezó en el ejecutor termina en segundo
+    plano y su resultado se descarta. El semáforo de concurrencia pertenece
+    al bucle de eventos donde se usa por primera vez, así que cada bucle
+    debe tener su propio códec.
+    """
+
+    def __init__(self, ejecutor=None, max_concurrentes=None, tamaño_trozo=TAMAÑO_TROZO,
+                 tamaño_bloque=TAMAÑO_BLOQUE, diccionarios=()):
+        """
+        Args:
+            ejecutor (concurrent.futures.Executor): Ejecutor para el trabajo
+                de CPU (None = el ejecutor por defecto del bucle). Los
+                archivos siempre se leen y escriben en el de por defecto.
+            max_concurrentes (int): Operaciones simultáneas (None = sin límite)
+            tamaño_trozo (int): Bytes por escritura de archivo
+            tamaño_bloque (int): Símbolos por bloque de la versión 3
+            diccionarios (iterable): Rutas de los diccionarios para los
+                registros de versión 4 (ver codificador.guardar_diccionario())
+        """
+        if max_concurrentes is not None and max_concurrentes < 1:
+            raise ValueError("max_concurrentes debe ser al menos 1")
+        self.ejecutor = ejecutor
+        self.max_concurrentes = max_concurrentes
+        self.tamaño_trozo = tamaño_trozo
+        self.tamaño_bloque = tamaño_bloque
+        self.diccionarios = tuple(os.path.abspath(ruta) for ruta in diccionarios)
+        self._limite = asyncio.Semaphore(max_concurrentes) if max_concurrentes else nullcontext()
+
+    async def _en_ejecutor(self, funcion, *argumentos):
+        """Ejecuta una función de CPU en el ejecutor configurado."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.ejecutor, funcion, *argumentos)
+
+    async def _leer(self, nombre_archivo):
+        """
+        Lee un archivo completo en un hilo, sin bloquear el bucle.
+
+        Abrir, leer y cerrar van juntos en el hilo: si la tarea se cancela
+        mientras espera, el archivo se cierra igual al terminar la lectura.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _leer_archivo, nombre_archivo)
+
+    async def _escribir(self, nombre_archivo, partes):
+        """
+        Escribe las partes por trozos en un temporal y lo mueve al destino.
+
+        El temporal tiene un nombre único en el directorio del destino, así
+        que varias escrituras al mismo destino no se pisan (gana la última
+        en terminar). Si la tarea se cancela o falla, el temporal se borra y
+        el destino queda como estaba.
+        """
+        loop = asyncio.get_running_loop()
+        # Se crea en este hilo: si se esperara en el ejecutor, una cancelación
+        # durante la espera dejaría el temporal creado y sin borrar
+        descriptor, temporal = _crear_temporal(nombre_archivo)
+        try:
+            with open(descriptor, 'wb') as archivo:
+                for parte in partes:
+                    vista = memoryview(parte)
+                    for inicio in range(0, len(vista), self.tamaño_trozo):
+                        await loop.run_in_executor(
+                            None, archivo.write, vista[inicio:inicio + self.tamaño_trozo])
+            os.replace(temporal, nombre_archivo)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+    async def codificar(self, mensaje, version=None, longitud_maxima=None,
+                        suma_verificacion=True):
+        """
+        Codifica un mensaje en memoria.
+
+        Args:
+            mensaje (str | bytes): El mensaje o los datos binarios a codificar
+            version (int): Versión del formato (1: frecuencias, 2: códigos
+                canónicos, 3: bloques; None = 3 si el mensaje ocupa más de
+                un bloque y 2 si no)
+            longitud_maxima (int): Longitud máxima de los códigos (None = sin límite)
+            suma_verificacion (bool): Guardar el CRC32 del contenido (por bloque en la versión 3)
+
+        Returns:
+            bytes: Contenido del archivo .bin (ver decodificar())
+
+        Raises:
+            ValueError: Si el mensaje está vacío, o si son bytes y se pide la versión 1
+        """
+        async with self._limite:
+            cabecera, datos, _, _ = await self._en_ejecutor(
+                _codificar, mensaje, version, longitud_maxima, suma_verificacion,
+                self.tamaño_bloque)
+        return cabecera + datos
+
+    async def codificar_mensaje(self, mensaje, nombre_archivo, version=None,
+                                longitud_maxima=None, suma_verificacion=True):
+        """
+        Codifica un mensaje y lo guarda en un archivo .bin.
+
+        Args:
+            mensaje (str | bytes): El mensaje o los datos binarios a codificar
+            nombre_archivo (str): Ruta del archivo donde guardar
+            version (int): Versión del formato (1: frecuencias, 2: códigos
+                canónicos, 3: bloques; None = 3 si el mensaje ocupa más de
+                un bloque y 2 si no)
+            longitud_maxima (int): Longitud máxima de los códigos (None = sin límite)
+            suma_verificacion (bool): Guardar el CRC32 del contenido (por bloque en la versión 3)
+
+        Returns:
+            dict: Resumen con 'num_simbolos', 'bits_totales', 'tamaño_archivo' y
+            'codigos'. A diferencia de codificador.codificar_mensaje() no
+            devuelve el árbol ni los bits, que no salen del ejecutor.
+
+        Raises:
+            ValueError: Si el mensaje está vacío, o si son bytes y se pide la versión 1
+            IOError: Si hay problemas al escribir el archivo
+        """
+        async with self._limite:
+            cabecera, datos, codigos, bits_totales = await self._en_ejecutor(
+                _codificar, mensaje, version, longitud_maxima, suma_verificacion,
+                self.tamaño_bloque)
+            await self._escribir(nombre_archivo, (cabecera, datos))
+        return {
+            'num_simbolos': len(mensaje),
+            'bits_totales': bits_totales,
+            'tamaño_archivo': len(cabecera) + len(datos),
+            'codigos': codigos
+        }
+
+    async def decodificar(self, datos):
+        """
+        Decodifica un archivo .bin que ya está en memoria.
+
+        Args:
+            datos (bytes | bytearray): Contenido del archivo
+
+        Returns:
+            str | bytes: Mensaje decodificado (bytes si se codificó en modo binario)
+
+        Raises:
+            ValueError: Si los datos están corruptos o falta su diccionario
+        """
+        async with self._limite:
+            return await self._en_ejecutor(_decodificar, datos, self.diccionarios)
+
+    async def decodificar_archivo(self, nombre_archivo):
+        """
+        Lee y decodifica un archivo .bin.
+
+        Args:
+            nombre_archivo (str): Ruta del archivo .bin
+
+        Returns:
+            str | bytes: Mensaje decodificado. A diferencia de
+            decodificador.decodificar_archivo() no devuelve el árbol ni los bits.
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe
+            ValueError: Si el archivo está corrupto o falta su diccionario
+        """
+        async with self._limite:
+            datos = await self._leer(nombre_archivo)
+            return await self._en_ejecutor(_decodificar, datos, self.diccionarios)
+
+# --------------------------------------------------
+# Funciones de Conveniencia
+# --------------------------------------------------
+async def codificar_mensaje_async(mensaje, nombre_archivo, version=None,
+                                  longitud_maxima=None, ejecutor=None, suma_verificacion=True):
+    """
+    Variante async de codificar_mensaje() sin límite de concurrencia.
+
+    Returns:
+        dict: Resumen (ver CodecAsincrono.codificar_mensaje())
+    """
+    return await CodecAsincrono(ejecutor).codificar_mensaje(
+        mensaje, nombre_archivo, version, longitud_maxima, suma_verificacion)
+
+async def decodificar_archivo_async(nombre_archivo, ejecutor=None, diccionarios=()):
+    """
+    Variante async de decodificar_archivo() sin límite de concurrencia.
+
+    Returns:
+        str | bytes: Mensaje decodificado
+    """
+    return await CodecAsincrono(ejecutor, diccionarios=diccionarios).decodificar_archivo(nombre_archivo)
+
+# --------------------------------------------------
+# Función de Prueba
+# --------------------------------------------------
+def prueba_asincrona():
+    """Función de prueba para verificar el funcionamiento del módulo."""
+    mensajes = ("HOLA MUNDO", b"\x00\x01\x01\xff", "ñandú " * 50)
+    archivo_temp = "prueba_asincrona.bin"
+
+    async def ida_y_vuelta(codec):
+        resultados = []
+        for mensaje in mensajes:
+            resultados.append(await codec.decodificar(await codec.codificar(mensaje)) == mensaje)
+        await codec.codificar_mensaje(mensajes[1], archivo_temp)
+        resultados.append(await codec.decodificar_archivo(archivo_temp) == mensajes[1])
+        return resultados
+
+    try:
+        print("=== PRUEBA ASÍNCRONA ===")
+        # Con bloques pequeños el último mensaje va en el contenedor de versión 3
+        resultados = asyncio.run(ida_y_vuelta(CodecAsincrono(max_concurrentes=2, tamaño_bloque=64)))
+        for descripcion, coincide in zip(("texto", "bytes", "bloques", "archivo"), resultados):
+            print(f"{descripcion}: {'✅' if coincide else '❌'}")
+
+        # Limpiar
+        if os.path.exists(archivo_temp):
+            os.remove(archivo_temp)
+
+        return all(resultados)
+
+    except Exception as e:
+        print(f"Error en prueba: {e}")
+        return False
+
+if __name__ == "__main__":
+    prueba_asincrona()
@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Benchmarks
+
+Este módulo mide el rendimiento del codificador y el decodificador sobre
+corpus sintéticos reproducibles (uniforme, Zipf, un solo símbolo y alfabeto
+grande) de 1 KB a 1 GB. Cada etapa se mide por separado, se registra el pico
+de memoria (RSS) de cada caso y los resultados se guardan en JSON para
+compararlos entre commits.
+
+Uso:
+    python benchmark.py --corpus zipf uniforme --tamaños 1KB 1MB 64MB \\
+        --salida actual.json --comparar base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows: no hay getrusage
+    resource = None
+
+import codificador
+import decodificador
+from codificador import calcular_frecuencias, construir_arbol, generar_codigos, codificar_mensaje
+from decodificador import (
+    leer_cabecera_archivo, leer_datos_codificados, leer_bytes_codificados, decodificar_bits,
+    decodificar_archivo
+)
+from bits import SecuenciaBits
+from formato import VERSION_ACTUAL
+
+# --------------------------------------------------
+# Constantes
+# --------------------------------------------------
+CORPUS = ('uniforme', 'zipf', 'un_simbolo', 'alfabeto_grande')
+TAMAÑOS_POR_DEFECTO = ('1KB', '64KB', '1MB')
+ETAPAS = (
+    'calcular_frecuencias', 'construir_arbol', 'generar_codigos', 'codificar_mensaje',
+    'leer_datos_codificados', 'decodificar_bits', 'decodificar_archivo'
+)
+
+# Versión del esquema del JSON de resultados
+VERSION_RESULTADOS = 1
+
+# Los corpus grandes repiten una muestra aleatoria de este tamaño (en caracteres)
+TAMAÑO_MUESTRA = 1 << 20
+
+# leer_datos_codificados devuelve un string con un carácter por bit: por encima
+# de este tamaño codificado (en bytes) la etapa se omite para no agotar la memoria
+LIMITE_BITS_TEXTO = 64 << 20
+
+UNIDADES = {'B': 1, 'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+
+# Procesos que se miden en el arranque en frío ({archivo} es un .bin pequeño)
+PROGRAMAS_ARRANQUE = {
+    'interprete': "pass",
+    'decodificar_archivo': (
+        "from decodificador import decodificar_archivo; decodificar_archivo({archivo!r})"
+    ),
+    'cli_decompress': (
+        "import sys; sys.argv = ['huffman', 'decompress', {archivo!r}, '-o', '-', '-q']; "
+        "import huffman; sys.exit(huffman.main())"
+    ),
+}
+
+# Cuenta los módulos que carga una decodificación aislada
+PROGRAMA_MODULOS = (
+    "import sys; antes = set(sys.modules); "
+    "from decodificador import decodificar_archivo; decodificar_archivo({archivo!r}); "
+    "print(' '.join(sorted(set(sys.modules) - antes)))"
+)
+
+# --------------------------------------------------
+# Corpus Sintéticos
+# --------------------------------------------------
+def interpretar_tamaño(texto):
+    """
+    Convierte un tamaño como '64KB' o '1GB' a bytes.
+
+    Args:
+        texto (str): Número seguido opcionalmente de B, KB, MB o GB
+
+    Returns:
+        int: Tamaño en bytes
+
+    Raises:
+        ValueError: Si el texto no es un tamaño válido
+    """
+    texto = texto.strip().upper()
+    for unidad in ('GB', 'MB', 'KB', 'B'):
+        if texto.endswith(unidad):
+            numero = texto[:-len(unidad)]
+            break
+    else:
+        unidad, numero = 'B', texto
+    try:
+        valor = int(float(numero) * UNIDADES[unidad])
+    except ValueError:
+        raise ValueError(f"Tamaño inválido: '{texto}'") from None
+    if valor <= 0:
+        raise ValueError(f"Tamaño inválido: '{texto}'")
+    return valor
+
+def formatear_tamaño(tamaño):
+    """
+    Muestra un tamaño en bytes con la unidad más grande que lo divide.
+
+    Args:
+        tamaño (int): Tamaño en bytes
+
+    Returns:
+        str: Por ejemplo '64KB'
+    """
+    for unidad in ('GB', 'MB', 'KB'):
+        if tamaño % UNIDADES[unidad] == 0:
+            return f"{tamaño // UNIDADES[unidad]}{unidad}"
+    return f"{tamaño}B"
+
+def generar_corpus(tipo, tamaño, semilla=0):
+    """
+    Genera un corpus sintético reproducible.
+
+    Tipos:
+        uniforme: los 95 caracteres ASCII imprimibles con igual probabilidad
+        zipf: los mismos caracteres con probabilidad 1/rango
+        un_simbolo: un único carácter repetido
+        alfabeto_grande: 20000 ideogramas CJK (3 bytes en UTF-8) uniformes
+
+    Se sortea una muestra de hasta TAMAÑO_MUESTRA caracteres y se repite
+    hasta completar el tamaño: las frecuencias relativas son las mismas y
+    generar 1 GB no tarda más que el propio benchmark.
+
+    Args:
+        tipo (str): Uno de CORPUS
+        tamaño (int): Tamaño del corpus en bytes UTF-8
+        semilla (int): Semilla del generador aleatorio
+
+    Returns:
+        str: Corpus generado
+
+    Raises:
+        ValueError: Si el tipo no existe
+    """
+    generador = random.Random(semilla)
+    imprimibles = [chr(codigo) for codigo in range(32, 127)]
+
+    if tipo == 'uniforme':
+        alfabeto, pesos, ancho = imprimibles, None, 1
+    elif tipo == 'zipf':
+        alfabeto = imprimibles[:]
+        generador.shuffle(alfabeto)
+        pesos, ancho = [1 / rango for rango in range(1, len(alfabeto) + 1)], 1
+    elif tipo == 'un_simbolo':
+        alfabeto, pesos, ancho = ['a'], None, 1
+    elif tipo == 'alfabeto_grande':
+        alfabeto = [chr(0x4E00 + indice) for indice in range(20000)]
+        pesos, ancho = None, 3
+    else:
+        raise ValueError(f"Corpus desconocido: '{tipo}' (opciones: {', '.join(CORPUS)})")
+
+    caracteres = max(tamaño // ancho, 1)
+    if len(alfabeto) == 1:
+        return alfabeto[0] * caracteres
+
+    muestra = ''.join(generador.choices(alfabeto, weights=pesos, k=min(caracteres, TAMAÑO_MUESTRA)))
+    repeticiones, resto = divmod(caracteres, len(muestra))
+    return muestra * repeticiones + muestra[:resto]
+
+# --------------------------------------------------
+# Medición
+# --------------------------------------------------
+def rss_pico_mb():
+    """
+    Pico de memoria residente del proceso actual.
+
+    Returns:
+        float: Megabytes, o None si la plataforma no lo informa
+    """
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KiB; macOS, bytes
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+def limpiar_caches():
+    """Vacía las cachés de códigos y tablas para medir cada repetición en frío."""
+    codificador.cache_codigos.limpiar()
+    decodificador.cache_tablas.limpiar()
+
+def medir_etapa(funcion, repeticiones):
+    """
+    Ejecuta una etapa varias veces con las cachés vacías.
+
+    Args:
+        funcion (callable): Etapa sin argumentos
+        repeticiones (int): Veces que se ejecuta (se toma el mejor tiempo)
+
+    Returns:
+        tuple: (mejor_tiempo_en_segundos, resultado_de_la_ultima_ejecucion)
+    """
+    mejor = float('inf')
+    resultado = None
+    for _ in range(repeticiones):
+        limpiar_caches()
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+def ejecutar_caso(tipo, tamaño, version=VERSION_ACTUAL, repeticiones=3, semilla=0):
+    """
+    Mide todas las etapas sobre un corpus.
+
+    Los MB/s de cada etapa se calculan sobre el tamaño original del corpus,
+    para que las etapas y los commits sean comparables entre sí.
+
+    Args:
+        tipo (str): Tipo de corpus (ver generar_corpus())
+        tamaño (int): Tamaño del corpus en bytes
+        version (int): Versión del formato con que se codifica
+        repeticiones (int): Repeticiones por etapa
+        semilla (int): Semilla del corpus
+
+    Returns:
+        dict: Datos del corpus, tiempos y MB/s por etapa ('etapas'),
+        tamaño comprimido, 'correcto' y pico de memoria
+    """
+    rss_inicial = rss_pico_mb()
+    mensaje = generar_corpus(tipo, tamaño, semilla)
+    megabytes = tamaño / (1024 * 1024)
+    tiempos = {}
+
+    tiempos['calcular_frecuencias'], frecuencias = medir_etapa(
+        lambda: calcular_frecuencias(mensaje), repeticiones)
+    tiempos['construir_arbol'], raiz = medir_etapa(
+        lambda: construir_arbol(frecuencias), repeticiones)
+    tiempos['generar_codigos'], _ = medir_etapa(
+        lambda: generar_codigos(raiz), repeticiones)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'benchmark.bin')
+        tiempos['codificar_mensaje'], (raiz, _, _) = medir_etapa(
+            lambda: codificar_mensaje(mensaje, ruta, version), repeticiones)
+        tamaño_comprimido = os.path.getsize(ruta)
+
+        cabecera = leer_cabecera_archivo(ruta)
+        posicion = cabecera['posicion_datos']
+        if tamaño_comprimido - posicion <= LIMITE_BITS_TEXTO:
+            tiempos['leer_datos_codificados'], _ = medir_etapa(
+                lambda: leer_datos_codificados(ruta, posicion), repeticiones)
+        else:
+            tiempos['leer_datos_codificados'] = None
+
+        # El decodificador real trabaja sobre los bytes, sin expandirlos a '0'/'1'
+        datos = leer_bytes_codificados(ruta, posicion)
+        num_bits = max(len(datos) * 8 - cabecera['bits_descartados'], 0)
+        if cabecera['bits_totales'] is not None:
+            num_bits = min(num_bits, cabecera['bits_totales'])
+        bits = SecuenciaBits(datos, num_bits)
+        tiempos['decodificar_bits'], _ = medir_etapa(
+            lambda: decodificar_bits(bits, raiz), repeticiones)
+        del bits, datos
+
+        tiempos['decodificar_archivo'], (decodificado, _, _) = medir_etapa(
+            lambda: decodificar_archivo(ruta), repeticiones)
+
+    return {
+        'corpus': tipo,
+        'tamaño': formatear_tamaño(tamaño),
+        'tamaño_bytes': tamaño,
+        'caracteres': len(mensaje),
+        'simbolos_distintos': len(frecuencias),
+        'version_formato': version,
+        'tamaño_comprimido': tamaño_comprimido,
+        'ratio': tamaño_comprimido / tamaño,
+        'correcto': decodificado == mensaje,
+        'etapas': {
+            etapa: None if segundos is None else {
+                'segundos': segundos,
+                'mb_s': megabytes / segundos if segundos > 0 else None
+            }
+            for etapa, segundos in tiempos.items()
+        },
+        'rss_inicial_mb': rss_inicial,
+        'rss_pico_mb': rss_pico_mb()
+    }
+
+def medir_arranque(repeticiones=20):
+    """
+    Mide el arranque en frío de un proceso que solo decodifica un archivo.
+
+    Cada repetición lanza un intérprete nuevo, como los procesos de corta
+    vida que decodifican un archivo y terminan. Se informa la mediana de
+    cada programa de PROGRAMAS_ARRANQUE y, restando el intérprete vacío, el
+    costo propio de importar el códec y decodificar.
+
+    Args:
+        repeticiones (int): Procesos lanzados por programa
+
+    Returns:
+        dict: {programa: segundos (mediana)}, 'decodificar_neto' (sin el
+        intérprete), 'repeticiones' y 'modulos' (módulos que carga la
+        decodificación, además de los del intérprete)
+    """
+    directorio_codigo = os.path.dirname(os.path.abspath(__file__))
+    entorno = dict(os.environ)
+    entorno['PYTHONPATH'] = os.pathsep.join(
+        filter(None, (directorio_codigo, entorno.get('PYTHONPATH'))))
+
+    def lanzar(programa, **opciones):
+        # Con -c el directorio actual va primero en sys.path: se fija el del códec
+        return subprocess.run([sys.executable, '-c', programa], env=entorno, check=True,
+                              cwd=directorio_codigo, stdin=subprocess.DEVNULL, **opciones)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = os.path.join(directorio, 'arranque.bin')
+        codificar_mensaje("HOLA MUNDO", archivo)
+
+        resultado = {'repeticiones': repeticiones}
+        for nombre, programa in PROGRAMAS_ARRANQUE.items():
+            programa = programa.format(archivo=archivo)
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                lanzar(programa, stdout=subprocess.DEVNULL)
+                tiempos.append(time.perf_counter() - inicio)
+            resultado[nombre] = statistics.median(tiempos)
+
+        modulos = lanzar(PROGRAMA_MODULOS.format(archivo=archivo),
+                         capture_output=True, text=True).stdout.split()
+
+    resultado['decodificar_neto'] = resultado['decodificar_archivo'] - resultado['interprete']
+    resultado['modulos'] = modulos
+    return resultado
+
+def _metadatos():
+    """
+    Returns:
+        dict: Commit, versión de Python, plataforma y fecha de la ejecución
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'version_resultados': VERSION_RESULTADOS,
+        'commit': commit,
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+        'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds')
+    }
+
+def ejecutar_benchmark(corpus=CORPUS, tamaños=TAMAÑOS_POR_DEFECTO, version=VERSION_ACTUAL,
+                       repeticiones=3, aislar=True, progreso=None, arranque=20):
+    """
+    Ejecuta todos los casos corpus x tamaño.
+
+    Con ``aislar`` cada caso corre en un proceso nuevo, de modo que el pico
+    de memoria de un caso no se arrastra al siguiente.
+
+    Args:
+        corpus (iterable): Tipos de corpus
+        tamaños (iterable): Tamaños en bytes o como texto ('1MB')
+        version (int): Versión del formato
+        repeticiones (int): Repeticiones por etapa
+        aislar (bool): Ejecutar cada caso en su propio proceso
+        progreso (callable): Función opcional que recibe cada resultado
+        arranque (int): Repeticiones de medir_arranque() (0 = no medirlo)
+
+    Returns:
+        dict: 'metadatos', la lista 'resultados' y 'arranque' (o None)
+    """
+    resultados = []
+    for tipo in corpus:
+        for tamaño in tamaños:
+            if isinstance(tamaño, str):
+                tamaño = interpretar_tamaño(tamaño)
+            if aislar:
+                with ProcessPoolExecutor(max_workers=1) as ejecutor:
+                    resultado = ejecutor.submit(
+                        ejecutar_caso, tipo, tamaño, version, repeticiones).result()
+            else:
+                resultado = ejecutar_caso(tipo, tamaño, version, repeticiones)
+            resultados.append(resultado)
+            if progreso is not None:
+                progreso(resultado)
+    return {
+        'metadatos': _metadatos(),
+        'resultados': resultados,
+        'arranque': medir_arranque(arranque) if arranque else None
+    }
+
+# --------------------------------------------------
+# Resultados en JSON
+# --------------------------------------------------
+def guardar_resultados(resultados, nombre_archivo):
+    """
+    Guarda los resultados en un archivo JSON.
+
+    Args:
+        resultados (dict): Resultado de ejecutar_benchmark()
+        nombre_archivo (str): Ruta del archivo .json
+    """
+    with open(nombre_archivo, 'w', encoding='utf-8') as archivo:
+        json.dump(resultados, archivo, ensure_ascii=False, indent=2)
+
+def cargar_resultados(nombre_archivo):
+    """
+    Carga resultados guardados con guardar_resultados().
+
+    Args:
+        nombre_archivo (str): Ruta del archivo .json
+
+    Returns:
+        dict: Resultados
+
+    Raises:
+        ValueError: Si el archivo es de otra versión del esquema
+    """
+    with open(nombre_archivo, encoding='utf-8') as archivo:
+        resultados = json.load(archivo)
+    version = resultados.get('metadatos', {}).get('version_resultados')
+    if version != VERSION_RESULTADOS:
+        raise ValueError(f"Versión de resultados no soportada: {version}")
+    return resultados
+
+def comparar_resultados(base, actual, tolerancia=0.10):
+    """
+    Busca las etapas que perdieron rendimiento respecto de una ejecución base.
+
+    Solo se comparan los casos (corpus, tamaño) presentes en ambas. El
+    arranque en frío se compara por tiempo (una regresión es un aumento).
+
+    Args:
+        base (dict): Resultados de referencia
+        actual (dict): Resultados nuevos
+        tolerancia (float): Caída de MB/s admitida (0.10 = 10%)
+
+    Returns:
+        list: Un dict por regresión con 'corpus', 'tamaño', 'etapa',
+        'cambio_porcentaje' y 'mb_s_base'/'mb_s_actual' (o
+        'segundos_base'/'segundos_actual' para el arranque)
+    """
+    casos_base = {(caso['corpus'], caso['tamaño_bytes']): caso for caso in base['resultados']}
+    regresiones = []
+    for caso in actual['resultados']:
+        anterior = casos_base.get((caso['corpus'], caso['tamaño_bytes']))
+        if anterior is None:
+            continue
+        for etapa, medida in caso['etapas'].items():
+            medida_base = anterior['etapas'].get(etapa)
+            if not medida or not medida_base or not medida['mb_s'] or not medida_base['mb_s']:
+                continue
+            cambio = medida['mb_s'] / medida_base['mb_s'] - 1
+            if cambio < -tolerancia:
+                regresiones.append({
+                    'corpus': caso['corpus'],
+                    'tamaño': caso['tamaño'],
+                    'etapa': etapa,
+                    'mb_s_base': medida_base['mb_s'],
+                    'mb_s_actual': medida['mb_s'],
+                    'cambio_porcentaje': cambio * 100
+                })
+
+    arranque_base, arranque = base.get('arranque'), actual.get('arranque')
+    if arranque_base and arranque:
+        for programa in PROGRAMAS_ARRANQUE:
+            if programa == 'interprete' or not arranque_base.get(programa):
+                continue
+            cambio = arranque[programa] / arranque_base[programa] - 1
+            if cambio > tolerancia:
+                regresiones.append({
+                    'corpus': 'arranque',
+                    'tamaño': '-',
+                    'etapa': programa,
+                    'segundos_base': arranque_base[programa],
+                    'segundos_actual': arranque[programa],
+                    'cambio_porcentaje': cambio * 100
+                })
+    return regresiones
+
+# --------------------------------------------------
+# Funciones de Utilidad
+# --------------------------------------------------
+def mostrar_resultado(resultado):
+    """
+    Muestra los MB/s de cada etapa de un caso.
+
+    Args:
+        resultado (dict): Resultado de ejecutar_caso()
+    """
+    estado = '✅' if resultado['correcto'] else '❌'
+    rss = resultado['rss_pico_mb']
+    print(f"\n{estado} {resultado['corpus']} {resultado['tamaño']} "
+          f"({resultado['simbolos_distintos']} símbolos, ratio {resultado['ratio']:.3f}"
+          f"{f', RSS pico {rss:.1f} MB' if rss is not None else ''})")
+    for etapa in ETAPAS:
+        medida = resultado['etapas'].get(etapa)
+        if medida is None:
+            print(f"  {etapa:<24} omitida")
+        elif medida['mb_s'] is None:
+            print(f"  {etapa:<24} {medida['segundos'] * 1000:10.3f} ms")
+        else:
+            print(f"  {etapa:<24} {medida['segundos'] * 1000:10.3f} ms {medida['mb_s']:10.2f} MB/s")
+
+def mostrar_regresiones(regresiones, tolerancia):
+    """
+    Muestra las regresiones encontradas por comparar_resultados().
+
+    Args:
+        regresiones (list): Lista de regresiones
+        tolerancia (float): Tolerancia usada en la comparación
+    """
+    if not regresiones:
+        print(f"\nSin regresiones mayores al {tolerancia * 100:.0f}%")
+        return
+    print(f"\nRegresiones mayores al {tolerancia * 100:.0f}%:")
+    for regresion in regresiones:
+        if 'segundos_base' in regresion:
+            print(f"  arranque {regresion['etapa']}: {regresion['segundos_base'] * 1000:.1f} -> "
+                  f"{regresion['segundos_actual'] * 1000:.1f} ms "
+                  f"({regresion['cambio_porcentaje']:+.1f}%)")
+            continue
+        print(f"  {regresion['corpus']} {regresion['tamaño']} {regresion['etapa']}: "
+              f"{regresion['mb_s_base']:.2f} -> {regresion['mb_s_actual']:.2f} MB/s "
+              f"({regresion['cambio_porcentaje']:+.1f}%)")
+
+def mostrar_arranque(arranque):
+    """
+    Muestra el arranque en frío medido por medir_arranque().
+
+    Args:
+        arranque (dict): Resultado de medir_arranque()
+    """
+    print(f"\nArranque en frío (mediana de {arranque['repeticiones']} procesos):")
+    for programa in PROGRAMAS_ARRANQUE:
+        print(f"  {programa:<24} {arranque[programa] * 1000:10.1f} ms")
+    print(f"  {'decodificar (neto)':<24} {arranque['decodificar_neto'] * 1000:10.1f} ms, "
+          f"{len(arranque['modulos'])} módulos cargados")
+
+def main(argumentos=None):
+    """
+    Punto de entrada de la línea de comandos.
+
+    Args:
+        argumentos (list): Argumentos (por defecto, los de sys.argv)
+
+    Returns:
+        int: 0 si todo fue correcto, 1 si hubo errores de decodificación o regresiones
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks del codificador Huffman")
+    parser.add_argument('--corpus', nargs='+', choices=CORPUS, default=list(CORPUS))
+    parser.add_argument('--tamaños', nargs='+', default=list(TAMAÑOS_POR_DEFECTO),
+                        help="Tamaños de corpus, por ejemplo 1KB 1MB 1GB")
+    parser.add_argument('--version', type=int, default=VERSION_ACTUAL,
+                        help="Versión del formato (1 o 2)")
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--sin-aislar', action='store_true',
+                        help="Ejecutar todos los casos en este proceso")
+    parser.add_argument('--salida', help="Archivo JSON donde guardar los resultados")
+    parser.add_argument('--comparar', help="Archivo JSON de referencia")
+    parser.add_argument('--tolerancia', type=float, default=0.10)
+    parser.add_argument('--arranque', type=int, default=20,
+                        help="Procesos para medir el arranque en frío (0 = no medirlo)")
+    opciones = parser.parse_args(argumentos)
+
+    tamaños = [interpretar_tamaño(tamaño) for tamaño in opciones.tamaños]
+    resultados = ejecutar_benchmark(
+        opciones.corpus, tamaños, opciones.version, opciones.repeticiones,
+        aislar=not opciones.sin_aislar, progreso=mostrar_resultado, arranque=opciones.arranque
+    )
+    if resultados['arranque']:
+        mostrar_arranque(resultados['arranque'])
+
+    if opciones.salida:
+        guardar_resultados(resultados, opciones.salida)
+        print(f"\nResultados guardados: {opciones.salida}")
+
+    fallo = not all(resultado['correcto'] for resultado in resultados['resultados'])
+    if opciones.comparar:
+        regresiones = comparar_resultados(
+            cargar_resultados(opciones.comparar), resultados, opciones.tolerancia)
+        mostrar_regresiones(regresiones, opciones.tolerancia)
+        fallo = fallo or bool(regresiones)
+    return 1 if fallo else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
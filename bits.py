@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Secuencias de Bits
+
+Este módulo contiene la representación empaquetada de secuencias de bits que
+comparten el codificador, el decodificador y el visualizador.
+"""
+
+# --------------------------------------------------
+# Secuencia de Bits Empaquetada
+# --------------------------------------------------
+class SecuenciaBits:
+    """
+    Vista de solo lectura sobre bits empaquetados en bytes.
+
+    Se comporta como el string de '0'/'1' que usaban antes el codificador y el
+    decodificador (len, índices, rebanadas, iteración y comparación con str),
+    pero ocupa un bit por bit en lugar de un byte por bit.
+    """
+
+    def __init__(self, datos, num_bits=None):
+        self.datos = datos
+        self.num_bits = len(datos) * 8 if num_bits is None else num_bits
+
+    def __len__(self):
+        return self.num_bits
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(self.num_bits)
+            if paso != 1:
+                return str(self)[indice]
+            return self._rango(inicio, fin)
+        if indice < 0:
+            indice += self.num_bits
+        if not 0 <= indice < self.num_bits:
+            raise IndexError("Índice de bit fuera de rango")
+        return '1' if (self.datos[indice >> 3] >> (7 - (indice & 7))) & 1 else '0'
+
+    def __iter__(self):
+        # Se expande por bloques para no materializar toda la secuencia
+        bloque = 1 << 16
+        for inicio in range(0, self.num_bits, bloque):
+            yield from self._rango(inicio, min(inicio + bloque, self.num_bits))
+
+    def __str__(self):
+        return self._rango(0, self.num_bits)
+
+    def __repr__(self):
+        return f"SecuenciaBits({self.num_bits} bits)"
+
+    def __eq__(self, otro):
+        if isinstance(otro, SecuenciaBits):
+            return self.num_bits == otro.num_bits and str(self) == str(otro)
+        if isinstance(otro, str):
+            return len(otro) == self.num_bits and str(self) == otro
+        return NotImplemented
+
+    def __bool__(self):
+        return self.num_bits > 0
+
+    def _rango(self, inicio, fin):
+        """Expande los bits [inicio, fin) a un string de '0'/'1'."""
+        if fin <= inicio:
+            return ""
+        primer_byte = inicio >> 3
+        ultimo_byte = (fin + 7) >> 3
+        fragmento = self.datos[primer_byte:ultimo_byte]
+        texto = format(int.from_bytes(fragmento, 'big'), f'0{len(fragmento) * 8}b')
+        desplazamiento = inicio - primer_byte * 8
+        return texto[desplazamiento:desplazamiento + fin - inicio]
+
+    @classmethod
+    def desde_texto(cls, bits):
+        """
+        Empaqueta un string de '0'/'1' en una SecuenciaBits.
+
+        Args:
+            bits (str): Secuencia de bits como string
+
+        Returns:
+            SecuenciaBits: Bits empaquetados (el último byte se rellena con ceros)
+        """
+        if not bits:
+            return cls(b"", 0)
+        relleno = (8 - len(bits) % 8) % 8
+        valor = int(bits, 2) << relleno
+        return cls(valor.to_bytes((len(bits) + relleno) // 8, 'big'), len(bits))
+
+
+# --------------------------------------------------
+# Escritura de Bits Empaquetados
+# --------------------------------------------------
+class EscritorBits:
+    """
+    Empaqueta códigos de Huffman en bytes sin pasar por un string completo.
+
+    Los códigos se acumulan en un registro entero y los bytes completos se
+    guardan en un bytearray. Si hay ``destino``, el bytearray se vuelca al
+    archivo cada ``tamaño_bloque`` bytes; si no, queda con todo el resultado
+    (memoria proporcional al tamaño comprimido).
+    """
+
+    def __init__(self, destino=None, tamaño_bloque=1 << 16):
+        self.destino = destino
+        self.tamaño_bloque = tamaño_bloque
+        self.datos = bytearray()
+        self.registro = 0
+        self.bits_registro = 0
+        self.bits_escritos = 0
+
+    def escribir(self, valor, longitud):
+        """
+        Agrega un código individual.
+
+        Args:
+            valor (int): Código como entero (el primer bit es el más significativo)
+            longitud (int): Longitud del código en bits
+        """
+        self._agregar(valor, longitud)
+
+    def escribir_texto(self, texto, codigos):
+        """
+        Codifica un texto completo procesándolo por bloques.
+
+        Args:
+            texto (str): Texto (o bytes) a codificar
+            codigos (dict): Diccionario {simbolo: código binario como string}
+        """
+        obtener = codigos.__getitem__
+        for inicio in range(0, len(texto), self.tamaño_bloque):
+            bloque = ''.join(map(obtener, texto[inicio:inicio + self.tamaño_bloque]))
+            if bloque:
+                self._agregar(int(bloque, 2), len(bloque))
+
+    def _agregar(self, valor, longitud):
+        registro = (self.registro << longitud) | valor
+        bits = self.bits_registro + longitud
+        self.bits_escritos += longitud
+        if bits >= 8:
+            sobrantes = bits & 7
+            self._volcar((registro >> sobrantes).to_bytes(bits >> 3, 'big'))
+            registro &= (1 << sobrantes) - 1
+            bits = sobrantes
+        self.registro = registro
+        self.bits_registro = bits
+
+    def _volcar(self, fragmento):
+        self.datos += fragmento
+        if self.destino is not None and len(self.datos) >= self.tamaño_bloque:
+            self.destino.write(self.datos)
+            self.datos.clear()
+
+    def cerrar(self):
+        """
+        Completa el último byte con ceros y lo vuelca.
+
+        Returns:
+            int: Cantidad de bits de relleno agregados (bits descartados)
+        """
+        relleno = (8 - self.bits_registro) % 8
+        if self.bits_registro:
+            self.datos.append(self.registro << relleno)
+            self.registro = 0
+            self.bits_registro = 0
+        if self.destino is not None and self.datos:
+            self.destino.write(self.datos)
+            self.datos.clear()
+        return relleno
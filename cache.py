@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Caché de Tablas
+
+Este módulo contiene la caché LRU que usan el codificador y el decodificador
+para no reconstruir árboles, códigos y tablas de decodificación cuando se
+repite la misma distribución de frecuencias o la misma tabla de longitudes.
+"""
+
+import threading
+from collections import OrderedDict
+
+# --------------------------------------------------
+# Caché LRU con Peso Acotado
+# --------------------------------------------------
+class CacheLRU:
+    """
+    Caché LRU cuyo tamaño se mide en "peso" (por ejemplo, entradas de tabla).
+
+    Cuando el peso total supera ``peso_maximo`` se descartan las entradas
+    usadas hace más tiempo. Un valor que por sí solo pesa más que el máximo
+    se devuelve sin guardarlo. Los valores guardados se comparten entre
+    llamadas, así que no deben modificarse.
+
+    Se puede usar desde varios hilos: la búsqueda, la inserción y el descarte
+    se hacen bajo un candado, pero la construcción del valor no, para que
+    dos claves distintas se construyan en paralelo.
+    """
+
+    def __init__(self, peso_maximo, peso=None):
+        """
+        Args:
+            peso_maximo (int): Peso total admitido
+            peso (callable): Función valor -> peso (por defecto, 1 por entrada)
+        """
+        self.peso_maximo = peso_maximo
+        self._peso = peso or (lambda valor: 1)
+        self._entradas = OrderedDict()
+        self._candado = threading.Lock()
+        self.peso_total = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave, construir):
+        """
+        Devuelve el valor de la clave, construyéndolo si no está.
+
+        Args:
+            clave: Clave hasheable
+            construir (callable): Función sin argumentos que crea el valor
+
+        Returns:
+            El valor guardado o recién construido
+        """
+        with self._candado:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return entrada[0]
+            self.fallos += 1
+
+        valor = construir()
+        peso = self._peso(valor)
+        if peso > self.peso_maximo:
+            return valor
+
+        with self._candado:
+            # Otro hilo pudo construir la misma clave mientras tanto: se conserva la suya
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+                return entrada[0]
+            self._entradas[clave] = (valor, peso)
+            self.peso_total += peso
+            while self.peso_total > self.peso_maximo:
+                _, (_, descartado) = self._entradas.popitem(last=False)
+                self.peso_total -= descartado
+        return valor
+
+    def limpiar(self):
+        """Vacía la caché y reinicia los contadores."""
+        with self._candado:
+            self._entradas.clear()
+            self.peso_total = 0
+            self.aciertos = 0
+            self.fallos = 0
+
+    def estadisticas(self):
+        """
+        Returns:
+            dict: 'aciertos', 'fallos', 'entradas', 'peso' y 'peso_maximo'
+        """
+        with self._candado:
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'entradas': len(self._entradas),
+                'peso': self.peso_total,
+                'peso_maximo': self.peso_maximo
+            }
+
+    def __len__(self):
+        return len(self._entradas)
@@ -7,25 +7,34 @@ Este módulo contiene todas las funcionalidades relacionadas con la codificació
 de mensajes usando el algoritmo de Huffman.
 """
 
-import heapq
+import io
+import math
 import struct
 import os
-from collections import defaultdict
+import time
+from collections import Counter, deque
+from contextlib import nullcontext
+from arbol import (
+    NodoArbol, construir_arbol, generar_codigos_enteros, generar_codigos, longitudes_desde_arbol,
+    codigos_canonicos, codigos_a_texto, arbol_desde_codigos
+)
+from bits import SecuenciaBits, EscritorBits
+from cache import CacheLRU
+from instrumentacion import etapa
+from formato import (
+    MAGIA, MAGIA_DICCIONARIO, VERSION_FRECUENCIAS, VERSION_CANONICA, VERSION_BLOQUES,
+    VERSION_DICCIONARIO, VERSION_ACTUAL, FLAG_BINARIO, FLAG_TABLA_COMPARTIDA, FLAG_CRC,
+    FLAG_REGISTROS, TAMAÑO_PIE, codificar_varint, crc_contenido
+)
 
-# --------------------------------------------------
-# Estructuras de Datos
-# --------------------------------------------------
-class NodoArbol:
-    
-    def __init__(self, caracter, frecuencia):
-        self.caracter = caracter
-        self.frecuencia = frecuencia
-        self.izquierda = None
-        self.derecha = None
-    
-    def __lt__(self, otro):
-        """Permite comparar nodos por frecuencia para el heap."""
-        return self.frecuencia < otro.frecuencia
+try:
+    import numpy
+except ImportError:  # NumPy es opcional: solo acelera el conteo de bytes
+    numpy = None
+
+# Códigos ya construidos por distribución de frecuencias (el peso es la
+# cantidad de símbolos distintos de cada tabla)
+cache_codigos = CacheLRU(1 << 18, peso=lambda valor: len(valor[1]))
 
 # --------------------------------------------------
 # Funciones de Análisis
@@ -34,96 +43,831 @@ def calcular_frecuencias(mensaje):
     """
     Calcula la frecuencia de cada carácter en el mensaje.
     
+    El conteo se hace en C con collections.Counter, conservando el orden de
+    primera aparición. Los datos binarios se cuentan con
+    calcular_frecuencias_bytes().
+    
     Args:
-        mensaje (str): El mensaje a analizar
+        mensaje (str | bytes): El mensaje a analizar
         
     Returns:
-        defaultdict: Diccionario con caracteres como claves y frecuencias como valores
+        Counter: Diccionario con caracteres como claves y frecuencias como valores
+        (los caracteres ausentes valen 0)
     """
-    frecuencias = defaultdict(int)
-    for caracter in mensaje:
-        frecuencias[caracter] += 1
-    return frecuencias
+    if isinstance(mensaje, (bytes, bytearray, memoryview)):
+        return Counter(calcular_frecuencias_bytes(mensaje))
+    return Counter(mensaje)
+
+def combinar_frecuencias(parciales):
+    """
+    Suma frecuencias calculadas por separado (por trozos o por procesos).
+    
+    Args:
+        parciales (iterable): Diccionarios de frecuencias parciales
+        
+    Returns:
+        Counter: Frecuencias totales, en orden de primera aparición
+    """
+    total = Counter()
+    for parcial in parciales:
+        total.update(parcial)
+    return total
+
+def calcular_frecuencias_bytes(datos):
+    """
+    Calcula la frecuencia de cada byte (0-255) de un buffer binario.
+    
+    Usa numpy.bincount si NumPy está instalado y collections.Counter (que
+    cuenta en C) si no lo está.
+    
+    Args:
+        datos (bytes | bytearray | memoryview): Datos a analizar
+        
+    Returns:
+        dict: Diccionario {byte: frecuencia} ordenado por valor de byte
+    """
+    if numpy is not None:
+        conteos = numpy.bincount(numpy.frombuffer(datos, dtype=numpy.uint8), minlength=256)
+        return {byte: conteo for byte, conteo in enumerate(conteos.tolist()) if conteo}
+    return dict(sorted(Counter(memoryview(datos).cast('B')).items()))
 
 # --------------------------------------------------
-# Construcción del Árbol
+# Códigos Canónicos
 # --------------------------------------------------
-def construir_arbol(frecuencias):
+def longitudes_dos_colas(frecuencias):
     """
-    Construye el árbol de Huffman a partir de las frecuencias.
+    Calcula las longitudes de Huffman con el método de las dos colas.
+    
+    Con las hojas ordenadas por frecuencia, los nodos internos se crean en
+    orden no decreciente de peso, así que basta con dos colas (hojas y nodos
+    internos) en lugar de un montículo: después del ordenamiento la
+    construcción es lineal. Los empates se resuelven siempre igual: primero
+    la hoja, y entre hojas, la que apareció antes en `frecuencias`.
     
     Args:
         frecuencias (dict): Diccionario de frecuencias de caracteres
         
     Returns:
-        NodoHuffman: Raíz del árbol construido, o None si no hay frecuencias
+        dict: Diccionario {caracter: longitud_en_bits}. Un único símbolo
+        recibe longitud 1.
     """
-    if not frecuencias:
-        return None
+    simbolos = list(frecuencias)
+    n = len(simbolos)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {simbolos[0]: 1}
+    
+    # Hojas 0..n-1 ordenadas por peso (sort es estable: respeta el orden de aparición)
+    orden = sorted(range(n), key=lambda indice: frecuencias[simbolos[indice]])
+    pesos_hojas = [frecuencias[simbolos[indice]] for indice in orden]
+    
+    # Nodos internos n-1; padre[i] para hojas (0..n-1) y para internos (n..2n-2)
+    pesos_internos = []
+    padre = [0] * (2 * n - 1)
+    hoja = 0
+    interno = 0
+    for nuevo in range(n - 1):
+        peso = 0
+        for _ in range(2):
+            if hoja < n and (interno >= nuevo or pesos_hojas[hoja] <= pesos_internos[interno]):
+                peso += pesos_hojas[hoja]
+                padre[hoja] = n + nuevo
+                hoja += 1
+            else:
+                peso += pesos_internos[interno]
+                padre[n + interno] = n + nuevo
+                interno += 1
+        pesos_internos.append(peso)
+    
+    # Profundidades desde la raíz (el último interno) hacia abajo
+    profundidad = [0] * (2 * n - 1)
+    for nodo in range(2 * n - 3, -1, -1):
+        profundidad[nodo] = profundidad[padre[nodo]] + 1
+    return {simbolos[orden[posicion]]: profundidad[posicion] for posicion in range(n)}
+
+def longitudes_limitadas(frecuencias, longitud_maxima):
+    """
+    Calcula longitudes de código óptimas sin superar una longitud máxima.
+    
+    Usa el algoritmo package-merge: en cada uno de los `longitud_maxima`
+    niveles se empaquetan de a pares los elementos más livianos y se mezclan
+    con las hojas; las 2n-2 entradas más livianas del último nivel indican
+    cuántas veces aparece cada símbolo, que es la longitud de su código.
+    Cuesta O(n · longitud_maxima).
     
-    # Crear nodos iniciales
-    monticulo = [NodoArbol(caracter, freq) for caracter, freq in frecuencias.items()]
-    heapq.heapify(monticulo)
+    Lo único que se garantiza es la longitud del código más largo (y por eso
+    los bits que el decodificador lee por símbolo). El tamaño de las tablas
+    de decodificación no depende de `longitud_maxima`: crece con los estados
+    del árbol, (n - 1) · 2**bits_por_paso entradas.
     
-    # Construir árbol combinando nodos
-    while len(monticulo) > 1:
-        izquierda = heapq.heappop(monticulo)
-        derecha = heapq.heappop(monticulo)
+    Args:
+        frecuencias (dict): Diccionario de frecuencias de caracteres
+        longitud_maxima (int): Longitud máxima admitida para un código
         
-        # Crear nodo padre
-        nodo_padre = NodoArbol(None, izquierda.frecuencia + derecha.frecuencia)
-        nodo_padre.izquierda = izquierda
-        nodo_padre.derecha = derecha
+    Returns:
+        dict: Diccionario {caracter: longitud_en_bits}
         
-        heapq.heappush(monticulo, nodo_padre)
+    Raises:
+        ValueError: Si hay más de 2**longitud_maxima símbolos
+    """
+    simbolos = list(frecuencias)
+    if not simbolos:
+        return {}
+    if len(simbolos) == 1:
+        return {simbolos[0]: 1}
+    if longitud_maxima < 1 or len(simbolos) > (1 << longitud_maxima):
+        raise ValueError(
+            f"{len(simbolos)} símbolos no caben en códigos de a lo sumo {longitud_maxima} bits"
+        )
+    
+    # Cada elemento es (peso, símbolo o None, hijos); las hojas, por peso
+    hojas = sorted(
+        ((frecuencias[simbolo], indice, None) for indice, simbolo in enumerate(simbolos)),
+        key=lambda elemento: elemento[0]
+    )
+    nivel = hojas
+    for _ in range(longitud_maxima - 1):
+        paquetes = [
+            (nivel[i][0] + nivel[i + 1][0], None, (nivel[i], nivel[i + 1]))
+            for i in range(0, len(nivel) - 1, 2)
+        ]
+        # Mezcla de dos listas ordenadas (sorted es lineal en este caso)
+        nivel = sorted(hojas + paquetes, key=lambda elemento: elemento[0])
     
-    return monticulo[0] if monticulo else None
+    # Contar las apariciones de cada hoja en los 2n-2 elementos elegidos
+    longitudes = [0] * len(simbolos)
+    pendientes = list(nivel[:2 * len(simbolos) - 2])
+    while pendientes:
+        _, indice, hijos = pendientes.pop()
+        if hijos is None:
+            longitudes[indice] += 1
+        else:
+            pendientes.extend(hijos)
+    return {simbolo: longitudes[indice] for indice, simbolo in enumerate(simbolos)}
 
-# --------------------------------------------------
-# Generación de Códigos
-# --------------------------------------------------
-def generar_codigos(raiz, codigo_actual="", codigos=None):
+def costo_longitud_maxima(frecuencias, longitud_maxima):
     """
-    Genera los códigos de Huffman para cada carácter.
+    Compara el tamaño codificado con y sin límite de longitud.
     
     Args:
-        raiz (NodoHuffman): Raíz del árbol de Huffman
-        codigo_actual (str): Código binario actual (para recursión)
-        codigos (dict): Diccionario de códigos (para recursión)
+        frecuencias (dict): Diccionario de frecuencias de caracteres
+        longitud_maxima (int): Longitud máxima admitida para un código
         
     Returns:
-        dict: Diccionario con caracteres como claves y códigos binarios como valores
+        dict: 'longitud_maxima', 'longitud_maxima_optima' (la del árbol sin
+        límite), 'bits_optimos', 'bits_limitados' y 'aumento_porcentaje'
     """
-    if codigos is None:
-        codigos = {}
+    optimas = longitudes_desde_arbol(construir_arbol(frecuencias))
+    limitadas = longitudes_limitadas(frecuencias, longitud_maxima)
+    bits_optimos = sum(freq * optimas[caracter] for caracter, freq in frecuencias.items())
+    bits_limitados = sum(freq * limitadas[caracter] for caracter, freq in frecuencias.items())
+    return {
+        'longitud_maxima': longitud_maxima,
+        'longitud_maxima_optima': max(optimas.values(), default=0),
+        'bits_optimos': bits_optimos,
+        'bits_limitados': bits_limitados,
+        'aumento_porcentaje': (bits_limitados / bits_optimos - 1) * 100 if bits_optimos else 0.0
+    }
+
+def preparar_codigos(frecuencias, version=VERSION_ACTUAL, longitud_maxima=None):
+    """
+    Construye el árbol y los códigos según la versión de formato.
     
-    if raiz is None:
-        return {}
+    Con `longitud_maxima`, si el árbol de Huffman tiene códigos más largos,
+    las longitudes se recalculan con longitudes_limitadas() (solo en el
+    formato canónico: la versión 1 reconstruye el árbol desde las frecuencias).
     
-    # Si es una hoja, guardar el código
-    if raiz.caracter is not None:
-        codigos[raiz.caracter] = codigo_actual
-        return codigos
+    Los resultados se guardan en cache_codigos: si la misma distribución
+    (las frecuencias divididas por su máximo común divisor, en el mismo
+    orden) ya se usó, no se vuelve a construir el árbol. Con frecuencias
+    idénticas se devuelve el mismo árbol; si solo son proporcionales, el
+    árbol se arma desde los códigos con las frecuencias nuevas.
+    
+    Args:
+        frecuencias (dict): Diccionario de frecuencias de caracteres
+        version (int): Versión del formato de archivo
+        longitud_maxima (int): Longitud máxima de los códigos (None = sin límite)
+        
+    Returns:
+        tuple: (raiz_arbol, codigos) con los códigos como strings de '0'/'1'.
+        Ambos pueden estar compartidos con otras llamadas y no deben modificarse.
+        
+    Raises:
+        ValueError: Si se pide una longitud máxima con la versión 1, o no alcanza
+    """
+    if longitud_maxima is not None and version == VERSION_FRECUENCIAS:
+        raise ValueError("La longitud máxima solo se admite en el formato canónico")
+    
+    items = tuple(frecuencias.items())
+    divisor = math.gcd(*(freq for _, freq in items)) or 1
+    clave = (version, longitud_maxima,
+             tuple((caracter, freq // divisor) for caracter, freq in items))
     
-    # Recursión para hijos izquierdo (0) y derecho (1)
-    generar_codigos(raiz.izquierda, codigo_actual + "0", codigos)
-    generar_codigos(raiz.derecha, codigo_actual + "1", codigos)
+    def construir():
+        if version == VERSION_FRECUENCIAS:
+            raiz = construir_arbol(frecuencias)
+            enteros = generar_codigos_enteros(raiz)
+            return items, codigos_a_texto(enteros), enteros, raiz
+        
+        # Versión canónica: solo hacen falta las longitudes (dos colas, sin montículo)
+        longitudes = longitudes_dos_colas(frecuencias)
+        if longitud_maxima is not None and max(longitudes.values(), default=0) > longitud_maxima:
+            longitudes = longitudes_limitadas(frecuencias, longitud_maxima)
+        enteros = codigos_canonicos(longitudes)
+        return items, codigos_a_texto(enteros), enteros, arbol_desde_codigos(enteros, frecuencias)
     
-    return codigos
+    items_guardados, codigos, enteros, raiz = cache_codigos.obtener(clave, construir)
+    if items_guardados != items:
+        raiz = arbol_desde_codigos(enteros, frecuencias)
+    return raiz, codigos
 
 # --------------------------------------------------
 # Codificación de Mensaje
 # --------------------------------------------------
-def codificar_mensaje(mensaje, nombre_archivo):
+def serializar_longitudes(codigos, flags=0):
     """
-    Codifica un mensaje y lo guarda en un archivo .bin.
+    Serializa una tabla de longitudes de códigos canónicos.
+    
+    Args:
+        codigos (dict): Códigos {simbolo: código binario como string}
+        flags (int): Opciones del formato (FLAG_BINARIO cambia cómo se guarda el símbolo)
+        
+    Returns:
+        bytearray: Cantidad de entradas seguida de cada símbolo y su longitud
+    """
+    tabla = bytearray(codificar_varint(len(codigos)))
+    
+    # Símbolo (UTF-8, se autodelimita; o un byte en modo binario) y longitud
+    # de su código, en orden canónico
+    for simbolo, codigo in sorted(codigos.items(), key=lambda par: (len(par[1]), par[0])):
+        if flags & FLAG_BINARIO:
+            tabla.append(simbolo)
+        else:
+            tabla += simbolo.encode('utf-8')
+        tabla.append(len(codigo))
+    return tabla
+
+def escribir_cabecera_canonica(archivo, codigos, num_simbolos, bits_totales, flags=0, crc=None):
+    """
+    Escribe la cabecera de la versión 2 (longitudes de códigos canónicos).
+    
+    Args:
+        archivo: Archivo binario abierto para escritura
+        codigos (dict): Códigos canónicos {simbolo: código binario como string}
+        num_simbolos (int): Longitud del mensaje original
+        bits_totales (int): Cantidad de bits codificados (sin relleno)
+        flags (int): Opciones del formato
+        crc (int): CRC32 del contenido original (None = no se guarda)
+    """
+    if crc is not None:
+        flags |= FLAG_CRC
+    cabecera = bytearray(MAGIA)
+    cabecera.append(VERSION_CANONICA)
+    cabecera.append(flags)
+    cabecera += codificar_varint(num_simbolos)
+    cabecera += codificar_varint(bits_totales)
+    if crc is not None:
+        cabecera += struct.pack('>I', crc)
+    cabecera += serializar_longitudes(codigos, flags)
+    archivo.write(cabecera)
+
+def escribir_cabecera(archivo, frecuencias, bits_descartados):
+    """
+    Escribe la cabecera del archivo .bin (frecuencias y bits descartados).
+    
+    Args:
+        archivo: Archivo binario abierto para escritura
+        frecuencias (dict): Diccionario de frecuencias de caracteres
+        bits_descartados (int): Bits de relleno del último byte
+        
+    Raises:
+        ValueError: Si alguna frecuencia no cabe en 16 bits
+    """
+    # Escribir cantidad de caracteres únicos (4 bytes)
+    archivo.write(struct.pack('>I', len(frecuencias)))
+    
+    # Escribir caracteres y frecuencias (3 bytes cada uno)
+    for caracter, freq in frecuencias.items():
+        if freq > 0xFFFF:
+            raise ValueError(
+                f"El carácter '{caracter}' aparece {freq} veces; "
+                "el formato solo admite hasta 65535 apariciones por carácter"
+            )
+        archivo.write(struct.pack('>cH', caracter.encode('utf-8'), freq))
+    
+    # Escribir bits de relleno
+    archivo.write(struct.pack('>B', bits_descartados))
+
+def codificar_en_memoria(mensaje, version=VERSION_ACTUAL, longitud_maxima=None,
+                         suma_verificacion=True):
+    """
+    Codifica un mensaje sin escribir ningún archivo.
+    
+    Hace los pasos de codificar_mensaje() salvo el último: el contenido del
+    archivo .bin es ``cabecera + datos``. Sirve para guardar el resultado en
+    otro lado (un socket, una base de datos) o escribirlo por partes.
     
     Args:
         mensaje (str): El mensaje a codificar
+        version (int): Versión del formato (1: frecuencias, 2: códigos canónicos)
+        longitud_maxima (int): Longitud máxima de los códigos (None = sin límite)
+        suma_verificacion (bool): Guardar el CRC32 del contenido (solo versión 2)
+        
+    Returns:
+        tuple: (cabecera, datos, raiz_arbol, codigos, bits_codificados), con la
+        cabecera como bytes, los datos como bytearray y los bits como
+        SecuenciaBits. El árbol y los códigos son compartidos (de solo lectura).
+        
+    Raises:
+        ValueError: Si el mensaje está vacío, no es texto, no cabe en el formato
+            o la versión no es 1 ni 2
+    """
+    if isinstance(mensaje, (bytes, bytearray, memoryview)):
+        # La cabecera de texto serializa caracteres; los bytes tienen su propio modo
+        raise ValueError("codificar_en_memoria() codifica texto; para bytes use codificar_binario()")
+    if version not in (VERSION_FRECUENCIAS, VERSION_CANONICA):
+        # La versión 3 se escribe por bloques: ver codificar_archivo() y codificar_paralelo()
+        raise ValueError(f"Versión de formato no soportada: {version}")
+    if not mensaje:
+        raise ValueError("El mensaje no puede estar vacío")
+    
+    # Paso 1: Calcular frecuencias
+    with etapa('calcular_frecuencias', simbolos=len(mensaje)):
+        frecuencias = calcular_frecuencias(mensaje)
+    
+    # Pasos 2 y 3: Construir árbol y generar códigos
+    with etapa('preparar_codigos', simbolos=len(frecuencias)):
+        raiz, codigos = preparar_codigos(frecuencias, version, longitud_maxima)
+    
+    # Paso 4: Codificar mensaje empaquetando los códigos por bloques
+    with etapa('codificar_bits', simbolos=len(mensaje)) as medida:
+        escritor = EscritorBits()
+        escritor.escribir_texto(mensaje, codigos)
+        bits_descartados = escritor.cerrar()
+        bits = SecuenciaBits(escritor.datos, escritor.bits_escritos)
+        medida.contar(num_bytes=len(escritor.datos))
+    
+    # Cabecera en memoria (los escritores de cabecera aceptan cualquier archivo binario)
+    cabecera = io.BytesIO()
+    if version == VERSION_FRECUENCIAS:
+        escribir_cabecera(cabecera, frecuencias, bits_descartados)
+    else:
+        crc = crc_contenido(mensaje) if suma_verificacion else None
+        escribir_cabecera_canonica(cabecera, codigos, len(mensaje), len(bits), crc=crc)
+    
+    return cabecera.getvalue(), escritor.datos, raiz, codigos, bits
+
+def codificar_mensaje(mensaje, nombre_archivo, version=VERSION_ACTUAL, longitud_maxima=None,
+                      suma_verificacion=True):
+    """
+    Codifica un mensaje y lo guarda en un archivo .bin.
+    
+    Cada paso es una etapa medible con instrumentacion.medir_etapas(). Los
+    datos binarios (bytes) se delegan en codificar_binario().
+    
+    Args:
+        mensaje (str | bytes): El mensaje a codificar
         nombre_archivo (str): Ruta del archivo donde guardar
+        version (int): Versión del formato (1: frecuencias, 2: códigos canónicos)
+        longitud_maxima (int): Longitud máxima de los códigos (None = sin límite)
+        suma_verificacion (bool): Guardar el CRC32 del contenido (solo versión 2)
+        
+    Returns:
+        tuple: (raiz_arbol, codigos, bits_codificados), con los bits como
+        SecuenciaBits. El árbol y los códigos salen de cache_codigos (ver
+        preparar_codigos()): son compartidos y no deben modificarse.
+        
+    Raises:
+        ValueError: Si el mensaje está vacío, si la versión no es 1 ni 2, o si
+            son bytes y se pide la versión 1
+        IOError: Si hay problemas al escribir el archivo
+    """
+    if isinstance(mensaje, (bytes, bytearray, memoryview)):
+        if version == VERSION_FRECUENCIAS:
+            raise ValueError("La versión 1 no admite datos binarios; use la versión 2")
+        if version != VERSION_CANONICA:
+            raise ValueError(f"Versión de formato no soportada: {version}")
+        return codificar_binario(mensaje, nombre_archivo, longitud_maxima, suma_verificacion)
+    
+    with etapa('codificar_mensaje', simbolos=len(mensaje)) as total:
+        # Pasos 1 a 4: Frecuencias, árbol, códigos y bits (ver codificar_en_memoria())
+        cabecera, datos, raiz, codigos, bits = codificar_en_memoria(mensaje, version, longitud_maxima,
+                                                                    suma_verificacion)
+        tamaño_archivo = len(cabecera) + len(datos)
+        
+        # Paso 5: Guardar en archivo
+        with etapa('escribir_archivo', num_bytes=tamaño_archivo):
+            with open(nombre_archivo, 'wb') as archivo:
+                archivo.write(cabecera)
+                
+                # Escribir mensaje codificado en bytes
+                archivo.write(datos)
+        total.contar(num_bytes=tamaño_archivo)
+    
+    return raiz, codigos, bits
+
+def codificar_binario(datos, nombre_archivo, longitud_maxima=None, suma_verificacion=True):
+    """
+    Codifica datos binarios arbitrarios (alfabeto de 256 bytes).
+    
+    Args:
+        datos (bytes | bytearray | memoryview): Datos a codificar
+        nombre_archivo (str | archivo): Ruta del archivo .bin donde guardar o
+            archivo binario abierto (por ejemplo, un io.BytesIO)
+        longitud_maxima (int): Longitud máxima de los códigos (None = sin límite)
+        suma_verificacion (bool): Guardar el CRC32 de los datos
+        
+    Returns:
+        tuple: (raiz_arbol, codigos, bits_codificados), con los bytes como
+        enteros en el árbol y en los códigos. El árbol y los códigos son
+        compartidos (de solo lectura).
+        
+    Raises:
+        ValueError: Si los datos están vacíos
+        IOError: Si hay problemas al escribir el archivo
+    """
+    datos = memoryview(datos).cast('B')
+    if not datos:
+        raise ValueError("Los datos no pueden estar vacíos")
+    
+    # Pasos 1 a 3: Frecuencias, árbol y códigos canónicos
+    frecuencias = calcular_frecuencias_bytes(datos)
+    raiz, codigos = preparar_codigos(frecuencias, VERSION_CANONICA, longitud_maxima)
+    
+    # Paso 4: Codificar con una lista indexada por byte (más rápida que un dict)
+    escritor = EscritorBits()
+    escritor.escribir_texto(datos, _tabla_para_bloque(codigos, True))
+    escritor.cerrar()
+    bits = SecuenciaBits(escritor.datos, escritor.bits_escritos)
+    
+    # Paso 5: Guardar en archivo
+    if isinstance(nombre_archivo, (str, os.PathLike)):
+        salida = open(nombre_archivo, 'wb')
+    else:
+        salida = nullcontext(nombre_archivo)  # Un archivo abierto lo cierra quien lo pasó
+    with salida as archivo:
+        escribir_cabecera_canonica(archivo, codigos, len(datos), len(bits), FLAG_BINARIO,
+                                   crc_contenido(datos) if suma_verificacion else None)
+        archivo.write(escritor.datos)
+    
+    return raiz, codigos, bits
+
+# --------------------------------------------------
+# Codificación por Bloques (entradas grandes)
+# --------------------------------------------------
+def leer_trozos(archivo, tamaño_bloque=1 << 20):
+    """
+    Lee un archivo de texto abierto en trozos de tamaño fijo.
+    
+    Args:
+        archivo: Archivo de texto abierto para lectura
+        tamaño_bloque (int): Caracteres por trozo
+        
+    Yields:
+        str: Cada trozo leído
+    """
+    while True:
+        trozo = archivo.read(tamaño_bloque)
+        if not trozo:
+            return
+        yield trozo
+
+def _contar_trozos(trozos, copia=None):
+    """
+    Cuenta las frecuencias de todos los trozos, copiándolos si se pide.
+    
+    Returns:
+        tuple: (frecuencias, crc) con el CRC32 del contenido completo
+    """
+    frecuencias = Counter()
+    crc = 0
+    for trozo in trozos:
+        frecuencias.update(trozo)
+        crc = crc_contenido(trozo, crc)
+        if copia is not None:
+            copia.write(trozo)
+    return frecuencias, crc
+
+def _reagrupar(trozos, tamaño_bloque):
+    """
+    Reparte trozos de cualquier tamaño en bloques de `tamaño_bloque` símbolos.
+    
+    Yields:
+        str: Bloques completos y, al final, el resto (si lo hay)
+    """
+    pendientes = []
+    acumulado = 0
+    for trozo in trozos:
+        inicio = 0
+        while inicio < len(trozo):
+            parte = trozo[inicio:inicio + tamaño_bloque - acumulado]
+            pendientes.append(parte)
+            acumulado += len(parte)
+            inicio += len(parte)
+            if acumulado == tamaño_bloque:
+                yield ''.join(pendientes)
+                pendientes = []
+                acumulado = 0
+    if pendientes:
+        yield ''.join(pendientes)
+
+def codificar_archivo(origen, nombre_archivo, tamaño_bloque=1 << 20, codificacion='utf-8',
+                      version=VERSION_BLOQUES, longitud_maxima=None, suma_verificacion=True):
+    """
+    Codifica un archivo de texto o un iterable de trozos sin cargarlo entero.
+    
+    Hace dos pasadas: la primera cuenta las frecuencias y la segunda escribe
+    los bits empaquetados directamente en el destino, por lo que la memoria
+    usada no depende del tamaño de la entrada.
+    
+    Por defecto escribe un contenedor de versión 3 con una tabla compartida
+    y bloques de `tamaño_bloque` símbolos: el índice guarda el CRC32 de cada
+    bloque, así que al decodificar un bloque dañado se detecta (y se informa
+    su posición) antes de entregar su texto. Las versiones 1 y 2 guardan, a
+    lo sumo, un CRC32 del mensaje completo que solo se comprueba al final.
+    
+    Args:
+        origen (str | os.PathLike | iterable): Ruta del archivo de texto, o
+            iterable de trozos (str). Si el iterable solo puede recorrerse una
+            vez (un generador, por ejemplo), se copia a un archivo temporal
+            durante la primera pasada.
+        nombre_archivo (str): Ruta del archivo .bin donde guardar
+        tamaño_bloque (int): Caracteres leídos por trozo y, en la versión 3,
+            símbolos por bloque
+        codificacion (str): Codificación del archivo de texto de entrada
+        version (int): Versión del formato (1: frecuencias, 2: códigos
+            canónicos, 3: bloques con CRC por bloque)
+        longitud_maxima (int): Longitud máxima de los códigos (None = sin límite)
+        suma_verificacion (bool): Guardar el CRC32 del contenido (de cada
+            bloque en la versión 3; la versión 1 no lo admite)
         
     Returns:
-        tuple: (raiz_arbol, codigos, bits_codificados)
+        tuple: (raiz_arbol, codigos, bits_codificados) con la cantidad de bits
+        
+    Raises:
+        ValueError: Si la entrada está vacía o la versión no es 1, 2 ni 3
+        IOError: Si hay problemas al leer o escribir los archivos
+    """
+    if version not in (VERSION_FRECUENCIAS, VERSION_CANONICA, VERSION_BLOQUES):
+        raise ValueError(f"Versión de formato no soportada: {version}")
+    
+    temporal = None
+    try:
+        # Paso 1: Calcular frecuencias en streaming
+        if isinstance(origen, (str, os.PathLike)):
+            with open(origen, 'r', encoding=codificacion, newline='') as entrada:
+                frecuencias, crc = _contar_trozos(leer_trozos(entrada, tamaño_bloque))
+            
+            def trozos():
+                with open(origen, 'r', encoding=codificacion, newline='') as entrada:
+                    yield from leer_trozos(entrada, tamaño_bloque)
+        elif iter(origen) is origen:
+            import tempfile
+            temporal = tempfile.TemporaryFile('w+', encoding='utf-8', newline='')
+            frecuencias, crc = _contar_trozos(origen, copia=temporal)
+            
+            def trozos():
+                temporal.seek(0)
+                yield from leer_trozos(temporal, tamaño_bloque)
+        else:
+            frecuencias, crc = _contar_trozos(origen)
+            
+            def trozos():
+                return iter(origen)
+        
+        if not frecuencias:
+            raise ValueError("El mensaje no puede estar vacío")
+        
+        # Pasos 2 y 3: Construir árbol y generar códigos
+        raiz, codigos = preparar_codigos(
+            frecuencias, VERSION_CANONICA if version == VERSION_BLOQUES else version, longitud_maxima
+        )
+        
+        if version == VERSION_BLOQUES:
+            # Paso 4: Un bloque por cada `tamaño_bloque` símbolos, con la tabla ya calculada
+            flags = FLAG_TABLA_COMPARTIDA | (FLAG_CRC if suma_verificacion else 0)
+            
+            def grupos():
+                return ([bloque] for bloque in _reagrupar(trozos(), tamaño_bloque))
+            
+            resumen = _escribir_contenedor(nombre_archivo, grupos, flags, 1, codigos=codigos)
+            return raiz, codigos, resumen['bits_totales']
+        
+        # El relleno se conoce de antemano: bits = suma de frecuencia * longitud
+        bits_totales = sum(freq * len(codigos[caracter]) for caracter, freq in frecuencias.items())
+        bits_descartados = (8 - bits_totales % 8) % 8
+        
+        # Paso 4: Codificar en streaming hacia el archivo
+        with open(nombre_archivo, 'wb') as archivo:
+            if version == VERSION_FRECUENCIAS:
+                escribir_cabecera(archivo, frecuencias, bits_descartados)
+            else:
+                escribir_cabecera_canonica(archivo, codigos, sum(frecuencias.values()), bits_totales,
+                                           crc=crc if suma_verificacion else None)
+            escritor = EscritorBits(destino=archivo)
+            for trozo in trozos():
+                escritor.escribir_texto(trozo, codigos)
+            escritor.cerrar()
+        
+        return raiz, codigos, bits_totales
+    
+    finally:
+        if temporal is not None:
+            temporal.close()
+
+# --------------------------------------------------
+# Codificación Paralela por Bloques
+# --------------------------------------------------
+def _tabla_para_bloque(codigos, binario):
+    """Tabla de códigos para EscritorBits (lista indexada por byte en modo binario)."""
+    if not binario:
+        return codigos
+    tabla = [None] * 256
+    for byte, codigo in codigos.items():
+        tabla[byte] = codigo
+    return tabla
+
+def _codificar_grupo(grupo, codigos=None, longitud_maxima=None):
+    """
+    Codifica varios bloques independientes (se ejecuta en los procesos).
+    
+    Todos los bloques del grupo reutilizan el mismo EscritorBits y, con
+    códigos compartidos, la misma tabla, para no pagar esos costos por bloque.
+    
+    Args:
+        grupo (list): Bloques (str o bytes) a codificar
+        codigos (dict): Códigos compartidos, o None para calcular los de cada bloque
+        longitud_maxima (int): Longitud máxima de los códigos propios
+        
+    Returns:
+        list: Para cada bloque, (codigos_propios o None, num_simbolos,
+        bits_totales, crc, datos)
+    """
+    resultados = []
+    escritor = EscritorBits()
+    tabla = None
+    for bloque in grupo:
+        binario = not isinstance(bloque, str)
+        propios = None
+        if codigos is None:
+            _, propios = preparar_codigos(calcular_frecuencias(bloque), VERSION_CANONICA,
+                                          longitud_maxima)
+            tabla_bloque = _tabla_para_bloque(propios, binario)
+        else:
+            if tabla is None:
+                tabla = _tabla_para_bloque(codigos, binario)
+            tabla_bloque = tabla
+        
+        bits_previos = escritor.bits_escritos
+        escritor.escribir_texto(bloque, tabla_bloque)
+        escritor.cerrar()
+        resultados.append((propios, len(bloque), escritor.bits_escritos - bits_previos,
+                           crc_contenido(bloque), bytes(escritor.datos)))
+        escritor.datos.clear()
+    return resultados
+
+def _frecuencias_grupo(grupo):
+    """Frecuencias combinadas de un grupo de bloques (se ejecuta en los procesos)."""
+    return combinar_frecuencias(calcular_frecuencias(bloque) for bloque in grupo)
+
+def _mapear_en_orden(funcion, argumentos, executor, ventana):
+    """
+    Como executor.map, pero con a lo sumo `ventana` tareas en vuelo.
+    
+    Evita que todos los bloques queden en memoria a la espera de un proceso.
+    Sin executor, ejecuta las tareas en el proceso actual.
+    """
+    if executor is None:
+        for args in argumentos:
+            yield funcion(*args)
+        return
+    
+    pendientes = deque()
+    for args in argumentos:
+        pendientes.append(executor.submit(funcion, *args))
+        if len(pendientes) >= ventana:
+            yield pendientes.popleft().result()
+    while pendientes:
+        yield pendientes.popleft().result()
+
+def _escribir_contenedor(destino, grupos, flags, procesos, longitud_maxima=None, codigos=None):
+    """
+    Escribe un archivo de versión 3 con los bloques que entregan los grupos.
+    
+    Args:
+        destino (str | archivo): Ruta del archivo .bin o archivo binario abierto
+        grupos (callable): Función sin argumentos que devuelve un iterador
+            de listas de bloques; se llama una vez por pasada
+        flags (int): Flags del contenedor (FLAG_TABLA_COMPARTIDA decide si
+            hay una sola tabla y FLAG_CRC si el índice guarda el CRC32 de
+            cada bloque)
+        procesos (int): Procesos a usar (1 = sin procesos)
+        longitud_maxima (int): Longitud máxima de los códigos (None = sin límite)
+        codigos (dict): Tabla compartida ya calculada; sin ella, hay una
+            pasada de conteo antes de codificar
+        
+    Returns:
+        dict: Resumen con 'bloques', 'num_simbolos', 'bits_totales',
+        'tamaño_archivo' y 'codigos' (la tabla compartida, o None)
+    """
+    tabla_compartida = bool(flags & FLAG_TABLA_COMPARTIDA)
+    executor = None
+    if procesos > 1:
+        # Importado aquí: concurrent.futures.process arrastra multiprocessing y logging
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(procesos)
+    try:
+        if not tabla_compartida:
+            codigos = None
+        elif codigos is None:
+            # Primera pasada: conteo por grupo en paralelo y combinación
+            parciales = _mapear_en_orden(
+                _frecuencias_grupo, ((grupo,) for grupo in grupos()), executor, 2 * procesos
+            )
+            _, codigos = preparar_codigos(combinar_frecuencias(parciales), VERSION_CANONICA,
+                                          longitud_maxima)
+        
+        indice = bytearray()
+        num_bloques = 0
+        num_simbolos = 0
+        bits_totales = 0
+        if isinstance(destino, (str, os.PathLike)):
+            salida = open(destino, 'wb')
+        else:
+            salida = nullcontext(destino)  # Un archivo abierto lo cierra quien lo pasó
+        with salida as archivo:
+            cabecera = bytearray(MAGIA)
+            cabecera.append(VERSION_BLOQUES)
+            cabecera.append(flags)
+            if tabla_compartida:
+                cabecera += serializar_longitudes(codigos, flags)
+            archivo.write(cabecera)
+            posicion = len(cabecera)
+            
+            # Segunda pasada: cada grupo se empaqueta en paralelo y se escribe en orden
+            resultados = _mapear_en_orden(
+                _codificar_grupo, ((grupo, codigos, longitud_maxima) for grupo in grupos()),
+                executor, 2 * procesos
+            )
+            for resultado in resultados:
+                for propios, simbolos, bits, crc, datos in resultado:
+                    archivo.write(datos)
+                    posicion += len(datos)
+                    num_bloques += 1
+                    num_simbolos += simbolos
+                    bits_totales += bits
+                    indice += codificar_varint(simbolos)
+                    indice += codificar_varint(bits)
+                    if flags & FLAG_CRC:
+                        indice += struct.pack('>I', crc)
+                    if not tabla_compartida:
+                        indice += serializar_longitudes(propios, flags)
+            
+            # Índice de bloques y, al final, su posición
+            cantidad = codificar_varint(num_bloques)
+            archivo.write(cantidad)
+            archivo.write(indice)
+            archivo.write(struct.pack('>Q', posicion))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    return {
+        'bloques': num_bloques,
+        'num_simbolos': num_simbolos,
+        'bits_totales': bits_totales,
+        'tamaño_archivo': posicion + len(cantidad) + len(indice) + TAMAÑO_PIE,
+        'codigos': codigos
+    }
+
+def codificar_paralelo(mensaje, nombre_archivo, tamaño_bloque=1 << 20,
+                       tabla_compartida=True, procesos=None, longitud_maxima=None,
+                       suma_verificacion=True):
+    """
+    Codifica un mensaje por bloques independientes usando varios procesos.
+    
+    Con tabla compartida se cuentan las frecuencias de cada bloque en
+    paralelo, se combinan y todos los bloques usan los mismos códigos. Sin
+    ella, cada bloque calcula sus propios códigos (mejor para contenidos que
+    cambian a lo largo del archivo) y los guarda en el índice.
+    
+    En plataformas que inician los procesos con "spawn" (Windows, macOS), la
+    llamada debe hacerse dentro de ``if __name__ == "__main__":``.
+    
+    Args:
+        mensaje (str | bytes): Mensaje o datos binarios a codificar
+        nombre_archivo (str | archivo): Ruta del archivo .bin donde guardar o
+            archivo binario abierto (por ejemplo, un io.BytesIO)
+        tamaño_bloque (int): Símbolos por bloque
+        tabla_compartida (bool): Una tabla para todo el archivo o una por bloque
+        procesos (int): Procesos a usar (None = todos los núcleos, 1 = sin procesos)
+        longitud_maxima (int): Longitud máxima de los códigos (None = sin límite)
+        suma_verificacion (bool): Guardar el CRC32 de cada bloque en el índice
+        
+    Returns:
+        dict: Resumen con 'bloques', 'num_simbolos', 'bits_totales',
+        'tamaño_archivo' y 'codigos' (la tabla compartida, o None)
         
     Raises:
         ValueError: Si el mensaje está vacío
@@ -132,38 +876,247 @@ def codificar_mensaje(mensaje, nombre_archivo):
     if not mensaje:
         raise ValueError("El mensaje no puede estar vacío")
     
-    # Paso 1: Calcular frecuencias
-    frecuencias = calcular_frecuencias(mensaje)
+    binario = not isinstance(mensaje, str)
+    if binario:
+        mensaje = memoryview(mensaje).cast('B')
+    flags = (FLAG_CRC if suma_verificacion else 0) | (FLAG_BINARIO if binario else 0)
+    if tabla_compartida:
+        flags |= FLAG_TABLA_COMPARTIDA
+    
+    procesos = procesos or os.cpu_count() or 1
+    num_bloques = (len(mensaje) + tamaño_bloque - 1) // tamaño_bloque
+    procesos = min(procesos, num_bloques)
     
-    # Paso 2: Construir árbol
-    raiz = construir_arbol(frecuencias)
+    def grupos():
+        for inicio in range(0, len(mensaje), tamaño_bloque):
+            bloque = mensaje[inicio:inicio + tamaño_bloque]
+            # Las memoryview no se pueden enviar a otros procesos
+            yield [bloque.tobytes() if binario else bloque]
     
-    # Paso 3: Generar códigos
-    codigos = generar_codigos(raiz)
+    return _escribir_contenedor(nombre_archivo, grupos, flags, procesos, longitud_maxima)
+
+# --------------------------------------------------
+# Codificación por Lotes
+# --------------------------------------------------
+def _agrupar(mensajes, tamaño_grupo):
+    """Junta mensajes consecutivos en listas de hasta `tamaño_grupo` símbolos."""
+    grupo = []
+    simbolos = 0
+    for mensaje in mensajes:
+        grupo.append(mensaje)
+        simbolos += len(mensaje)
+        if simbolos >= tamaño_grupo:
+            yield grupo
+            grupo = []
+            simbolos = 0
+    if grupo:
+        yield grupo
+
+def codificar_lote(mensajes, nombre_archivo, tabla_compartida=True, procesos=1,
+                   tamaño_grupo=1 << 20, longitud_maxima=None, suma_verificacion=True):
+    """
+    Codifica muchos mensajes en un solo archivo, un registro por mensaje.
     
-    # Paso 4: Codificar mensaje
-    bits = ''.join(codigos[caracter] for caracter in mensaje)
+    El resultado es un contenedor de versión 3 con FLAG_REGISTROS: cada
+    mensaje es un bloque, y el índice de bloques hace de tabla de
+    desplazamientos para leer cualquier registro sin decodificar los demás
+    (ver decodificador.decodificar_lote()). Con tabla compartida se construye
+    un solo árbol para todo el lote. Los mensajes se reparten en grupos de
+    unos `tamaño_grupo` símbolos, y cada grupo es una tarea, así que los
+    mensajes pequeños no pagan una tarea (ni un escritor) por registro.
     
-    # Paso 5: Guardar en archivo
-    with open(nombre_archivo, 'wb') as archivo:
-        # Escribir cantidad de caracteres únicos (4 bytes)
-        archivo.write(struct.pack('>I', len(frecuencias)))
+    Args:
+        mensajes (list): Mensajes a codificar (todos str o todos bytes; se
+            recorren dos veces con tabla compartida)
+        nombre_archivo (str): Ruta del archivo .bin donde guardar
+        tabla_compartida (bool): Una tabla para todo el lote o una por registro
+        procesos (int): Procesos a usar (None = todos los núcleos, 1 = sin procesos)
+        tamaño_grupo (int): Símbolos aproximados por tarea
+        longitud_maxima (int): Longitud máxima de los códigos (None = sin límite)
+        suma_verificacion (bool): Guardar el CRC32 de cada registro en el índice
         
-        # Escribir caracteres y frecuencias (3 bytes cada uno)
-        for caracter, freq in frecuencias.items():
-            archivo.write(struct.pack('>cH', caracter.encode('utf-8'), freq))
+    Returns:
+        dict: Resumen con 'bloques' (registros), 'num_simbolos', 'bits_totales',
+        'tamaño_archivo' y 'codigos' (la tabla compartida, o None)
         
-        # Calcular y escribir bits de relleno
-        bits_restantes = len(bits) % 8
-        bits_descartados = (8 - bits_restantes) % 8
-        archivo.write(struct.pack('>B', bits_descartados))
+    Raises:
+        ValueError: Si el lote está vacío o mezcla texto y bytes
+    """
+    if not mensajes:
+        raise ValueError("El lote no puede estar vacío")
+    
+    binario = not isinstance(mensajes[0], str)
+    if any(isinstance(mensaje, str) == binario for mensaje in mensajes):
+        raise ValueError("Los mensajes del lote deben ser todos texto o todos bytes")
+    if binario:
+        mensajes = [bytes(mensaje) for mensaje in mensajes]
+    
+    flags = (FLAG_CRC if suma_verificacion else 0) | FLAG_REGISTROS | (FLAG_BINARIO if binario else 0)
+    if tabla_compartida:
+        flags |= FLAG_TABLA_COMPARTIDA
+    
+    procesos = procesos or os.cpu_count() or 1
+    
+    def grupos():
+        return _agrupar(mensajes, tamaño_grupo)
+    
+    return _escribir_contenedor(nombre_archivo, grupos, flags, procesos, longitud_maxima)
+
+# --------------------------------------------------
+# Diccionarios Estáticos (mensajes cortos)
+# --------------------------------------------------
+class DiccionarioHuffman:
+    """
+    Tabla de códigos canónicos entrenada de antemano e identificada por un número.
+    
+    Los mensajes codificados con un diccionario solo guardan su identificador,
+    así que la cabecera ocupa unos pocos bytes en lugar de la tabla completa.
+    """
+    
+    def __init__(self, identificador, longitudes, flags=0):
+        """
+        Args:
+            identificador (int): Número no negativo que identifica al diccionario
+            longitudes (dict): Longitudes de los códigos canónicos {simbolo: longitud}
+            flags (int): FLAG_BINARIO si los símbolos son bytes
+            
+        Raises:
+            ValueError: Si el identificador es negativo o no hay símbolos
+        """
+        if identificador < 0:
+            raise ValueError("El identificador del diccionario no puede ser negativo")
+        if not longitudes:
+            raise ValueError("El diccionario no tiene símbolos")
+        self.identificador = identificador
+        self.flags = flags & FLAG_BINARIO
+        self.longitudes = dict(longitudes)
+        self.codigos = codigos_a_texto(codigos_canonicos(self.longitudes))
+        self._tabla = _tabla_para_bloque(self.codigos, self.binario)
+    
+    @property
+    def binario(self):
+        return bool(self.flags & FLAG_BINARIO)
+    
+    def __len__(self):
+        return len(self.longitudes)
+    
+    def __repr__(self):
+        return f"DiccionarioHuffman({self.identificador}, {len(self.longitudes)} símbolos)"
+
+def entrenar_diccionario(muestras, identificador, alfabeto=None, longitud_maxima=None):
+    """
+    Entrena un diccionario con un corpus de mensajes de ejemplo.
+    
+    Args:
+        muestras (iterable): Mensajes de ejemplo (todos str o todos bytes)
+        identificador (int): Identificador del diccionario
+        alfabeto (iterable): Símbolos que deben poder codificarse aunque no
+            aparezcan en las muestras (reciben frecuencia 1). Para muestras
+            binarias, por defecto son los 256 bytes.
+        longitud_maxima (int): Longitud máxima de los códigos (None = sin límite)
+            
+    Returns:
+        DiccionarioHuffman: Diccionario entrenado
         
-        # Escribir mensaje codificado en bytes
-        for i in range(0, len(bits), 8):
-            byte = bits[i:i+8].ljust(8, '0')
-            archivo.write(bytes([int(byte, 2)]))
+    Raises:
+        ValueError: Si las muestras están vacías
+    """
+    frecuencias = Counter()
+    binario = False
+    for muestra in muestras:
+        binario = not isinstance(muestra, str)
+        frecuencias.update(calcular_frecuencias(muestra))
     
-    return raiz, codigos, bits
+    if alfabeto is None and binario:
+        alfabeto = range(256)
+    for simbolo in alfabeto or ():
+        if simbolo not in frecuencias:
+            frecuencias[simbolo] = 1
+    
+    if not frecuencias:
+        raise ValueError("No hay muestras para entrenar el diccionario")
+    
+    _, codigos = preparar_codigos(frecuencias, VERSION_CANONICA, longitud_maxima)
+    longitudes = {simbolo: len(codigo) for simbolo, codigo in codigos.items()}
+    return DiccionarioHuffman(identificador, longitudes, FLAG_BINARIO if binario else 0)
+
+def guardar_diccionario(diccionario, nombre_archivo):
+    """
+    Guarda un diccionario para cargarlo luego con decodificador.cargar_diccionario().
+    
+    Args:
+        diccionario (DiccionarioHuffman): Diccionario a guardar
+        nombre_archivo (str): Ruta del archivo del diccionario
+    """
+    contenido = bytearray(MAGIA_DICCIONARIO)
+    contenido.append(diccionario.flags)
+    contenido += codificar_varint(diccionario.identificador)
+    contenido += serializar_longitudes(diccionario.codigos, diccionario.flags)
+    with open(nombre_archivo, 'wb') as archivo:
+        archivo.write(contenido)
+
+def codificar_registro(mensaje, diccionario, suma_verificacion=False):
+    """
+    Codifica un mensaje corto con un diccionario, sin tabla en la cabecera.
+    
+    Args:
+        mensaje (str | bytes): Mensaje a codificar (bytes si el diccionario es binario)
+        diccionario (DiccionarioHuffman): Diccionario a usar
+        suma_verificacion (bool): Agregar el CRC32 del mensaje (4 bytes más)
+        
+    Returns:
+        bytes: Registro de versión 4 (cabecera de pocos bytes y datos)
+        
+    Raises:
+        ValueError: Si el mensaje está vacío o tiene símbolos que el
+        diccionario no conoce
+    """
+    if not mensaje:
+        raise ValueError("El mensaje no puede estar vacío")
+    if diccionario.binario:
+        mensaje = memoryview(mensaje).cast('B')
+    elif not isinstance(mensaje, str):
+        raise ValueError("El diccionario es de texto y el mensaje son bytes")
+    
+    escritor = EscritorBits()
+    try:
+        escritor.escribir_texto(mensaje, diccionario._tabla)
+    except (KeyError, TypeError):
+        faltantes = sorted(set(mensaje) - set(diccionario.longitudes))
+        raise ValueError(
+            f"Símbolos que no están en el diccionario {diccionario.identificador}: {faltantes}"
+        ) from None
+    escritor.cerrar()
+    
+    flags = diccionario.flags | (FLAG_CRC if suma_verificacion else 0)
+    registro = bytearray(MAGIA)
+    registro.append(VERSION_DICCIONARIO)
+    registro.append(flags)
+    registro += codificar_varint(diccionario.identificador)
+    registro += codificar_varint(len(mensaje))
+    registro += codificar_varint(escritor.bits_escritos)
+    if suma_verificacion:
+        registro += struct.pack('>I', crc_contenido(mensaje))
+    registro += escritor.datos
+    return bytes(registro)
+
+def codificar_con_diccionario(mensaje, nombre_archivo, diccionario, suma_verificacion=False):
+    """
+    Codifica un mensaje con un diccionario y lo guarda en un archivo .bin.
+    
+    Args:
+        mensaje (str | bytes): Mensaje a codificar
+        nombre_archivo (str): Ruta del archivo .bin donde guardar
+        diccionario (DiccionarioHuffman): Diccionario a usar
+        suma_verificacion (bool): Agregar el CRC32 del mensaje
+        
+    Returns:
+        int: Tamaño del archivo en bytes
+    """
+    registro = codificar_registro(mensaje, diccionario, suma_verificacion)
+    with open(nombre_archivo, 'wb') as archivo:
+        archivo.write(registro)
+    return len(registro)
 
 # --------------------------------------------------
 # Funciones de Análisis y Estadísticas
@@ -215,6 +1168,42 @@ def obtener_estadisticas_codificacion(mensaje, nombre_archivo):
     
     return stats, raiz, codigos, bits
 
+def medir_construccion_arbol(frecuencias, repeticiones=5):
+    """
+    Compara el montículo con las dos colas para obtener las longitudes.
+    
+    Args:
+        frecuencias (dict): Diccionario de frecuencias de caracteres
+        repeticiones (int): Veces que se repite cada medición (se toma la mejor)
+        
+    Returns:
+        dict: Segundos de cada método, aceleración y si el costo total en
+        bits coincide (las longitudes pueden diferir en los empates)
+    """
+    def mejor_tiempo(funcion):
+        mejor = float('inf')
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            resultado = funcion(frecuencias)
+            mejor = min(mejor, time.perf_counter() - inicio)
+        return mejor, resultado
+    
+    tiempo_monticulo, por_monticulo = mejor_tiempo(
+        lambda frecuencias: longitudes_desde_arbol(construir_arbol(frecuencias))
+    )
+    tiempo_colas, por_colas = mejor_tiempo(longitudes_dos_colas)
+    
+    def costo(longitudes):
+        return sum(freq * longitudes[caracter] for caracter, freq in frecuencias.items())
+    
+    return {
+        'simbolos': len(frecuencias),
+        'segundos_monticulo': tiempo_monticulo,
+        'segundos_dos_colas': tiempo_colas,
+        'aceleracion': tiempo_monticulo / tiempo_colas if tiempo_colas else float('inf'),
+        'mismo_costo': len(frecuencias) < 2 or costo(por_monticulo) == costo(por_colas)
+    }
+
 # --------------------------------------------------
 # Funciones de Utilidad
 # --------------------------------------------------
@@ -264,11 +1253,20 @@ def prueba_codificacion():
         
         print(f"Archivo guardado: {archivo_temp}")
         
+        # Las versiones que no se pueden escribir se rechazan en vez de caer en la 2
+        rechazadas = 0
+        for version in (0, 3, 4, 99):
+            try:
+                codificar_en_memoria(mensaje, version)
+            except ValueError:
+                rechazadas += 1
+        print(f"Versiones no soportadas rechazadas: {'✅' if rechazadas == 4 else '❌'}")
+        
         # Limpiar
         if os.path.exists(archivo_temp):
             os.remove(archivo_temp)
             
-        return True
+        return rechazadas == 4
         
     except Exception as e:
         print(f"Error en prueba: {e}")
@@ -7,164 +7,1389 @@ Este módulo contiene todas las funcionalidades relacionadas con la decodificaci
 de archivos .bin usando el algoritmo de Huffman.
 """
 
+import mmap
 import struct
 import os
-from codificador import NodoArbol, construir_arbol
+import sys
+import time
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+from bits import SecuenciaBits
+from cache import CacheLRU
+from instrumentacion import etapa
+from arbol import (
+    NodoArbol, construir_arbol, generar_codigos, generar_codigos_enteros, longitudes_desde_arbol,
+    codigos_canonicos, arbol_desde_codigos
+)
+from formato import (
+    MAGIA, MAGIA_DICCIONARIO, VERSION_FRECUENCIAS, VERSION_CANONICA, VERSION_BLOQUES,
+    VERSION_DICCIONARIO, FLAG_BINARIO, FLAG_TABLA_COMPARTIDA, FLAG_CRC, FLAG_REGISTROS, TAMAÑO_PIE,
+    leer_varint, longitud_utf8, crc_contenido
+)
 
 # --------------------------------------------------
 # Lectura de Archivos
 # --------------------------------------------------
+def leer_cabecera(archivo):
+    """
+    Lee la cabecera desde un archivo .bin ya abierto, en cualquier versión.
+    
+    Deja el archivo posicionado al inicio de los datos codificados, por lo
+    que las versiones 1 y 2 también se pueden leer desde flujos que no
+    admiten seek(). La versión 3 necesita seek() para leer el índice final.
+    
+    Args:
+        archivo: Archivo binario abierto para lectura
+        
+    Returns:
+        dict: Cabecera con las claves 'version', 'flags', 'frecuencias'
+        (solo versión 1), 'longitudes' (versiones 2 y 3 con tabla
+        compartida), 'caracteres_unicos', 'num_simbolos', 'bits_totales'
+        (None en versión 1), 'bits_descartados', 'crc' (None si no se
+        guardó) y 'posicion_datos'. La versión 3 agrega 'bloques', la lista
+        del índice de bloques, con el 'crc' de cada bloque, y la versión 4
+        agrega 'diccionario', el identificador del diccionario usado.
+        
+    Raises:
+        ValueError: Si el archivo está corrupto o la versión no se reconoce
+    """
+    datos = archivo.read(4)
+    if len(datos) < 4:
+        raise ValueError("Archivo corrupto: no se puede leer el número de caracteres")
+    
+    if datos[:3] == MAGIA:
+        if datos[3] == VERSION_CANONICA:
+            return _leer_cabecera_canonica(archivo)
+        if datos[3] == VERSION_BLOQUES:
+            return _leer_cabecera_bloques(archivo)
+        if datos[3] == VERSION_DICCIONARIO:
+            return _leer_cabecera_diccionario(archivo)
+        raise ValueError(f"Versión de formato no soportada: {datos[3]}")
+    
+    return _leer_cabecera_frecuencias(archivo, datos)
+
+def _leer_cabecera_frecuencias(archivo, datos):
+    """Lee la cabecera de la versión 1 (los 4 primeros bytes ya se leyeron)."""
+    try:
+        # Cantidad de caracteres únicos (4 bytes)
+        num_caracteres = struct.unpack('>I', datos)[0]
+        
+        # Leer caracteres y frecuencias
+        frecuencias = {}
+        for _ in range(num_caracteres):
+            datos = archivo.read(3)
+            if len(datos) < 3:
+                raise ValueError("Archivo corrupto: datos de frecuencias incompletos")
+            
+            caracter, freq = struct.unpack('>cH', datos)
+            frecuencias[caracter.decode('utf-8')] = freq
+        
+        # Leer bits descartados
+        datos = archivo.read(1)
+        if len(datos) < 1:
+            raise ValueError("Archivo corrupto: no se puede leer bits descartados")
+        
+        bits_descartados = struct.unpack('>B', datos)[0]
+        
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Archivo corrupto: error al leer estructura de datos - {e}")
+    
+    return {
+        'version': VERSION_FRECUENCIAS,
+        'flags': 0,
+        'frecuencias': frecuencias,
+        'longitudes': None,
+        'caracteres_unicos': num_caracteres,
+        'num_simbolos': sum(frecuencias.values()),
+        'bits_totales': None,
+        'bits_descartados': bits_descartados,
+        'crc': None,
+        'posicion_datos': 4 + 3 * num_caracteres + 1
+    }
+
+def _leer_longitudes(archivo, flags):
+    """
+    Lee una tabla de longitudes de códigos canónicos.
+    
+    Returns:
+        tuple: ({simbolo: longitud}, bytes_leidos)
+    """
+    num_entradas, posicion = leer_varint(archivo)
+    
+    # Símbolos con la longitud de su código canónico
+    if flags & FLAG_BINARIO:
+        datos = archivo.read(2 * num_entradas)
+        if len(datos) < 2 * num_entradas:
+            raise ValueError("Archivo corrupto: tabla de longitudes incompleta")
+        return dict(zip(datos[0::2], datos[1::2])), posicion + len(datos)
+    
+    longitudes = {}
+    for _ in range(num_entradas):
+        inicio = archivo.read(1)
+        if len(inicio) < 1:
+            raise ValueError("Archivo corrupto: tabla de longitudes incompleta")
+        resto = longitud_utf8(inicio[0])
+        datos = inicio + archivo.read(resto)
+        if len(datos) < resto + 1:
+            raise ValueError("Archivo corrupto: tabla de longitudes incompleta")
+        try:
+            caracter = datos[:-1].decode('utf-8')
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Archivo corrupto: carácter inválido en la cabecera - {e}")
+        longitudes[caracter] = datos[-1]
+        posicion += len(datos)
+    return longitudes, posicion
+
+def _leer_crc(archivo, flags):
+    """
+    Lee el CRC32 del contenido si los flags indican que se guardó.
+    
+    Returns:
+        tuple: (crc o None, bytes_leidos)
+    """
+    if not flags & FLAG_CRC:
+        return None, 0
+    datos = archivo.read(4)
+    if len(datos) < 4:
+        raise ValueError("Archivo corrupto: suma de verificación incompleta")
+    return struct.unpack('>I', datos)[0], 4
+
+def verificar_crc(texto, crc, flags, bloque=None):
+    """
+    Compara el CRC32 del texto decodificado con el guardado en el archivo.
+    
+    Args:
+        texto (str): Mensaje (o bloque) decodificado
+        crc (int): CRC guardado (None = el archivo no lo tiene y no se verifica)
+        flags (int): Flags del archivo (en modo binario el texto son bytes latin-1)
+        bloque (dict): Entrada del índice, para informar qué bloque está dañado
+        
+    Raises:
+        ValueError: Si el CRC no coincide
+    """
+    if crc is None:
+        return
+    codificacion = 'latin-1' if flags & FLAG_BINARIO else 'utf-8'
+    if crc_contenido(texto, codificacion=codificacion) != crc:
+        if bloque is not None:
+            raise ValueError(
+                f"Archivo corrupto: el bloque {bloque['numero']} (byte {bloque['posicion']}) "
+                "no coincide con su suma de verificación"
+            )
+        raise ValueError("Archivo corrupto: el mensaje no coincide con la suma de verificación")
+
+def _leer_cabecera_canonica(archivo):
+    """Lee la cabecera de la versión 2 (la magia y la versión ya se leyeron)."""
+    datos = archivo.read(1)
+    if len(datos) < 1:
+        raise ValueError("Archivo corrupto: no se pueden leer los flags")
+    flags = datos[0]
+    posicion = 5
+    
+    num_simbolos, leidos = leer_varint(archivo)
+    posicion += leidos
+    bits_totales, leidos = leer_varint(archivo)
+    posicion += leidos
+    crc, leidos = _leer_crc(archivo, flags)
+    posicion += leidos
+    longitudes, leidos = _leer_longitudes(archivo, flags)
+    posicion += leidos
+    
+    return {
+        'version': VERSION_CANONICA,
+        'flags': flags,
+        'frecuencias': None,
+        'longitudes': longitudes,
+        'caracteres_unicos': len(longitudes),
+        'num_simbolos': num_simbolos,
+        'bits_totales': bits_totales,
+        'bits_descartados': (8 - bits_totales % 8) % 8,
+        'crc': crc,
+        'posicion_datos': posicion
+    }
+
+def _leer_cabecera_diccionario(archivo):
+    """Lee la cabecera de la versión 4 (la magia y la versión ya se leyeron)."""
+    datos = archivo.read(1)
+    if len(datos) < 1:
+        raise ValueError("Archivo corrupto: no se pueden leer los flags")
+    flags = datos[0]
+    posicion = 5
+    
+    identificador, leidos = leer_varint(archivo)
+    posicion += leidos
+    num_simbolos, leidos = leer_varint(archivo)
+    posicion += leidos
+    bits_totales, leidos = leer_varint(archivo)
+    posicion += leidos
+    crc, leidos = _leer_crc(archivo, flags)
+    posicion += leidos
+    
+    diccionario = obtener_diccionario(identificador)
+    if diccionario.flags != flags & FLAG_BINARIO:
+        raise ValueError(f"El diccionario {identificador} no corresponde al modo del archivo")
+    
+    return {
+        'version': VERSION_DICCIONARIO,
+        'flags': flags,
+        'frecuencias': None,
+        'longitudes': diccionario.longitudes,
+        'caracteres_unicos': len(diccionario.longitudes),
+        'num_simbolos': num_simbolos,
+        'bits_totales': bits_totales,
+        'bits_descartados': (8 - bits_totales % 8) % 8,
+        'crc': crc,
+        'diccionario': identificador,
+        'posicion_datos': posicion
+    }
+
+def _leer_cabecera_bloques(archivo):
+    """Lee la cabecera y el índice de la versión 3 (la magia y la versión ya se leyeron)."""
+    datos = archivo.read(1)
+    if len(datos) < 1:
+        raise ValueError("Archivo corrupto: no se pueden leer los flags")
+    flags = datos[0]
+    posicion_datos = 5
+    
+    longitudes = None
+    if flags & FLAG_TABLA_COMPARTIDA:
+        longitudes, leidos = _leer_longitudes(archivo, flags)
+        posicion_datos += leidos
+    
+    # El índice está al final; su posición, en los últimos 8 bytes
+    archivo.seek(-TAMAÑO_PIE, os.SEEK_END)
+    pie = archivo.read(TAMAÑO_PIE)
+    if len(pie) < TAMAÑO_PIE:
+        raise ValueError("Archivo corrupto: falta la posición del índice de bloques")
+    fin_indice = archivo.tell() - TAMAÑO_PIE
+    posicion_indice = struct.unpack('>Q', pie)[0]
+    if not posicion_datos <= posicion_indice <= fin_indice:
+        raise ValueError("Archivo corrupto: posición del índice de bloques inválida")
+    
+    archivo.seek(posicion_indice)
+    num_bloques, _ = leer_varint(archivo)
+    bloques = []
+    simbolos_distintos = set(longitudes or ())
+    posicion = posicion_datos
+    for numero in range(num_bloques):
+        num_simbolos, _ = leer_varint(archivo)
+        bits_totales, _ = leer_varint(archivo)
+        crc, _ = _leer_crc(archivo, flags)
+        propias = None
+        if longitudes is None:
+            propias, _ = _leer_longitudes(archivo, flags)
+            simbolos_distintos.update(propias)
+        tamaño = (bits_totales + 7) // 8
+        bloques.append({
+            'numero': numero,
+            'posicion': posicion,
+            'tamaño': tamaño,
+            'num_simbolos': num_simbolos,
+            'bits_totales': bits_totales,
+            'crc': crc,
+            'longitudes': propias
+        })
+        posicion += tamaño
+    
+    if posicion > posicion_indice:
+        raise ValueError("Archivo corrupto: el índice de bloques no coincide con los datos")
+    
+    archivo.seek(posicion_datos)
+    bits_totales = sum(bloque['bits_totales'] for bloque in bloques)
+    return {
+        'version': VERSION_BLOQUES,
+        'flags': flags,
+        'frecuencias': None,
+        'longitudes': longitudes,
+        'caracteres_unicos': len(simbolos_distintos),
+        'num_simbolos': sum(bloque['num_simbolos'] for bloque in bloques),
+        'bits_totales': bits_totales,
+        'bits_descartados': sum((8 - bloque['bits_totales'] % 8) % 8 for bloque in bloques),
+        'crc': None,
+        'posicion_datos': posicion_datos,
+        'posicion_indice': posicion_indice,
+        'bloques': bloques
+    }
+
+def leer_cabecera_archivo(nombre_archivo):
+    """
+    Lee la cabecera completa de un archivo .bin.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .bin
+        
+    Returns:
+        dict: Cabecera (ver leer_cabecera())
+        
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        ValueError: Si el archivo está corrupto
+    """
+    if not os.path.exists(nombre_archivo):
+        raise FileNotFoundError(f"El archivo '{nombre_archivo}' no existe")
+    
+    with open(nombre_archivo, 'rb') as archivo:
+        return leer_cabecera(archivo)
+
+def leer_ruta_existente(nombre_archivo):
+    """
+    Verifica que el archivo exista antes de abrirlo.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .bin
+        
+    Returns:
+        str: La misma ruta
+        
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+    """
+    if not os.path.exists(nombre_archivo):
+        raise FileNotFoundError(f"El archivo '{nombre_archivo}' no existe")
+    return nombre_archivo
+
 def leer_metadatos_archivo(nombre_archivo):
     """
-    Lee los metadatos del archivo .bin (frecuencias y bits descartados).
+    Lee los metadatos del archivo .bin (frecuencias y bits descartados).
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .bin
+        
+    Returns:
+        tuple: (frecuencias, bits_descartados, posicion_datos). Los archivos
+        de versión 2 no guardan frecuencias y devuelven None en su lugar.
+        
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        ValueError: Si el archivo está corrupto
+    """
+    cabecera = leer_cabecera_archivo(nombre_archivo)
+    return cabecera['frecuencias'], cabecera['bits_descartados'], cabecera['posicion_datos']
+
+class LectorMemoria:
+    """
+    Lector con interfaz de archivo (read/seek/tell) sobre un buffer en memoria.
+    
+    read() devuelve copias pequeñas para los analizadores de cabecera, y
+    leer_vista() devuelve rebanadas de la memoryview sin copiar, para que el
+    decodificador consuma los datos codificados directamente del buffer.
+    """
+    
+    def __init__(self, buffer):
+        self.vista = memoryview(buffer).cast('B')
+        self.posicion = 0
+    
+    def read(self, tamaño=-1):
+        return bytes(self.leer_vista(tamaño))
+    
+    def leer_vista(self, tamaño=-1):
+        inicio = self.posicion
+        fin = len(self.vista) if tamaño < 0 else min(inicio + tamaño, len(self.vista))
+        self.posicion = max(fin, inicio)
+        return self.vista[inicio:fin]
+    
+    def seek(self, desplazamiento, desde=os.SEEK_SET):
+        if desde == os.SEEK_CUR:
+            desplazamiento += self.posicion
+        elif desde == os.SEEK_END:
+            desplazamiento += len(self.vista)
+        if desplazamiento < 0:
+            raise ValueError("Posición negativa")
+        self.posicion = desplazamiento
+        return self.posicion
+    
+    def tell(self):
+        return self.posicion
+
+def abrir_mapeado(nombre_archivo):
+    """
+    Mapea un archivo .bin en memoria (mmap) una sola vez.
+    
+    El archivo se cierra enseguida; el mapeo sigue vivo mientras haya
+    referencias a él y el sistema operativo lo libera al recolectarlas. Si el
+    archivo ya está en la caché de páginas, leerlo no ocupa memoria adicional
+    del proceso. Las vistas del mapeo no deben salir del decodificador: si el
+    archivo se reescribe mientras siguen vivas, leerlas termina el proceso
+    (SIGBUS), y en Windows impiden sobrescribirlo.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .bin
+        
+    Returns:
+        LectorMemoria: Lector sobre el contenido mapeado
+        
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+    """
+    with open(leer_ruta_existente(nombre_archivo), 'rb') as archivo:
+        if os.fstat(archivo.fileno()).st_size == 0:
+            # mmap no admite archivos vacíos; la cabecera informará el error
+            return LectorMemoria(b"")
+        return LectorMemoria(mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ))
+
+def leer_bytes_codificados(nombre_archivo, posicion_inicio):
+    """
+    Lee los datos codificados del archivo sin expandirlos a bits.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .bin
+        posicion_inicio (int): Posición donde comienzan los datos
+        
+    Returns:
+        bytes: Datos codificados empaquetados
+    """
+    with open(nombre_archivo, 'rb') as archivo:
+        archivo.seek(posicion_inicio)
+        return archivo.read()
+
+def leer_datos_codificados(nombre_archivo, posicion_inicio):
+    """
+    Lee los datos codificados del archivo.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .bin
+        posicion_inicio (int): Posición donde comienzan los datos
+        
+    Returns:
+        str: Secuencia de bits como string
+    """
+    datos = leer_bytes_codificados(nombre_archivo, posicion_inicio)
+    
+    # Convertir bytes a bits
+    return str(SecuenciaBits(datos))
+
+# --------------------------------------------------
+# Diccionarios Cargados
+# --------------------------------------------------
+# Diccionarios disponibles para los archivos de versión 4, por identificador
+diccionarios_cargados = {}
+
+def registrar_diccionario(diccionario):
+    """
+    Deja un diccionario disponible para decodificar (reemplaza al de igual identificador).
+    
+    Args:
+        diccionario (DiccionarioHuffman): Diccionario a registrar
+    """
+    diccionarios_cargados[diccionario.identificador] = diccionario
+
+def obtener_diccionario(identificador):
+    """
+    Busca un diccionario cargado.
+    
+    Args:
+        identificador (int): Identificador del diccionario
+        
+    Returns:
+        DiccionarioHuffman: Diccionario registrado
+        
+    Raises:
+        ValueError: Si el diccionario no está cargado
+    """
+    try:
+        return diccionarios_cargados[identificador]
+    except KeyError:
+        raise ValueError(f"El diccionario {identificador} no está cargado") from None
+
+def cargar_diccionario(nombre_archivo):
+    """
+    Lee un archivo de diccionario (ver codificador.guardar_diccionario()) y lo registra.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo del diccionario
+        
+    Returns:
+        DiccionarioHuffman: Diccionario cargado
+        
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        ValueError: Si el archivo no es un diccionario válido
+    """
+    with open(leer_ruta_existente(nombre_archivo), 'rb') as archivo:
+        datos = archivo.read(4)
+        if len(datos) < 4 or datos[:3] != MAGIA_DICCIONARIO:
+            raise ValueError("El archivo no es un diccionario de Huffman")
+        flags = datos[3]
+        identificador, _ = leer_varint(archivo)
+        longitudes, _ = _leer_longitudes(archivo, flags)
+    
+    # El diccionario arma también la tabla de codificación: solo aquí hace falta el codificador
+    from codificador import DiccionarioHuffman
+    diccionario = DiccionarioHuffman(identificador, longitudes, flags)
+    registrar_diccionario(diccionario)
+    return diccionario
+
+# --------------------------------------------------
+# Reconstrucción del Árbol
+# --------------------------------------------------
+def obtener_codigos(cabecera, bloque=None):
+    """
+    Obtiene los códigos de un archivo a partir de su cabecera.
+    
+    En las versiones 2 y 3 se asignan directamente desde las longitudes
+    canónicas, sin árbol ni montículo. En la versión 1 hay que reconstruir
+    el árbol.
+    
+    Args:
+        cabecera (dict): Resultado de leer_cabecera()
+        bloque (dict): Entrada del índice (versión 3 con una tabla por bloque)
+        
+    Returns:
+        tuple: (codigos, raiz_arbol) con los códigos como (valor, longitud).
+        raiz_arbol es None en las versiones 2 y 3. En modo binario cada byte
+        se representa con el carácter de igual valor (latin-1).
+    """
+    longitudes = cabecera['longitudes']
+    if bloque is not None and bloque['longitudes'] is not None:
+        longitudes = bloque['longitudes']
+    if longitudes is not None:
+        codigos = codigos_canonicos(longitudes)
+        if cabecera['flags'] & FLAG_BINARIO:
+            codigos = {chr(byte): codigo for byte, codigo in codigos.items()}
+        return codigos, None
+    raiz = construir_arbol(cabecera['frecuencias'])
+    return generar_codigos_enteros(raiz), raiz
+
+def _clave_codigos(cabecera, bloque=None):
+    """Clave que identifica la tabla de códigos de un archivo (o de un bloque)."""
+    if cabecera.get('diccionario') is not None:
+        # El diccionario mismo es la clave: no hace falta recorrer su tabla
+        return (cabecera['flags'] & FLAG_BINARIO, obtener_diccionario(cabecera['diccionario']))
+    longitudes = cabecera['longitudes']
+    if bloque is not None and bloque['longitudes'] is not None:
+        longitudes = bloque['longitudes']
+    if longitudes is not None:
+        return (cabecera['flags'] & FLAG_BINARIO, tuple(longitudes.items()))
+    return (None, tuple(cabecera['frecuencias'].items()))
+
+def obtener_tabla(cabecera, bloque=None, tamaño_datos=0, bits_por_paso=None):
+    """
+    Obtiene los códigos y la tabla de decodificación, usando cache_tablas.
+    
+    Los archivos que comparten tabla de longitudes (o frecuencias, en la
+    versión 1) reutilizan los códigos, el árbol y las tablas ya construidos.
+    
+    Args:
+        cabecera (dict): Resultado de leer_cabecera()
+        bloque (dict): Entrada del índice (versión 3 con una tabla por bloque)
+        tamaño_datos (int): Bytes a decodificar, para elegir el ancho de paso
+        bits_por_paso (int): Ancho de paso (1, 8 o 16); por defecto se elige solo
+        
+    Returns:
+        tuple: (codigos, raiz_arbol, tabla) como en obtener_codigos(). La
+        tabla es None si no hay bits que decodificar (sin símbolos, o un
+        único carácter en la versión 1). Se comparten entre llamadas y no
+        deben modificarse.
+    """
+    clave = _clave_codigos(cabecera, bloque)
+    if bits_por_paso is None:
+        bits_por_paso = elegir_bits_por_paso(len(clave[1]) - 1, tamaño_datos)
+    
+    def construir():
+        codigos, raiz = obtener_codigos(cabecera, bloque)
+        tabla = None
+        if codigos and (raiz is None or raiz.caracter is None):
+            tabla = construir_tabla_decodificacion(codigos, bits_por_paso)
+        return codigos, raiz, tabla
+    
+    return cache_tablas.obtener((clave, bits_por_paso), construir)
+
+def reconstruir_arbol_desde_archivo(nombre_archivo):
+    """
+    Reconstruye el árbol de Huffman desde un archivo .bin.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .bin
+        
+    Returns:
+        NodoHuffman: Raíz del árbol reconstruido
+    """
+    codigos, raiz = obtener_codigos(leer_cabecera_archivo(nombre_archivo))
+    if raiz is None:
+        raiz = arbol_desde_codigos(codigos)
+    return raiz
+
+# --------------------------------------------------
+# Tablas de Decodificación
+# --------------------------------------------------
+def _peso_tabla(valor):
+    """Entradas de tabla que ocupa un valor de cache_tablas."""
+    codigos, _, tabla = valor
+    if tabla is None:
+        return len(codigos) or 1
+    return len(tabla.salidas) + len(tabla.salidas_bit)
+
+# Códigos y tablas ya construidos, por tabla de longitudes (o frecuencias) y
+# ancho de paso. Cada proceso tiene la suya.
+cache_tablas = CacheLRU(1 << 22, peso=_peso_tabla)
+
+# Entradas máximas de una tabla de 16 bits (unos 130 MB); por encima se usa la de 8
+MAXIMO_ENTRADAS_16_BITS = 1 << 20
+
+class TablaDecodificacion:
+    """
+    Tablas de transición para decodificar varios bits por paso.
+
+    Cada estado corresponde a un nodo interno del árbol (el estado 0 es la
+    raíz). Para un estado y un bloque de ``bits_por_paso`` bits, la tabla
+    indica qué símbolos se emiten y en qué estado queda el recorrido, de modo
+    que un solo acceso puede producir cero, uno o varios caracteres.
+    """
+
+    def __init__(self, salidas, siguientes, salidas_bit, siguientes_bit,
+                 num_estados, bits_por_paso):
+        self.salidas = salidas
+        self.siguientes = siguientes
+        self.salidas_bit = salidas_bit
+        self.siguientes_bit = siguientes_bit
+        self.num_estados = num_estados
+        self.bits_por_paso = bits_por_paso
+
+
+def _tabla_un_bit(codigos):
+    """
+    Construye el trie de los códigos como tabla de transición de 1 bit.
+    
+    Returns:
+        tuple: (salidas, siguientes, num_estados) indexadas por estado*2 + bit
+    """
+    # hijos[estado*2 + bit]: >= 0 estado interno, < 0 hoja (~índice de símbolo),
+    # None si el código es incompleto en esa rama
+    hijos = [None, None]
+    simbolos = []
+    for caracter, (valor, longitud) in codigos.items():
+        estado = 0
+        for posicion in range(longitud - 1, 0, -1):
+            i = estado * 2 + ((valor >> posicion) & 1)
+            if hijos[i] is None:
+                hijos[i] = len(hijos) // 2
+                hijos.extend((None, None))
+            elif hijos[i] < 0:
+                raise ValueError("Los códigos no forman un código prefijo")
+            estado = hijos[i]
+        i = estado * 2 + (valor & 1)
+        if hijos[i] is not None:
+            raise ValueError("Los códigos no forman un código prefijo")
+        hijos[i] = ~len(simbolos)
+        simbolos.append(caracter)
+    
+    salidas = []
+    siguientes = []
+    for hijo in hijos:
+        if hijo is None:
+            # Rama inexistente (código incompleto): se ignora el bit
+            salidas.append("")
+            siguientes.append(0)
+        elif hijo < 0:
+            salidas.append(simbolos[~hijo])
+            siguientes.append(0)
+        else:
+            salidas.append("")
+            siguientes.append(hijo)
+    return salidas, siguientes, len(hijos) // 2
+
+
+def _componer_tabla(salidas, siguientes, num_estados, ancho):
+    """Duplica el ancho de una tabla aplicándola dos veces seguidas."""
+    n = 1 << ancho
+    nuevas_salidas = []
+    nuevos_siguientes = []
+    for estado in range(num_estados):
+        base = estado * n
+        for alto in range(n):
+            prefijo = salidas[base + alto]
+            inicio = siguientes[base + alto] * n
+            if prefijo:
+                nuevas_salidas.extend([prefijo + s for s in salidas[inicio:inicio + n]])
+            else:
+                nuevas_salidas.extend(salidas[inicio:inicio + n])
+            nuevos_siguientes.extend(siguientes[inicio:inicio + n])
+    return nuevas_salidas, nuevos_siguientes
+
+
+def elegir_bits_por_paso(num_estados, tamaño_datos):
+    """
+    Elige el ancho de paso según lo que cuesta construir la tabla.
+    
+    La tabla de 16 bits tiene 65536 entradas por estado, así que solo compensa
+    cuando los datos a decodificar son bastante más grandes que la tabla, y
+    solo se usa si no pasa de MAXIMO_ENTRADAS_16_BITS (árboles de hasta 16
+    estados): con más estados ocuparía cientos de MB, no cabría en
+    cache_tablas y se reconstruiría en cada llamada. Con muy pocos datos
+    (registros cortos) tampoco compensa la de 8 bits y se decodifica de a un
+    bit con la tabla de un bit.
+    
+    Args:
+        num_estados (int): Nodos internos del árbol
+        tamaño_datos (int): Bytes de datos codificados
+        
+    Returns:
+        int: 1, 8 o 16
+    """
+    # Un código de un solo símbolo igual tiene un estado (la raíz)
+    num_estados = max(num_estados, 1)
+    entradas_16 = num_estados << 16
+    if entradas_16 <= MAXIMO_ENTRADAS_16_BITS and entradas_16 * 10 <= tamaño_datos:
+        return 16
+    if tamaño_datos * 8 < num_estados * 32:
+        return 1
+    return 8
+
+
+def construir_tabla_decodificacion(codigos, bits_por_paso=8):
+    """
+    Construye las tablas de decodificación multi-bit a partir de los códigos.
+    
+    Args:
+        codigos (dict): Diccionario {caracter: (valor, longitud)}
+        bits_por_paso (int): Bits resueltos en cada acceso (1, 8 o 16)
+        
+    Returns:
+        TablaDecodificacion: Tablas listas para decodificar_bytes()
+        
+    Raises:
+        ValueError: Si el ancho no es válido o los códigos no son un código prefijo
+    """
+    if bits_por_paso not in (1, 8, 16):
+        raise ValueError("bits_por_paso debe ser 1, 8 o 16")
+    
+    salidas_bit, siguientes_bit, num_estados = _tabla_un_bit(codigos)
+    
+    # 1 -> 2 -> 4 -> 8 (-> 16) bits por paso
+    salidas, siguientes = salidas_bit, siguientes_bit
+    ancho = 1
+    while ancho < bits_por_paso:
+        salidas, siguientes = _componer_tabla(salidas, siguientes, num_estados, ancho)
+        ancho *= 2
+    
+    # Con 16 bits se leen palabras en el orden nativo de la máquina
+    # (memoryview.cast, sin copiar); en little-endian se reordena la tabla
+    if bits_por_paso == 16 and sys.byteorder == 'little':
+        orden = [((valor & 0xFF) << 8) | (valor >> 8) for valor in range(1 << 16)]
+        salidas = [salidas[base + i] for base in range(0, len(salidas), 1 << 16) for i in orden]
+        siguientes = [siguientes[base + i] for base in range(0, len(siguientes), 1 << 16) for i in orden]
+    
+    # Guardar los estados premultiplicados para ahorrar una operación por paso
+    n = 1 << bits_por_paso
+    siguientes = [estado * n for estado in siguientes]
+    siguientes_bit = [estado * 2 for estado in siguientes_bit]
+    
+    return TablaDecodificacion(salidas, siguientes, salidas_bit, siguientes_bit,
+                               num_estados, bits_por_paso)
+
+
+def decodificar_tramo(datos, num_bits, tabla, estado=0):
+    """
+    Decodifica un tramo de bits empaquetados partiendo de un estado dado.
+    
+    Permite decodificar un archivo por partes: el estado devuelto (el nodo
+    interno donde quedó el recorrido) se pasa a la llamada del tramo siguiente.
+    
+    Args:
+        datos (bytes): Bits empaquetados (el primer bit es el más significativo)
+        num_bits (int): Cantidad de bits válidos del tramo
+        tabla (TablaDecodificacion): Tablas de decodificación
+        estado (int): Estado inicial (0 = raíz)
+        
+    Returns:
+        tuple: (texto_decodificado, estado_final)
+    """
+    salidas = tabla.salidas
+    siguientes = tabla.siguientes
+    partes = []
+    agregar = partes.append
+    estado <<= tabla.bits_por_paso
+    
+    bytes_completos = num_bits >> 3
+    if tabla.bits_por_paso == 16:
+        pares = bytes_completos >> 1
+        for palabra in memoryview(datos)[:pares * 2].cast('H'):
+            i = estado + palabra
+            agregar(salidas[i])
+            estado = siguientes[i]
+        # Con 16 bits el estado va multiplicado por 65536; se pasa a la tabla de bits
+        estado >>= 15
+        procesados = pares * 16
+    elif tabla.bits_por_paso == 1:
+        # Todo se resuelve con la tabla de un bit, abajo
+        procesados = 0
+    else:
+        for byte in datos[:bytes_completos]:
+            i = estado + byte
+            agregar(salidas[i])
+            estado = siguientes[i]
+        estado >>= 7
+        procesados = bytes_completos * 8
+    
+    # Bits sueltos del final (incluye el último byte con relleno)
+    salidas_bit = tabla.salidas_bit
+    siguientes_bit = tabla.siguientes_bit
+    for posicion in range(procesados, num_bits):
+        i = estado + ((datos[posicion >> 3] >> (7 - (posicion & 7))) & 1)
+        agregar(salidas_bit[i])
+        estado = siguientes_bit[i]
+    
+    return ''.join(partes), estado >> 1
+
+def decodificar_bytes(datos, num_bits, tabla):
+    """
+    Decodifica bits empaquetados usando las tablas multi-bit.
+    
+    Args:
+        datos (bytes): Bits empaquetados (el primer bit es el más significativo)
+        num_bits (int): Cantidad de bits válidos (excluye el relleno final)
+        tabla (TablaDecodificacion): Tablas de decodificación
+        
+    Returns:
+        str: Mensaje decodificado
+    """
+    return decodificar_tramo(datos, num_bits, tabla)[0]
+
+
+# --------------------------------------------------
+# Decodificación
+# --------------------------------------------------
+def decodificar_bits(bits, raiz, bits_por_paso=None):
+    """
+    Decodifica una secuencia de bits usando el árbol de Huffman.
+    
+    Construye las tablas multi-bit del árbol y decodifica de a 8 o 16 bits
+    por paso en lugar de recorrer el árbol bit a bit.
+    
+    Args:
+        bits (str | SecuenciaBits): Secuencia de bits a decodificar
+        raiz (NodoHuffman): Raíz del árbol de Huffman
+        bits_por_paso (int): Ancho de paso (1, 8 o 16); por defecto se elige solo
+        
+    Returns:
+        str: Mensaje decodificado
+    """
+    if not bits or raiz is None:
+        return ""
+    
+    # Árbol de un solo nodo: el código es vacío y no se puede recorrer
+    if raiz.caracter is not None:
+        return ""
+    
+    if not isinstance(bits, SecuenciaBits):
+        bits = SecuenciaBits.desde_texto(bits)
+    
+    codigos = generar_codigos_enteros(raiz)
+    if bits_por_paso is None:
+        bits_por_paso = elegir_bits_por_paso(len(codigos) - 1, len(bits.datos))
+    _, _, tabla = cache_tablas.obtener(
+        (('arbol', tuple(codigos.items())), bits_por_paso),
+        lambda: (codigos, None, construir_tabla_decodificacion(codigos, bits_por_paso))
+    )
+    return decodificar_bytes(bits.datos, len(bits), tabla)
+
+def decodificar_bits_arbol(bits, raiz):
+    """
+    Decodifica una secuencia de bits recorriendo el árbol bit a bit.
+    
+    Es el decodificador de referencia; decodificar_bits() da el mismo
+    resultado usando tablas.
+    
+    Args:
+        bits (str): Secuencia de bits a decodificar
+        raiz (NodoHuffman): Raíz del árbol de Huffman
+        
+    Returns:
+        str: Mensaje decodificado
+    """
+    if not bits or raiz is None:
+        return ""
+    
+    mensaje = []
+    nodo_actual = raiz
+    
+    for bit in bits:
+        # Navegar por el árbol según el bit
+        if bit == '0':
+            nodo_actual = nodo_actual.izquierda
+        else:
+            nodo_actual = nodo_actual.derecha
+        
+        # Verificar si llegamos a una hoja
+        if nodo_actual.caracter is not None:
+            mensaje.append(nodo_actual.caracter)
+            nodo_actual = raiz  # Volver a la raíz para el siguiente carácter
+    
+    return ''.join(mensaje)
+
+def decodificar_archivo(nombre_archivo):
+    """
+    Decodifica un archivo .bin completo.
+    
+    La lectura, la cabecera, la tabla, el recorrido de bits y la verificación
+    son etapas medibles con instrumentacion.medir_etapas().
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .bin
+        
+    Returns:
+        tuple: (mensaje_decodificado, raiz_arbol, bits_leidos)
+        
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        ValueError: Si el archivo está corrupto
+    """
+    with etapa('decodificar_archivo') as total:
+        with etapa('abrir_archivo') as medida:
+            archivo_huffman = ArchivoHuffman(nombre_archivo)
+            medida.contar(num_bytes=archivo_huffman.tamaño)
+        resultado = archivo_huffman.decodificar()
+        total.contar(num_bytes=archivo_huffman.tamaño, simbolos=len(resultado[0]))
+    return resultado
+
+def decodificar_bloques(archivo, cabecera, bloques=None):
+    """
+    Decodifica bloques de un archivo de versión 3, uno por vez.
+    
+    Args:
+        archivo: Archivo binario abierto (con seek) o LectorMemoria
+        cabecera (dict): Cabecera con el índice de bloques
+        bloques (list): Entradas del índice a decodificar (por defecto, todas)
+        
+    Yields:
+        tuple: (bloque, datos, texto) para cada bloque, en orden
+    """
+    if bloques is None:
+        bloques = cabecera['bloques']
+    
+    # Con un LectorMemoria los bloques se leen sin copiar
+    leer = getattr(archivo, 'leer_vista', archivo.read)
+    tabla_compartida = None
+    for bloque in bloques:
+        archivo.seek(bloque['posicion'])
+        datos = leer(bloque['tamaño'])
+        num_bits = min(len(datos) * 8, bloque['bits_totales'])
+        
+        if bloque['longitudes'] is None:
+            if tabla_compartida is None:
+                _, _, tabla_compartida = obtener_tabla(
+                    cabecera, tamaño_datos=bloque['tamaño'] * len(bloques)
+                )
+            tabla = tabla_compartida
+        else:
+            _, _, tabla = obtener_tabla(cabecera, bloque, len(datos))
+        
+        # Un registro vacío de un lote no tiene bits (ni, quizá, códigos)
+        texto = decodificar_bytes(datos, num_bits, tabla) if bloque['num_simbolos'] else ""
+        verificar_crc(texto, bloque['crc'], cabecera['flags'], bloque)
+        yield bloque, datos, texto
+
+def _decodificar_archivo_bloques(lector, cabecera):
+    """
+    Decodifica un archivo de versión 3 completo.
+    
+    Returns:
+        tuple: (mensaje_decodificado, raiz_arbol, bits_leidos). El árbol y
+        los bits corresponden al primer bloque (o a la tabla compartida).
+    """
+    partes = []
+    for bloque, datos, texto in decodificar_bloques(lector, cabecera):
+        if not partes:
+            primero, datos_primero = bloque, datos
+        partes.append(texto)
+    mensaje = ''.join(partes)
+    
+    if not partes:
+        return mensaje, None, SecuenciaBits(b"", 0)
+    
+    codigos, _ = obtener_codigos(cabecera, primero)
+    frecuencias = Counter(mensaje if primero['longitudes'] is None else partes[0])
+    raiz = arbol_desde_codigos(codigos, frecuencias)
+    # Los bits devueltos llevan su propia copia de los datos (ver abrir_mapeado())
+    bits = SecuenciaBits(bytes(datos_primero), min(len(datos_primero) * 8, primero['bits_totales']))
+    return mensaje, raiz, bits
+
+def decodificar_binario(nombre_archivo):
+    """
+    Decodifica un archivo .bin devolviendo bytes.
+    
+    Los archivos codificados en modo binario devuelven los bytes originales;
+    los de texto devuelven el mensaje codificado en UTF-8.
     
     Args:
         nombre_archivo (str): Ruta del archivo .bin
         
     Returns:
-        tuple: (frecuencias, bits_descartados, posicion_datos)
+        bytes: Datos decodificados
         
     Raises:
         FileNotFoundError: Si el archivo no existe
         ValueError: Si el archivo está corrupto
     """
-    if not os.path.exists(nombre_archivo):
-        raise FileNotFoundError(f"El archivo '{nombre_archivo}' no existe")
+    lector = abrir_mapeado(nombre_archivo)
+    cabecera = leer_cabecera(lector)
+    if not cabecera['flags'] & FLAG_BINARIO:
+        return decodificar_archivo(nombre_archivo)[0].encode('utf-8')
+    if cabecera['version'] == VERSION_BLOQUES:
+        return b''.join(
+            texto.encode('latin-1') for _, _, texto in decodificar_bloques(lector, cabecera)
+        )
     
-    with open(nombre_archivo, 'rb') as archivo:
-        try:
-            # Leer cantidad de caracteres únicos (4 bytes)
-            datos = archivo.read(4)
-            if len(datos) < 4:
-                raise ValueError("Archivo corrupto: no se puede leer el número de caracteres")
-            
-            num_caracteres = struct.unpack('>I', datos)[0]
-            
-            # Leer caracteres y frecuencias
-            frecuencias = {}
-            for _ in range(num_caracteres):
-                datos = archivo.read(3)
-                if len(datos) < 3:
-                    raise ValueError("Archivo corrupto: datos de frecuencias incompletos")
-                
-                caracter, freq = struct.unpack('>cH', datos)
-                frecuencias[caracter.decode('utf-8')] = freq
-            
-            # Leer bits descartados
-            datos = archivo.read(1)
-            if len(datos) < 1:
-                raise ValueError("Archivo corrupto: no se puede leer bits descartados")
-            
-            bits_descartados = struct.unpack('>B', datos)[0]
-            
-            # Obtener posición actual para los datos
-            posicion_datos = archivo.tell()
-            
-            return frecuencias, bits_descartados, posicion_datos
-            
-        except struct.error as e:
-            raise ValueError(f"Archivo corrupto: error al leer estructura de datos - {e}")
+    datos = lector.vista[cabecera['posicion_datos']:]
+    num_bits = min(max(len(datos) * 8 - cabecera['bits_descartados'], 0), cabecera['bits_totales'])
+    _, _, tabla = obtener_tabla(cabecera, tamaño_datos=len(datos))
+    # Un archivo vacío no tiene códigos ni tabla
+    texto = decodificar_bytes(datos, num_bits, tabla) if tabla is not None else ""
+    verificar_crc(texto, cabecera['crc'], cabecera['flags'])
+    return texto.encode('latin-1')
 
-def leer_datos_codificados(nombre_archivo, posicion_inicio):
+def decodificar_registro(datos):
     """
-    Lee los datos codificados del archivo.
+    Decodifica un registro en memoria, como los de codificador.codificar_registro().
+    
+    No abre archivos: la cabecera se lee del propio buffer. Los registros de
+    versión 4 necesitan su diccionario cargado (ver cargar_diccionario()).
     
     Args:
-        nombre_archivo (str): Ruta del archivo .bin
-        posicion_inicio (int): Posición donde comienzan los datos
+        datos (bytes | bytearray | memoryview): Registro completo
         
     Returns:
-        str: Secuencia de bits como string
+        str | bytes: Mensaje decodificado (bytes si el registro es binario)
+        
+    Raises:
+        ValueError: Si el registro está corrupto o falta su diccionario
     """
-    with open(nombre_archivo, 'rb') as archivo:
-        archivo.seek(posicion_inicio)
-        datos = archivo.read()
+    lector = LectorMemoria(datos)
+    cabecera = leer_cabecera(lector)
+    if cabecera['version'] == VERSION_BLOQUES:
+        texto = ''.join(texto for _, _, texto in decodificar_bloques(lector, cabecera))
+    else:
+        datos = lector.vista[cabecera['posicion_datos']:]
+        num_bits = max(len(datos) * 8 - cabecera['bits_descartados'], 0)
+        if cabecera['bits_totales'] is not None:
+            num_bits = min(num_bits, cabecera['bits_totales'])
         
-        # Convertir bytes a bits
-        bits = ''.join(f'{byte:08b}' for byte in datos)
-        return bits
+        codigos, raiz, tabla = obtener_tabla(cabecera, tamaño_datos=len(datos))
+        if tabla is not None:
+            texto = decodificar_bytes(datos, num_bits, tabla)
+        elif raiz is not None:
+            # Un único carácter en la versión 1: sin bits
+            texto = raiz.caracter * raiz.frecuencia
+        else:
+            texto = ""
+        verificar_crc(texto, cabecera['crc'], cabecera['flags'])
+    
+    if cabecera['flags'] & FLAG_BINARIO:
+        return texto.encode('latin-1')
+    return texto
 
 # --------------------------------------------------
-# Reconstrucción del Árbol
+# Decodificación en Streaming
 # --------------------------------------------------
-def reconstruir_arbol_desde_archivo(nombre_archivo):
+def decodificar_en_bloques(origen, tamaño_bloque=1 << 16):
     """
-    Reconstruye el árbol de Huffman desde un archivo .bin.
+    Decodifica un archivo .bin bloque a bloque, entregando el texto a medida.
+    
+    Solo mantiene en memoria un bloque de datos codificados y el siguiente
+    (para saber cuál es el último y descontar ahí los bits de relleno).
+    
+    En la versión 3 cada bloque se verifica con su CRC32 antes de entregarlo,
+    así que un bloque dañado se informa (con su número y posición) sin haber
+    entregado su texto. En la versión 2 el CRC cubre el mensaje completo y
+    solo se comprueba al final, después de entregar todo el texto.
     
     Args:
-        nombre_archivo (str): Ruta del archivo .bin
+        origen (str | archivo): Ruta del archivo .bin o archivo binario abierto
+        tamaño_bloque (int): Bytes codificados leídos por bloque
+        
+    Yields:
+        str: Fragmentos consecutivos del mensaje decodificado
+        
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        ValueError: Si el archivo está corrupto
+    """
+    if isinstance(origen, (str, os.PathLike)):
+        if not os.path.exists(origen):
+            raise FileNotFoundError(f"El archivo '{origen}' no existe")
+        with open(origen, 'rb') as archivo:
+            yield from decodificar_en_bloques(archivo, tamaño_bloque)
+        return
+    
+    archivo = origen
+    cabecera = leer_cabecera(archivo)
+    if cabecera['version'] == VERSION_BLOQUES:
+        # Cada bloque ya está acotado por el tamaño de bloque del codificador
+        for _, _, texto in decodificar_bloques(archivo, cabecera):
+            if texto:
+                yield texto
+        return
+    
+    bits_descartados = cabecera['bits_descartados']
+    codigos, raiz, tabla = obtener_tabla(cabecera, bits_por_paso=8)
+    if not codigos:
+        return
+    
+    # Un único carácter distinto en la versión 1: no hay bits, se repite según su frecuencia
+    if raiz is not None and raiz.caracter is not None:
+        for inicio in range(0, raiz.frecuencia, tamaño_bloque):
+            yield raiz.caracter * min(tamaño_bloque, raiz.frecuencia - inicio)
+        return
+    
+    estado = 0
+    crc = 0
+    codificacion = 'latin-1' if cabecera['flags'] & FLAG_BINARIO else 'utf-8'
+    leer = getattr(archivo, 'leer_vista', archivo.read)
+    actual = leer(tamaño_bloque)
+    while actual:
+        siguiente = leer(tamaño_bloque)
+        num_bits = len(actual) * 8
+        if not siguiente:
+            # Último bloque: descartar el relleno
+            num_bits = max(num_bits - bits_descartados, 0)
+        texto, estado = decodificar_tramo(actual, num_bits, tabla, estado)
+        if texto:
+            if cabecera['crc'] is not None:
+                crc = crc_contenido(texto, crc, codificacion)
+            yield texto
+        actual = siguiente
+    
+    # El CRC se acumula trozo a trozo y se comprueba al terminar
+    if cabecera['crc'] is not None and crc != cabecera['crc']:
+        raise ValueError("Archivo corrupto: el mensaje no coincide con la suma de verificación")
+
+def decodificar_a_salida(origen, salida, tamaño_bloque=1 << 16):
+    """
+    Decodifica un archivo .bin escribiendo el mensaje en un flujo de salida.
+    
+    Args:
+        origen (str | archivo): Ruta del archivo .bin o archivo binario abierto
+        salida: Flujo de texto con método write() (archivo, sys.stdout, StringIO)
+        tamaño_bloque (int): Bytes codificados leídos por bloque
         
     Returns:
-        NodoHuffman: Raíz del árbol reconstruido
+        int: Cantidad de caracteres escritos
     """
-    frecuencias, _, _ = leer_metadatos_archivo(nombre_archivo)
-    return construir_arbol(frecuencias)
+    total = 0
+    for texto in decodificar_en_bloques(origen, tamaño_bloque):
+        salida.write(texto)
+        total += len(texto)
+    return total
 
 # --------------------------------------------------
-# Decodificación
+# Decodificación Paralela y Acceso Aleatorio
 # --------------------------------------------------
-def decodificar_bits(bits, raiz):
+def _decodificar_bloque_en_proceso(nombre_archivo, cabecera, bloque):
+    """Lee y decodifica un bloque (se ejecuta en los procesos del pool)."""
+    # Los bloques con tabla compartida reutilizan la tabla de cache_tablas
+    _, _, tabla = obtener_tabla(cabecera, bloque, bits_por_paso=8)
+    
+    with open(nombre_archivo, 'rb') as archivo:
+        archivo.seek(bloque['posicion'])
+        datos = archivo.read(bloque['tamaño'])
+    num_bits = min(len(datos) * 8, bloque['bits_totales'])
+    texto = decodificar_bytes(datos, num_bits, tabla)
+    verificar_crc(texto, bloque['crc'], cabecera['flags'], bloque)
+    return texto
+
+def decodificar_paralelo(nombre_archivo, procesos=None):
     """
-    Decodifica una secuencia de bits usando el árbol de Huffman.
+    Decodifica un archivo de versión 3 repartiendo los bloques entre procesos.
+    
+    Cada proceso lee su bloque directamente del archivo usando el índice, así
+    que solo viajan entre procesos la cabecera y el texto decodificado. Los
+    archivos sin índice (versiones 1 y 2) se decodifican en este proceso.
     
     Args:
-        bits (str): Secuencia de bits a decodificar
-        raiz (NodoHuffman): Raíz del árbol de Huffman
+        nombre_archivo (str): Ruta del archivo .bin
+        procesos (int): Procesos a usar (None = todos los núcleos, 1 = sin procesos)
         
     Returns:
-        str: Mensaje decodificado
+        str: Mensaje decodificado (en modo binario, un carácter latin-1 por byte)
+        
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        ValueError: Si el archivo está corrupto
     """
-    if not bits or raiz is None:
-        return ""
-    
-    mensaje = []
-    nodo_actual = raiz
+    cabecera = leer_cabecera_archivo(nombre_archivo)
+    if cabecera['version'] != VERSION_BLOQUES:
+        return decodificar_archivo(nombre_archivo)[0]
     
-    for bit in bits:
-        # Navegar por el árbol según el bit
-        if bit == '0':
-            nodo_actual = nodo_actual.izquierda
-        else:
-            nodo_actual = nodo_actual.derecha
-        
-        # Verificar si llegamos a una hoja
-        if nodo_actual.caracter is not None:
-            mensaje.append(nodo_actual.caracter)
-            nodo_actual = raiz  # Volver a la raíz para el siguiente carácter
+    bloques = cabecera['bloques']
+    procesos = min(procesos or os.cpu_count() or 1, len(bloques))
+    if procesos <= 1:
+        return ''.join(
+            _decodificar_bloque_en_proceso(nombre_archivo, cabecera, bloque) for bloque in bloques
+        )
     
-    return ''.join(mensaje)
+    # El índice completo no viaja con cada tarea: cada una recibe solo su bloque
+    cabecera = {clave: valor for clave, valor in cabecera.items() if clave != 'bloques'}
+    # Importado aquí: concurrent.futures.process arrastra multiprocessing y logging
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(procesos) as executor:
+        return ''.join(executor.map(
+            _decodificar_bloque_en_proceso,
+            [nombre_archivo] * len(bloques), [cabecera] * len(bloques), bloques,
+            chunksize=max(1, len(bloques) // (procesos * 4))
+        ))
 
-def decodificar_archivo(nombre_archivo):
+def decodificar_rango(nombre_archivo, inicio, fin=None):
     """
-    Decodifica un archivo .bin completo.
+    Decodifica solo los caracteres [inicio, fin) del mensaje.
+    
+    En archivos de versión 3 se usa el índice para leer y decodificar solo los
+    bloques que contienen el rango. En las versiones 1 y 2 se decodifica en
+    streaming desde el principio y se detiene al llegar a `fin`.
     
     Args:
         nombre_archivo (str): Ruta del archivo .bin
+        inicio (int): Primer carácter (admite negativos, como en las rebanadas)
+        fin (int): Carácter siguiente al último (None = hasta el final)
         
     Returns:
-        tuple: (mensaje_decodificado, raiz_arbol, bits_leidos)
+        str: Fragmento decodificado
         
     Raises:
         FileNotFoundError: Si el archivo no existe
         ValueError: Si el archivo está corrupto
     """
-    # Leer metadatos
-    frecuencias, bits_descartados, posicion_datos = leer_metadatos_archivo(nombre_archivo)
+    archivo = abrir_mapeado(nombre_archivo)
+    cabecera = leer_cabecera(archivo)
+    inicio, fin, _ = slice(inicio, fin).indices(cabecera['num_simbolos'])
+    if fin <= inicio:
+        return ""
+    
+    if cabecera['version'] != VERSION_BLOQUES:
+        archivo.seek(0)
+        partes = []
+        leidos = 0
+        for texto in decodificar_en_bloques(archivo):
+            if leidos + len(texto) > inicio:
+                partes.append(texto[max(inicio - leidos, 0):fin - leidos])
+            leidos += len(texto)
+            if leidos >= fin:
+                break
+        return ''.join(partes)
+    
+    # Símbolos acumulados al final de cada bloque
+    bloques = cabecera['bloques']
+    finales = list(accumulate(bloque['num_simbolos'] for bloque in bloques))
+    primero = bisect_right(finales, inicio)
+    ultimo = bisect_right(finales, fin - 1)
+    desplazamiento = finales[primero - 1] if primero else 0
+    
+    texto = ''.join(
+        texto for _, _, texto in decodificar_bloques(archivo, cabecera, bloques[primero:ultimo + 1])
+    )
+    return texto[inicio - desplazamiento:fin - desplazamiento]
+
+# --------------------------------------------------
+# Decodificación por Lotes
+# --------------------------------------------------
+def _como_registro(texto, cabecera):
+    """En modo binario los registros se devuelven como bytes."""
+    if cabecera['flags'] & FLAG_BINARIO:
+        return texto.encode('latin-1')
+    return texto
+
+def _decodificar_grupo_en_proceso(nombre_archivo, cabecera, bloques):
+    """Decodifica varios registros de un lote (se ejecuta en los procesos del pool)."""
+    lector = abrir_mapeado(nombre_archivo)
+    return [_como_registro(texto, cabecera)
+            for _, _, texto in decodificar_bloques(lector, cabecera, bloques)]
+
+def _decodificar_archivo_suelto(nombre_archivo):
+    """Decodifica un archivo .bin completo como un registro (se ejecuta en los procesos)."""
+    return decodificar_registro(abrir_mapeado(nombre_archivo).vista)
+
+def decodificar_lote(origen, procesos=1, tamaño_grupo=1 << 20):
+    """
+    Decodifica muchos mensajes en una llamada.
+    
+    Acepta un archivo de codificador.codificar_lote() (un registro por
+    bloque) o una lista de archivos .bin sueltos. En los dos casos las tablas
+    se toman de cache_tablas, así que los registros con la misma tabla no la
+    reconstruyen, y las tareas enviadas a los procesos agrupan varios
+    registros.
+    
+    Args:
+        origen (str | list): Ruta del archivo del lote, o lista de rutas .bin
+        procesos (int): Procesos a usar (None = todos los núcleos, 1 = sin procesos)
+        tamaño_grupo (int): Bytes codificados aproximados por tarea
+        
+    Returns:
+        list: Mensajes decodificados, en orden (bytes en modo binario)
+        
+    Raises:
+        FileNotFoundError: Si algún archivo no existe
+        ValueError: Si algún archivo está corrupto
+    """
+    procesos = procesos or os.cpu_count() or 1
     
-    # Leer datos codificados
-    bits_completos = leer_datos_codificados(nombre_archivo, posicion_datos)
+    if not isinstance(origen, (str, os.PathLike)):
+        nombres = list(origen)
+        if procesos <= 1 or len(nombres) <= 1:
+            return [_decodificar_archivo_suelto(nombre) for nombre in nombres]
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(min(procesos, len(nombres))) as executor:
+            return list(executor.map(
+                _decodificar_archivo_suelto, nombres,
+                chunksize=max(1, len(nombres) // (procesos * 4))
+            ))
     
-    # Remover bits de relleno
-    if bits_descartados > 0:
-        bits_completos = bits_completos[:-bits_descartados]
+    lector = abrir_mapeado(origen)
+    cabecera = leer_cabecera(lector)
+    if cabecera['version'] != VERSION_BLOQUES or not cabecera['flags'] & FLAG_REGISTROS:
+        # Un archivo común es un lote de un solo mensaje
+        return [decodificar_registro(lector.vista)]
     
-    # Reconstruir árbol
-    raiz = construir_arbol(frecuencias)
+    bloques = cabecera['bloques']
+    if procesos <= 1 or len(bloques) <= 1:
+        return [_como_registro(texto, cabecera)
+                for _, _, texto in decodificar_bloques(lector, cabecera)]
     
-    # Decodificar mensaje
-    mensaje = decodificar_bits(bits_completos, raiz)
+    # Grupos de registros consecutivos de unos `tamaño_grupo` bytes codificados
+    grupos = []
+    grupo = []
+    acumulado = 0
+    for bloque in bloques:
+        grupo.append(bloque)
+        acumulado += bloque['tamaño']
+        if acumulado >= tamaño_grupo:
+            grupos.append(grupo)
+            grupo = []
+            acumulado = 0
+    if grupo:
+        grupos.append(grupo)
     
-    return mensaje, raiz, bits_completos
+    cabecera = {clave: valor for clave, valor in cabecera.items() if clave != 'bloques'}
+    registros = []
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(min(procesos, len(grupos))) as executor:
+        for parte in executor.map(_decodificar_grupo_en_proceso,
+                                  [origen] * len(grupos), [cabecera] * len(grupos), grupos):
+            registros.extend(parte)
+    return registros
+
+def leer_registro(nombre_archivo, numero):
+    """
+    Decodifica un solo registro de un lote usando el índice de bloques.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo del lote
+        numero (int): Posición del registro (admite negativos)
+        
+    Returns:
+        str | bytes: Mensaje decodificado (bytes en modo binario)
+        
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        IndexError: Si el registro no existe
+        ValueError: Si el archivo no es un lote o está corrupto
+    """
+    lector = abrir_mapeado(nombre_archivo)
+    cabecera = leer_cabecera(lector)
+    if cabecera['version'] != VERSION_BLOQUES or not cabecera['flags'] & FLAG_REGISTROS:
+        raise ValueError("El archivo no es un lote de registros")
+    bloque = cabecera['bloques'][numero]
+    for _, _, texto in decodificar_bloques(lector, cabecera, [bloque]):
+        return _como_registro(texto, cabecera)
 
 # --------------------------------------------------
 # Decodificación Paso a Paso
@@ -213,52 +1438,325 @@ def decodificar_paso_a_paso(bits, raiz):
         yield paso
 
 # --------------------------------------------------
-# Validación y Verificación
+# Archivo .bin Analizado
 # --------------------------------------------------
-def validar_archivo(nombre_archivo):
+class ArchivoHuffman:
     """
-    Valida que un archivo .bin sea válido y no esté corrupto.
+    Archivo .bin abierto una sola vez.
     
-    Args:
-        nombre_archivo (str): Ruta del archivo .bin
-        
-    Returns:
-        dict: Información de validación
+    Mapea el archivo al crearse y guarda la cabecera, los datos y el mensaje
+    a medida que se piden, de modo que validar, analizar y decodificar el
+    mismo archivo no lo vuelve a leer ni a decodificar.
     """
-    try:
-        # Verificar que el archivo existe
-        if not os.path.exists(nombre_archivo):
+    
+    def __init__(self, nombre_archivo):
+        """
+        Args:
+            nombre_archivo (str): Ruta del archivo .bin
+            
+        Raises:
+            FileNotFoundError: Si el archivo no existe
+        """
+        self.nombre_archivo = nombre_archivo
+        self.lector = abrir_mapeado(nombre_archivo)
+        self.tamaño = len(self.lector.vista)
+        self._cabecera = None
+        self._decodificado = None
+    
+    @property
+    def cabecera(self):
+        """dict: Cabecera del archivo (ver leer_cabecera()), leída una vez."""
+        if self._cabecera is None:
+            with etapa('leer_cabecera') as medida:
+                self.lector.seek(0)
+                self._cabecera = leer_cabecera(self.lector)
+                medida.contar(num_bytes=self.lector.tell())
+        return self._cabecera
+    
+    @property
+    def mensaje(self):
+        """str: Mensaje decodificado (se decodifica la primera vez que se pide)."""
+        return self.decodificar()[0]
+    
+    def validar(self):
+        """
+        Valida el archivo leyendo solo la cabecera.
+        
+        Returns:
+            dict: Información de validación (ver validar_archivo())
+        """
+        try:
+            # Verificar tamaño mínimo
+            if self.tamaño < 5:  # Mínimo: 4 bytes (num chars) + 1 byte (bits descartados)
+                return {
+                    'valido': False,
+                    'error': 'Archivo demasiado pequeño'
+                }
+            
+            cabecera = self.cabecera
+            posicion_datos = cabecera['posicion_datos']
+            
+            # Verificar que hay datos después de los metadatos (en la versión 1 un
+            # único carácter tiene código vacío y el archivo no lleva datos, y
+            # un mensaje vacío solo tiene cabecera)
+            sin_bits = (cabecera['version'] == VERSION_FRECUENCIAS and cabecera['caracteres_unicos'] == 1
+                        or cabecera['num_simbolos'] == 0)
+            if posicion_datos >= self.tamaño and not sin_bits:
+                return {
+                    'valido': False,
+                    'error': 'No hay datos codificados'
+                }
+            
+            # Verificar que la cabecera coincide con el tamaño de los datos
+            estadisticas = estadisticas_cabecera(cabecera, self.tamaño)
+            if not estadisticas['consistente']:
+                return {
+                    'valido': False,
+                    'error': estadisticas['error']
+                }
+            
             return {
-                'valido': False,
-                'error': 'Archivo no encontrado'
+                'valido': True,
+                'version': cabecera['version'],
+                'tamaño': self.tamaño,
+                'caracteres_unicos': cabecera['caracteres_unicos'],
+                'bits_descartados': cabecera['bits_descartados'],
+                'tamaño_datos': estadisticas['bytes_datos'],
+                'longitud_esperada': estadisticas['longitud_esperada'],
+                'bits_esperados': estadisticas['bits_esperados']
             }
-        
-        # Verificar tamaño mínimo
-        tamaño = os.path.getsize(nombre_archivo)
-        if tamaño < 5:  # Mínimo: 4 bytes (num chars) + 1 byte (bits descartados)
+            
+        except Exception as e:
             return {
                 'valido': False,
-                'error': 'Archivo demasiado pequeño'
+                'error': str(e)
             }
+    
+    def decodificar(self):
+        """
+        Decodifica el archivo (solo la primera vez).
+        
+        Returns:
+            tuple: (mensaje_decodificado, raiz_arbol, bits_leidos)
+            
+        Raises:
+            ValueError: Si el archivo está corrupto
+        """
+        if self._decodificado is None:
+            self._decodificado = self._decodificar()
+        return self._decodificado
+    
+    def _decodificar(self):
+        cabecera = self.cabecera
+        if cabecera['version'] == VERSION_BLOQUES:
+            with etapa('decodificar_bloques', num_bytes=self.tamaño) as medida:
+                resultado = _decodificar_archivo_bloques(self.lector, cabecera)
+                medida.contar(simbolos=len(resultado[0]))
+            return resultado
+        
+        # Datos codificados: vista sobre el mapeo, sin copiar ni expandir a '0'/'1'
+        datos = self.lector.vista[cabecera['posicion_datos']:]
+        
+        # Remover bits de relleno
+        num_bits = max(len(datos) * 8 - cabecera['bits_descartados'], 0)
+        if cabecera['bits_totales'] is not None:
+            num_bits = min(num_bits, cabecera['bits_totales'])
+        
+        # Los bits devueltos llevan su propia copia (del tamaño comprimido): una
+        # vista sobre el mapeo fallaría si el archivo se reescribe después
+        bits_completos = SecuenciaBits(bytes(datos), num_bits)
         
-        # Intentar leer metadatos
-        frecuencias, bits_descartados, posicion_datos = leer_metadatos_archivo(nombre_archivo)
+        # Obtener códigos (reconstruyendo el árbol solo en la versión 1)
+        with etapa('obtener_tabla', simbolos=cabecera['caracteres_unicos']):
+            codigos, raiz, tabla = obtener_tabla(cabecera, tamaño_datos=len(datos))
+        
+        # Decodificar mensaje
+        with etapa('decodificar_bits', num_bytes=len(datos)) as medida:
+            if raiz is not None and raiz.caracter is not None:
+                # Un único carácter distinto: el código es vacío y no hay bits que leer
+                mensaje = raiz.caracter * raiz.frecuencia
+            elif codigos:
+                mensaje = decodificar_bytes(datos, num_bits, tabla)
+            else:
+                mensaje = ""
+            medida.contar(simbolos=len(mensaje))
+        with etapa('verificar_crc', simbolos=len(mensaje)):
+            verificar_crc(mensaje, cabecera['crc'], cabecera['flags'])
+        
+        # En la versión 2 el árbol se arma desde los códigos, con las frecuencias del mensaje
+        if raiz is None:
+            with etapa('reconstruir_arbol', simbolos=len(codigos)):
+                raiz = arbol_desde_codigos(codigos, Counter(mensaje))
+        
+        return mensaje, raiz, bits_completos
+    
+    def analizar(self):
+        """
+        Analiza el archivo a partir de la cabecera y el mensaje ya decodificado.
         
-        # Verificar que hay datos después de los metadatos
-        if posicion_datos >= tamaño:
+        Returns:
+            dict: Información detallada (ver analizar_archivo())
+        """
+        try:
+            validacion = self.validar()
+            if not validacion['valido']:
+                return validacion
+            
+            cabecera = self.cabecera
+            mensaje = self.mensaje
+            
+            # Bits y bytes de datos de la cabecera: en la versión 3 los bits
+            # devueltos por decodificar() son solo los del primer bloque
+            estadisticas = estadisticas_cabecera(cabecera, self.tamaño)
+            
+            # La versión 2 no guarda frecuencias: se cuentan en el mensaje decodificado
+            frecuencias = cabecera['frecuencias']
+            if frecuencias is None:
+                frecuencias = dict(Counter(mensaje))
+            
+            return {
+                'valido': True,
+                'version': cabecera['version'],
+                'tamaño_archivo': self.tamaño,
+                'caracteres_unicos': cabecera['caracteres_unicos'],
+                'frecuencias': frecuencias,
+                'bits_descartados': cabecera['bits_descartados'],
+                'bits_codificados': estadisticas['bits_esperados'],
+                'mensaje_decodificado': mensaje,
+                'longitud_mensaje': len(mensaje),
+                'tamaño_metadatos': cabecera['posicion_datos'],
+                'tamaño_datos': estadisticas['bytes_datos']
+            }
+            
+        except Exception as e:
             return {
                 'valido': False,
-                'error': 'No hay datos codificados'
+                'error': str(e)
             }
+
+# --------------------------------------------------
+# Validación y Verificación
+# --------------------------------------------------
+def estadisticas_cabecera(cabecera, tamaño_archivo):
+    """
+    Calcula todo lo que se deduce de la cabecera y del tamaño del archivo.
+    
+    No lee ni decodifica los datos: la longitud del mensaje es la suma de las
+    frecuencias (o la cantidad de símbolos guardada) y los bits esperados son
+    la suma de frecuencia × longitud del código (o los bits guardados). Con
+    eso se comprueba que bits_esperados == 8 * bytes_datos - bits_descartados.
+    
+    Args:
+        cabecera (dict): Resultado de leer_cabecera()
+        tamaño_archivo (int): Tamaño total del archivo en bytes
         
+    Returns:
+        dict: 'caracteres_unicos', 'longitud_esperada', 'bits_esperados',
+        'bytes_datos', 'bits_disponibles', 'consistente' y 'error' (None si
+        la cabecera es consistente)
+    """
+    version = cabecera['version']
+    bytes_datos = tamaño_archivo - cabecera['posicion_datos']
+    error = None
+    
+    if version == VERSION_FRECUENCIAS:
+        frecuencias = cabecera['frecuencias']
+        if len(frecuencias) == 1:
+            # Un único carácter: código vacío, sin bits
+            bits_esperados = 0
+        else:
+            longitudes = longitudes_desde_arbol(construir_arbol(frecuencias))
+            bits_esperados = sum(freq * longitudes[caracter] for caracter, freq in frecuencias.items())
+    else:
+        bits_esperados = cabecera['bits_totales']
+    
+    if version == VERSION_BLOQUES:
+        bytes_datos = cabecera['posicion_indice'] - cabecera['posicion_datos']
+        bloques = cabecera['bloques']
+        if sum(bloque['tamaño'] for bloque in bloques) != bytes_datos:
+            error = "Archivo corrupto: el índice de bloques no coincide con los datos"
+        elif any(not _bits_compatibles(bloque['num_simbolos'], bloque['bits_totales'],
+                                       bloque['longitudes'] or cabecera['longitudes'])
+                 for bloque in bloques):
+            error = "Archivo corrupto: un bloque tiene más o menos bits que sus símbolos"
+    
+    # En la versión 3 cada bloque está alineado a byte y bits_descartados
+    # suma el relleno de todos, así que la misma cuenta vale para el total
+    bits_disponibles = 8 * bytes_datos - cabecera['bits_descartados']
+    if version != VERSION_BLOQUES and error is None:
+        if bits_esperados != bits_disponibles:
+            error = (f"Archivo corrupto: la cabecera indica {bits_esperados} bits "
+                     f"pero hay {bits_disponibles}")
+        elif version in (VERSION_CANONICA, VERSION_DICCIONARIO) and not _bits_compatibles(
+                cabecera['num_simbolos'], bits_esperados, cabecera['longitudes']):
+            error = "Archivo corrupto: la cantidad de bits no coincide con los símbolos"
+    
+    return {
+        'version': version,
+        'caracteres_unicos': cabecera['caracteres_unicos'],
+        'longitud_esperada': cabecera['num_simbolos'],
+        'bits_esperados': bits_esperados,
+        'bytes_datos': bytes_datos,
+        'bits_disponibles': bits_disponibles,
+        'consistente': error is None,
+        'error': error
+    }
+
+def _bits_compatibles(num_simbolos, bits_totales, longitudes):
+    """Comprueba que los bits estén entre el código más corto y el más largo por símbolo."""
+    if not longitudes:
+        return num_simbolos == 0 and bits_totales == 0
+    return (num_simbolos * min(longitudes.values()) <= bits_totales
+            <= num_simbolos * max(longitudes.values()))
+
+def verificar_cabecera(nombre_archivo):
+    """
+    Verifica un archivo .bin leyendo solo su cabecera.
+    
+    Es la comprobación rápida para muchos archivos: cuesta lo que cuesta
+    leer la cabecera (y el índice en la versión 3), sin importar el tamaño
+    de los datos codificados.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .bin
+        
+    Returns:
+        dict: 'valido' más las claves de estadisticas_cabecera(), o
+        'valido' y 'error' si la cabecera no se puede leer
+    """
+    try:
+        with open(leer_ruta_existente(nombre_archivo), 'rb') as archivo:
+            tamaño = os.fstat(archivo.fileno()).st_size
+            cabecera = leer_cabecera(archivo)
+    except Exception as e:
         return {
-            'valido': True,
-            'tamaño': tamaño,
-            'caracteres_unicos': len(frecuencias),
-            'bits_descartados': bits_descartados,
-            'tamaño_datos': tamaño - posicion_datos
+            'valido': False,
+            'error': str(e)
         }
+    
+    estadisticas = estadisticas_cabecera(cabecera, tamaño)
+    estadisticas['valido'] = estadisticas['consistente']
+    return estadisticas
+
+def validar_archivo(nombre_archivo):
+    """
+    Valida que un archivo .bin sea válido y no esté corrupto.
+    
+    Args:
+        nombre_archivo (str): Ruta del archivo .bin
         
+    Returns:
+        dict: Información de validación
+    """
+    # Verificar que el archivo existe
+    if not os.path.exists(nombre_archivo):
+        return {
+            'valido': False,
+            'error': 'Archivo no encontrado'
+        }
+    
+    try:
+        return ArchivoHuffman(nombre_archivo).validar()
     except Exception as e:
         return {
             'valido': False,
@@ -300,45 +1798,22 @@ def analizar_archivo(nombre_archivo):
     """
     Analiza un archivo .bin y proporciona información detallada.
     
+    El archivo se lee y se decodifica una sola vez (ver ArchivoHuffman).
+    
     Args:
         nombre_archivo (str): Ruta del archivo .bin
         
     Returns:
         dict: Información detallada del archivo
     """
-    try:
-        # Validar archivo
-        validacion = validar_archivo(nombre_archivo)
-        if not validacion['valido']:
-            return validacion
-        
-        # Leer metadatos
-        frecuencias, bits_descartados, posicion_datos = leer_metadatos_archivo(nombre_archivo)
-        
-        # Leer datos
-        bits = leer_datos_codificados(nombre_archivo, posicion_datos)
-        if bits_descartados > 0:
-            bits = bits[:-bits_descartados]
-        
-        # Reconstruir árbol
-        raiz = construir_arbol(frecuencias)
-        
-        # Decodificar
-        mensaje = decodificar_bits(bits, raiz)
-        
+    if not os.path.exists(nombre_archivo):
         return {
-            'valido': True,
-            'tamaño_archivo': os.path.getsize(nombre_archivo),
-            'caracteres_unicos': len(frecuencias),
-            'frecuencias': frecuencias,
-            'bits_descartados': bits_descartados,
-            'bits_codificados': len(bits),
-            'mensaje_decodificado': mensaje,
-            'longitud_mensaje': len(mensaje),
-            'tamaño_metadatos': posicion_datos,
-            'tamaño_datos': len(bits) // 8 + 1
+            'valido': False,
+            'error': 'Archivo no encontrado'
         }
-        
+    
+    try:
+        return ArchivoHuffman(nombre_archivo).analizar()
     except Exception as e:
         return {
             'valido': False,
@@ -372,9 +1847,109 @@ def mostrar_analisis_archivo(analisis):
     for caracter, freq in sorted(analisis['frecuencias'].items()):
         print(f"  '{caracter}': {freq}")
 
+def medir_rendimiento_decodificacion(mensaje, repeticiones=3):
+    """
+    Compara el decodificador por tablas con el recorrido bit a bit del árbol.
+    
+    Args:
+        mensaje (str): Mensaje de prueba
+        repeticiones (int): Veces que se repite cada medición (se toma la mejor)
+        
+    Returns:
+        dict: Throughput en MB/s de datos codificados para cada decodificador
+    """
+    raiz = construir_arbol(Counter(mensaje))
+    codigos = generar_codigos(raiz)
+    bits_texto = ''.join(codigos[caracter] for caracter in mensaje)
+    bits = SecuenciaBits.desde_texto(bits_texto)
+    megabytes = len(bits.datos) / (1024 * 1024)
+    
+    def mejor_tiempo(funcion, entrada):
+        mejor = float('inf')
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            resultado = funcion(entrada, raiz)
+            mejor = min(mejor, time.perf_counter() - inicio)
+        if resultado != mensaje:
+            raise ValueError("El decodificador produjo un mensaje distinto")
+        return mejor
+    
+    tiempo_arbol = mejor_tiempo(decodificar_bits_arbol, bits_texto)
+    tiempo_tablas = mejor_tiempo(decodificar_bits, bits)
+    
+    return {
+        'tamaño_codificado_bytes': len(bits.datos),
+        'mb_s_arbol': megabytes / tiempo_arbol,
+        'mb_s_tablas': megabytes / tiempo_tablas,
+        'aceleracion': tiempo_arbol / tiempo_tablas
+    }
+
+def mostrar_rendimiento(rendimiento):
+    """
+    Muestra la comparación de rendimiento de los decodificadores.
+    
+    Args:
+        rendimiento (dict): Resultado de medir_rendimiento_decodificacion()
+    """
+    print(f"\nRendimiento de decodificación ({rendimiento['tamaño_codificado_bytes']} bytes codificados):")
+    print(f"  Recorrido del árbol: {rendimiento['mb_s_arbol']:.2f} MB/s")
+    print(f"  Tablas multi-bit: {rendimiento['mb_s_tablas']:.2f} MB/s")
+    print(f"  Aceleración: {rendimiento['aceleracion']:.1f}x")
+
 # --------------------------------------------------
 # Función de Prueba
 # --------------------------------------------------
+# Archivos ya escritos de cada versión del formato (en pruebas/) y su
+# contenido: los cambios del decodificador no deben dejar de leerlos
+DIRECTORIO_PRUEBAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pruebas')
+ARCHIVOS_PRUEBA = (
+    ('hola.bin', 'hola mi gente latino'),
+    ('hol.bin', 'kevin naiz'),
+    ('dddd.bin', 'jeey'),
+    ('eeeeee.bin', 'aaaaaaqqqqqqqqqwwwwwweeeeeeeeerrrrttttyyyyuio'),
+    ('canonica_v2.bin', 'hola mundo, ¿qué tal? ñandú'),
+    ('binario_v2.bin', bytes(range(0, 256, 3)) * 2 + b'\x00\xff'),
+    ('bloques_v3.bin', 'el árbol de huffman ' * 5),
+    ('lote_v3.bin', ['uno', 'dos dos', 'tres tres tres']),
+    ('diccionario_v4.bin', 'hola mundo amigo'),
+)
+DICCIONARIOS_PRUEBA = ('diccionario.hud',)
+
+def prueba_archivos_guardados(directorio=DIRECTORIO_PRUEBAS):
+    """
+    Decodifica los archivos de prueba de cada versión y los compara con su contenido.
+    
+    Args:
+        directorio (str): Carpeta con los archivos de ARCHIVOS_PRUEBA
+        
+    Returns:
+        bool: True si todos tienen una cabecera válida y se decodifican bien
+    """
+    for nombre in DICCIONARIOS_PRUEBA:
+        cargar_diccionario(os.path.join(directorio, nombre))
+    
+    todos = True
+    for nombre, esperado in ARCHIVOS_PRUEBA:
+        ruta = os.path.join(directorio, nombre)
+        try:
+            validacion = verificar_cabecera(ruta)
+            if not validacion['valido']:
+                raise ValueError(validacion['error'])
+            if isinstance(esperado, list):
+                obtenido = decodificar_lote(ruta)
+            elif isinstance(esperado, bytes):
+                obtenido = decodificar_binario(ruta)
+            else:
+                obtenido = decodificar_archivo(ruta)[0]
+            coincide = obtenido == esperado
+            detalle = f"versión {validacion['version']}"
+        except Exception as e:
+            coincide = False
+            detalle = str(e)
+        print(f"{nombre}: {'✅' if coincide else '❌'} ({detalle})")
+        todos = todos and coincide
+    return todos
+
 def prueba_decodificacion():
     """Función de prueba para verificar el funcionamiento del módulo."""
     from codificador import codificar_mensaje
@@ -401,6 +1976,20 @@ def prueba_decodificacion():
         analisis = analizar_archivo(archivo_temp)
         mostrar_analisis_archivo(analisis)
         
+        # Archivos guardados con cada versión del formato
+        print("\n=== ARCHIVOS DE PRUEBA ===")
+        coincide = prueba_archivos_guardados() and coincide
+        
+        # La tabla de 16 bits solo se elige si entra en el presupuesto de memoria
+        limite = (elegir_bits_por_paso(16, 1 << 40) == 16
+                  and elegir_bits_por_paso(17, 1 << 40) == 8
+                  and elegir_bits_por_paso(255, 1 << 40) == 8)
+        print(f"Límite de la tabla de 16 bits: {'✅' if limite else '❌'}")
+        coincide = limite and coincide
+        
+        # Comparar decodificadores
+        mostrar_rendimiento(medir_rendimiento_decodificacion(mensaje * 20000))
+        
         # Limpiar
         if os.path.exists(archivo_temp):
             os.remove(archivo_temp)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Formato de Archivos .bin
+
+Este módulo contiene las constantes y utilidades de bajo nivel que comparten
+el codificador y el decodificador para leer y escribir las cabeceras.
+
+Versiones del formato:
+    1: cantidad de caracteres (>I), pares carácter/frecuencia (>cH) y bits
+       descartados (>B). No tiene número mágico.
+    2: b'HUF', versión, flags, cantidad de símbolos, bits codificados, el
+       CRC32 del contenido original (>I, si está FLAG_CRC) y la tabla de
+       longitudes de los códigos canónicos. Los contadores son enteros de
+       longitud variable, sin límite de tamaño.
+    3: contenedor por bloques. b'HUF', versión, flags y (si es compartida)
+       la tabla de longitudes; luego los bloques alineados a byte, el índice
+       de bloques (símbolos, bits, CRC32 y tabla propia de cada bloque) y al
+       final la posición del índice (>Q).
+    4: registro con diccionario. b'HUF', versión, flags, identificador del
+       diccionario, cantidad de símbolos, bits codificados y CRC32 opcional;
+       la tabla de longitudes está en el diccionario, no en el archivo.
+
+Los diccionarios (tablas de longitudes entrenadas con un corpus) se guardan
+aparte: b'HUD', flags, identificador y la tabla de longitudes.
+"""
+
+import zlib
+
+# --------------------------------------------------
+# Constantes
+# --------------------------------------------------
+MAGIA = b'HUF'
+MAGIA_DICCIONARIO = b'HUD'
+
+VERSION_FRECUENCIAS = 1
+VERSION_CANONICA = 2
+VERSION_BLOQUES = 3
+VERSION_DICCIONARIO = 4
+VERSION_ACTUAL = VERSION_CANONICA
+
+# Flags de las versiones 2, 3 y 4 (y de los diccionarios)
+FLAG_BINARIO = 0x01             # Los símbolos son bytes (0-255) en lugar de caracteres
+FLAG_TABLA_COMPARTIDA = 0x02    # Versión 3: una sola tabla de longitudes para todos los bloques
+FLAG_CRC = 0x04                 # Se guarda el CRC32 del contenido (por bloque en la versión 3)
+FLAG_REGISTROS = 0x08           # Versión 3: cada bloque es un mensaje independiente (lotes)
+
+# Tamaño del puntero al índice de bloques al final de los archivos de versión 3
+TAMAÑO_PIE = 8
+
+# --------------------------------------------------
+# Enteros de Longitud Variable (LEB128)
+# --------------------------------------------------
+def codificar_varint(valor):
+    """
+    Codifica un entero no negativo en 7 bits por byte.
+
+    Args:
+        valor (int): Entero a codificar
+
+    Returns:
+        bytes: Representación de longitud variable
+    """
+    if valor < 0:
+        raise ValueError("Solo se pueden codificar enteros no negativos")
+    resultado = bytearray()
+    while True:
+        byte = valor & 0x7F
+        valor >>= 7
+        if valor:
+            resultado.append(byte | 0x80)
+        else:
+            resultado.append(byte)
+            return bytes(resultado)
+
+def leer_varint(archivo):
+    """
+    Lee un entero de longitud variable desde un archivo binario.
+
+    Args:
+        archivo: Archivo binario abierto para lectura
+
+    Returns:
+        tuple: (valor, bytes_leidos)
+
+    Raises:
+        ValueError: Si el archivo termina en medio del entero
+    """
+    valor = 0
+    desplazamiento = 0
+    leidos = 0
+    while True:
+        dato = archivo.read(1)
+        if not dato:
+            raise ValueError("Archivo corrupto: entero incompleto en la cabecera")
+        leidos += 1
+        valor |= (dato[0] & 0x7F) << desplazamiento
+        if not dato[0] & 0x80:
+            return valor, leidos
+        desplazamiento += 7
+
+def longitud_utf8(byte_inicial):
+    """
+    Cantidad de bytes de un carácter UTF-8 según su primer byte.
+
+    Args:
+        byte_inicial (int): Primer byte del carácter
+
+    Returns:
+        int: Longitud del carácter en bytes (1 a 4)
+
+    Raises:
+        ValueError: Si el byte no puede iniciar un carácter UTF-8
+    """
+    if byte_inicial < 0x80:
+        return 1
+    if 0xC0 <= byte_inicial < 0xE0:
+        return 2
+    if 0xE0 <= byte_inicial < 0xF0:
+        return 3
+    if 0xF0 <= byte_inicial < 0xF8:
+        return 4
+    raise ValueError("Archivo corrupto: carácter UTF-8 inválido en la cabecera")
+
+# --------------------------------------------------
+# Sumas de Verificación
+# --------------------------------------------------
+def crc_contenido(contenido, crc=0, codificacion='utf-8'):
+    """
+    Calcula (o continúa) el CRC32 del contenido original.
+    
+    Se puede llamar trozo a trozo pasando el resultado anterior en ``crc``.
+    
+    Args:
+        contenido (str | bytes): Trozo de texto o de datos binarios
+        crc (int): CRC de los trozos anteriores (0 al empezar)
+        codificacion (str): Codificación con la que se mide el texto
+            ('latin-1' para los caracteres que representan bytes)
+        
+    Returns:
+        int: CRC32 acumulado
+    """
+    if isinstance(contenido, str):
+        contenido = contenido.encode(codificacion)
+    return zlib.crc32(contenido, crc)
@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interfaz de Línea de Comandos
+
+Comprime, descomprime, describe y verifica archivos .bin sin la interfaz
+gráfica. Solo importa los módulos del códec (nunca tkinter), así que sirve
+en servidores sin pantalla y en scripts que procesan muchos archivos.
+
+Uso:
+    python -m huffman compress *.txt --jobs 4
+    python -m huffman decompress "datos/**/*.bin" -o salida/
+    cat notas.txt | python -m huffman compress - > notas.bin
+    python -m huffman decompress notas.bin -o - | less
+    python -m huffman info *.bin
+    python -m huffman verify *.bin
+
+Los archivos de texto UTF-8 se codifican como texto y el resto como datos
+binarios; al descomprimir se recuperan los bytes originales. Por defecto se
+escribe el contenedor de versión 3, con un CRC32 por bloque. Las entradas se
+procesan en streaming, así que la memoria no crece con el tamaño de los
+archivos (la entrada estándar se copia antes a un archivo temporal).
+"""
+
+import argparse
+import glob
+import mmap
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from itertools import repeat
+
+from decodificador import (
+    leer_cabecera, leer_cabecera_archivo, estadisticas_cabecera, verificar_cabecera,
+    decodificar_en_bloques, cargar_diccionario
+)
+from formato import (
+    VERSION_FRECUENCIAS, VERSION_CANONICA, VERSION_BLOQUES,
+    FLAG_BINARIO, FLAG_TABLA_COMPARTIDA, FLAG_CRC, FLAG_REGISTROS, crc_contenido
+)
+
+# Entrada o salida estándar
+ESTANDAR = '-'
+EXTENSION = '.bin'
+
+NOMBRES_FLAGS = (
+    (FLAG_BINARIO, 'binario'),
+    (FLAG_TABLA_COMPARTIDA, 'tabla_compartida'),
+    (FLAG_CRC, 'crc'),
+    (FLAG_REGISTROS, 'registros'),
+)
+
+# --------------------------------------------------
+# Entradas y Salidas
+# --------------------------------------------------
+def expandir_entradas(patrones):
+    """
+    Expande los patrones glob ('*.txt', 'datos/**/*.bin') de la línea de comandos.
+
+    Los patrones sin comodines (y '-') se dejan como están, de modo que un
+    archivo inexistente se informa como error al procesarlo.
+
+    Args:
+        patrones (list): Rutas o patrones
+
+    Returns:
+        list: Rutas sin repetir, en el orden dado
+
+    Raises:
+        ValueError: Si un patrón no coincide con ningún archivo
+    """
+    entradas = []
+    for patron in patrones:
+        if patron != ESTANDAR and glob.has_magic(patron):
+            coincidencias = sorted(ruta for ruta in glob.glob(patron, recursive=True)
+                                   if os.path.isfile(ruta))
+            if not coincidencias:
+                raise ValueError(f"Ningún archivo coincide con '{patron}'")
+            entradas.extend(coincidencias)
+        else:
+            entradas.append(patron)
+    return list(dict.fromkeys(entradas))
+
+def nombre_salida(entrada, comando, salida=None, varias=False):
+    """
+    Decide dónde se escribe el resultado de una entrada.
+
+    Args:
+        entrada (str): Ruta de entrada o '-'
+        comando (str): 'compress' o 'decompress'
+        salida (str): Opción -o: archivo, directorio o '-' (None = junto a la entrada)
+        varias (bool): Si hay más de una entrada (entonces -o es un directorio)
+
+    Returns:
+        str: Ruta de salida o '-'
+    """
+    if salida == ESTANDAR or (salida is None and entrada == ESTANDAR):
+        return ESTANDAR
+
+    if comando == 'compress':
+        derivado = entrada + EXTENSION
+    elif entrada.endswith(EXTENSION):
+        derivado = entrada[:-len(EXTENSION)]
+    else:
+        derivado = entrada + '.out'
+
+    if salida is None:
+        return derivado
+    if varias or os.path.isdir(salida):
+        return os.path.join(salida, os.path.basename(derivado))
+    return salida
+
+@contextmanager
+def _ruta_entrada(entrada):
+    """
+    Da una ruta para la entrada: la entrada estándar se copia antes a un
+    temporal, porque los codificadores recorren la entrada dos veces.
+    """
+    if entrada != ESTANDAR:
+        yield entrada
+        return
+    import tempfile
+    descriptor, ruta = tempfile.mkstemp()
+    try:
+        with open(descriptor, 'wb') as archivo:
+            shutil.copyfileobj(sys.stdin.buffer, archivo)
+        yield ruta
+    finally:
+        os.remove(ruta)
+
+def _comprobar_destino(salida, forzar):
+    """Evita sobrescribir un archivo existente sin --force."""
+    if salida != ESTANDAR and not forzar and os.path.exists(salida):
+        raise FileExistsError(f"'{salida}' ya existe (use --force para sobrescribirlo)")
+
+@contextmanager
+def _abrir_salida(salida):
+    """
+    Abre un archivo de salida binario (o la salida estándar).
+
+    Si algo falla a mitad de la escritura, el archivo se borra para no dejar
+    un resultado a medio escribir.
+    """
+    if salida == ESTANDAR:
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+        return
+    try:
+        with open(salida, 'wb') as archivo:
+            yield archivo
+    except BaseException:
+        if os.path.exists(salida):
+            os.remove(salida)
+        raise
+
+def _codificar_ruta(origen, destino, opciones):
+    """
+    Codifica un archivo en streaming: como texto si es UTF-8 válido (y no se
+    pidió --binary) y si no como bytes, leídos de un mapeo en memoria.
+
+    Returns:
+        str: 'texto' o 'binario'
+    """
+    # El codificador solo se carga al comprimir: descomprimir, info y verify no lo usan
+    from codificador import (
+        codificar_archivo, codificar_binario, codificar_paralelo, escribir_cabecera_canonica
+    )
+
+    version = opciones['version']
+    longitud_maxima = opciones['longitud_maxima']
+    binario = opciones['binario']
+    if os.path.getsize(origen) == 0:
+        # Un archivo vacío: cabecera de versión 2 sin símbolos (mmap no admite archivos vacíos)
+        with open(destino, 'wb') as archivo:
+            escribir_cabecera_canonica(archivo, {}, 0, 0, FLAG_BINARIO if binario else 0,
+                                       crc_contenido(b""))
+        return 'binario' if binario else 'texto'
+
+    if not binario:
+        try:
+            # La primera pasada (conteo) lee todo el archivo antes de escribir nada
+            codificar_archivo(origen, destino, version=version, longitud_maxima=longitud_maxima)
+            return 'texto'
+        except UnicodeDecodeError:
+            pass
+
+    if version == VERSION_FRECUENCIAS:
+        raise ValueError("La versión 1 no admite datos binarios")
+    with open(origen, 'rb') as archivo:
+        datos = memoryview(mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ))
+    if version == VERSION_CANONICA:
+        codificar_binario(datos, destino, longitud_maxima)
+    else:
+        codificar_paralelo(datos, destino, procesos=1, longitud_maxima=longitud_maxima)
+    return 'binario'
+
+def _decodificar_a(archivo, salida):
+    """
+    Decodifica un archivo .bin abierto bloque a bloque.
+
+    Args:
+        archivo: Archivo .bin binario abierto
+        salida: Archivo binario donde escribir (None = solo contar)
+
+    Returns:
+        int: Bytes decodificados
+    """
+    binario = leer_cabecera(archivo)['flags'] & FLAG_BINARIO
+    archivo.seek(0)
+    codificacion = 'latin-1' if binario else 'utf-8'
+    total = 0
+    for texto in decodificar_en_bloques(archivo):
+        datos = texto.encode(codificacion)
+        if salida is not None:
+            salida.write(datos)
+        total += len(datos)
+    return total
+
+def _cargar_diccionarios(rutas):
+    """Registra los diccionarios de los archivos de versión 4 (también en cada proceso)."""
+    for ruta in rutas:
+        cargar_diccionario(ruta)
+
+# --------------------------------------------------
+# Comandos (uno por archivo; se ejecutan también en los procesos del pool)
+# --------------------------------------------------
+def comprimir(entrada, salida, opciones):
+    """
+    Comprime un archivo o la entrada estándar.
+
+    Args:
+        entrada (str): Ruta de entrada o '-'
+        salida (str): Ruta de salida o '-'
+        opciones (dict): 'version', 'binario', 'longitud_maxima' y 'forzar'
+
+    Returns:
+        dict: 'entrada', 'salida', 'bytes_originales', 'bytes_comprimidos',
+        'segundos', 'modo' y 'error' (None si no hubo error)
+    """
+    resultado = {'entrada': entrada, 'salida': salida, 'error': None}
+    inicio = time.perf_counter()
+    try:
+        _comprobar_destino(salida, opciones['forzar'])
+        with _ruta_entrada(entrada) as origen:
+            # Los codificadores escriben en un archivo: para stdout se usa uno temporal
+            if salida == ESTANDAR:
+                import tempfile
+                descriptor, destino = tempfile.mkstemp(suffix=EXTENSION)
+                os.close(descriptor)
+            else:
+                destino = salida
+            try:
+                modo = _codificar_ruta(origen, destino, opciones)
+                bytes_comprimidos = os.path.getsize(destino)
+                if salida == ESTANDAR:
+                    with open(destino, 'rb') as archivo:
+                        shutil.copyfileobj(archivo, sys.stdout.buffer)
+                    sys.stdout.buffer.flush()
+            except Exception:
+                # No dejar un archivo a medio escribir
+                if salida != ESTANDAR and os.path.exists(destino):
+                    os.remove(destino)
+                raise
+            finally:
+                if salida == ESTANDAR:
+                    os.remove(destino)
+            bytes_originales = os.path.getsize(origen)
+
+        resultado.update(bytes_originales=bytes_originales, bytes_comprimidos=bytes_comprimidos,
+                         modo=modo)
+    except Exception as e:
+        resultado['error'] = str(e)
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+def descomprimir(entrada, salida, opciones):
+    """
+    Descomprime un archivo .bin o la entrada estándar.
+
+    Args:
+        entrada (str): Ruta del archivo .bin o '-'
+        salida (str): Ruta de salida o '-'
+        opciones (dict): 'forzar'
+
+    Returns:
+        dict: 'entrada', 'salida', 'bytes_originales', 'bytes_comprimidos',
+        'segundos' y 'error' (None si no hubo error)
+    """
+    resultado = {'entrada': entrada, 'salida': salida, 'error': None}
+    inicio = time.perf_counter()
+    try:
+        _comprobar_destino(salida, opciones['forzar'])
+        with _ruta_entrada(entrada) as origen, open(origen, 'rb') as archivo:
+            bytes_comprimidos = os.path.getsize(origen)
+            with _abrir_salida(salida) as destino:
+                bytes_originales = _decodificar_a(archivo, destino)
+        resultado.update(bytes_originales=bytes_originales, bytes_comprimidos=bytes_comprimidos)
+    except Exception as e:
+        resultado['error'] = str(e)
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+def describir(entrada, salida=None, opciones=None):
+    """
+    Describe un archivo .bin leyendo solo su cabecera.
+
+    Args:
+        entrada (str): Ruta del archivo .bin
+
+    Returns:
+        dict: 'entrada', 'version', 'flags', 'simbolos', 'caracteres_unicos',
+        'bloques', 'bytes_comprimidos', 'bits', 'consistente' y 'error'
+    """
+    resultado = {'entrada': entrada, 'error': None}
+    inicio = time.perf_counter()
+    try:
+        cabecera = leer_cabecera_archivo(entrada)
+        tamaño = os.path.getsize(entrada)
+        estadisticas = estadisticas_cabecera(cabecera, tamaño)
+        resultado.update(
+            version=cabecera['version'],
+            flags=[nombre for flag, nombre in NOMBRES_FLAGS if cabecera['flags'] & flag],
+            simbolos=estadisticas['longitud_esperada'],
+            caracteres_unicos=estadisticas['caracteres_unicos'],
+            bloques=len(cabecera['bloques']) if cabecera['version'] == VERSION_BLOQUES else None,
+            bytes_comprimidos=tamaño,
+            bits=estadisticas['bits_esperados'],
+            consistente=estadisticas['consistente'],
+            error=estadisticas['error']
+        )
+    except Exception as e:
+        resultado['error'] = str(e)
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+def verificar(entrada, salida=None, opciones=None):
+    """
+    Verifica un archivo .bin: cabecera consistente y decodificación completa
+    (con el CRC32 del contenido, si el archivo lo guarda).
+
+    Args:
+        entrada (str): Ruta del archivo .bin
+
+    Returns:
+        dict: 'entrada', 'bytes_originales', 'bytes_comprimidos', 'segundos'
+        y 'error' (None si el archivo es válido)
+    """
+    resultado = {'entrada': entrada, 'error': None}
+    inicio = time.perf_counter()
+    try:
+        validacion = verificar_cabecera(entrada)
+        if not validacion['valido']:
+            raise ValueError(validacion['error'])
+        with open(entrada, 'rb') as archivo:
+            bytes_originales = _decodificar_a(archivo, None)
+        resultado.update(bytes_originales=bytes_originales,
+                         bytes_comprimidos=os.path.getsize(entrada))
+    except Exception as e:
+        resultado['error'] = str(e)
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+COMANDOS = {
+    'compress': comprimir,
+    'decompress': descomprimir,
+    'info': describir,
+    'verify': verificar,
+}
+
+def ejecutar(comando, entradas, salidas, opciones, trabajos=1, diccionarios=()):
+    """
+    Aplica un comando a cada entrada, en paralelo si se pide.
+
+    Args:
+        comando (str): Clave de COMANDOS
+        entradas (list): Rutas de entrada
+        salidas (list): Rutas de salida (una por entrada)
+        opciones (dict): Opciones del comando
+        trabajos (int): Procesos en paralelo (1 = en este proceso)
+        diccionarios (iterable): Rutas de diccionarios a cargar
+
+    Yields:
+        dict: Resultado de cada entrada, en el mismo orden
+    """
+    funcion = COMANDOS[comando]
+    if trabajos > 1 and len(entradas) > 1 and ESTANDAR not in entradas:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=trabajos, initializer=_cargar_diccionarios,
+                                 initargs=(tuple(diccionarios),)) as ejecutor:
+            yield from ejecutor.map(funcion, entradas, salidas, repeat(opciones))
+    else:
+        _cargar_diccionarios(diccionarios)
+        yield from map(funcion, entradas, salidas, repeat(opciones))
+
+# --------------------------------------------------
+# Reportes
+# --------------------------------------------------
+def _megabytes(cantidad):
+    return cantidad / (1024 * 1024)
+
+def _mb_s(cantidad, segundos):
+    return _megabytes(cantidad) / segundos if segundos > 0 else 0.0
+
+def mostrar_resultado(comando, resultado, salida):
+    """
+    Muestra una línea por archivo procesado.
+
+    Args:
+        comando (str): Comando ejecutado
+        resultado (dict): Resultado de comprimir(), descomprimir(), describir() o verificar()
+        salida: Flujo donde escribir el reporte
+    """
+    entrada = resultado['entrada']
+    if resultado['error'] is not None and comando != 'info':
+        print(f"ERROR {entrada}: {resultado['error']}", file=salida)
+        return
+
+    if comando == 'info':
+        if 'version' not in resultado:
+            print(f"ERROR {entrada}: {resultado['error']}", file=salida)
+            return
+        print(f"{entrada}:", file=salida)
+        print(f"  Versión: {resultado['version']}"
+              f"{' (' + ', '.join(resultado['flags']) + ')' if resultado['flags'] else ''}", file=salida)
+        print(f"  Símbolos: {resultado['simbolos']} ({resultado['caracteres_unicos']} distintos)",
+              file=salida)
+        if resultado['bloques'] is not None:
+            print(f"  Bloques: {resultado['bloques']}", file=salida)
+        print(f"  Tamaño: {resultado['bytes_comprimidos']} bytes, {resultado['bits']} bits codificados",
+              file=salida)
+        estado = 'consistente' if resultado['consistente'] else f"inconsistente: {resultado['error']}"
+        print(f"  Cabecera: {estado}", file=salida)
+        return
+
+    originales = resultado['bytes_originales']
+    comprimidos = resultado['bytes_comprimidos']
+    velocidad = _mb_s(originales, resultado['segundos'])
+    if comando == 'verify':
+        print(f"OK {entrada} ({originales} bytes, {velocidad:.2f} MB/s)", file=salida)
+        return
+
+    porcentaje = comprimidos / originales * 100 if originales else 0.0
+    destino = '<stdout>' if resultado['salida'] == ESTANDAR else resultado['salida']
+    origen = '<stdin>' if entrada == ESTANDAR else entrada
+    # Los tamaños van en el mismo sentido que los archivos: entrada -> salida
+    if comando == 'decompress':
+        tamaños = f"{comprimidos} -> {originales}"
+    else:
+        tamaños = f"{originales} -> {comprimidos}"
+    print(f"{origen} -> {destino}: {tamaños} bytes ({porcentaje:.1f}%) "
+          f"en {resultado['segundos']:.3f} s, {velocidad:.2f} MB/s", file=salida)
+
+def mostrar_total(resultados, segundos, salida):
+    """
+    Muestra el total de archivos, errores y el throughput de toda la ejecución.
+
+    Args:
+        resultados (list): Resultados de cada archivo
+        segundos (float): Tiempo total de reloj
+        salida: Flujo donde escribir el reporte
+    """
+    correctos = [resultado for resultado in resultados if resultado['error'] is None]
+    originales = sum(resultado.get('bytes_originales', 0) for resultado in correctos)
+    errores = len(resultados) - len(correctos)
+    print(f"Total: {len(resultados)} archivos, {errores} errores, "
+          f"{_megabytes(originales):.2f} MB en {segundos:.3f} s ({_mb_s(originales, segundos):.2f} MB/s)",
+          file=salida)
+
+# --------------------------------------------------
+# Punto de Entrada
+# --------------------------------------------------
+def crear_parser():
+    """
+    Returns:
+        argparse.ArgumentParser: Parser con los subcomandos compress, decompress, info y verify
+    """
+    comun = argparse.ArgumentParser(add_help=False)
+    comun.add_argument('archivos', nargs='+',
+                       help="Archivos o patrones glob ('-' = entrada estándar)")
+    comun.add_argument('-j', '--jobs', type=int, default=1,
+                       help="Archivos procesados en paralelo (por defecto 1)")
+    comun.add_argument('-d', '--diccionario', action='append', default=[],
+                       help="Diccionario para archivos de versión 4 (se puede repetir)")
+    comun.add_argument('-q', '--quiet', action='store_true',
+                       help="No mostrar una línea por archivo")
+
+    escritura = argparse.ArgumentParser(add_help=False)
+    escritura.add_argument('-o', '--output',
+                           help="Archivo de salida, directorio (con varias entradas) o '-' (stdout)")
+    escritura.add_argument('-f', '--force', action='store_true',
+                           help="Sobrescribir archivos existentes")
+
+    parser = argparse.ArgumentParser(prog='python -m huffman',
+                                     description="Compresión Huffman por línea de comandos")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    comprimir_parser = subcomandos.add_parser('compress', aliases=['comprimir'],
+                                              parents=[comun, escritura], help="Comprimir archivos")
+    comprimir_parser.add_argument('--format-version', type=int, default=VERSION_BLOQUES,
+                                  choices=(VERSION_FRECUENCIAS, VERSION_CANONICA, VERSION_BLOQUES),
+                                  help="Versión del formato (por defecto %(default)s: bloques con "
+                                       "CRC por bloque; 1 solo admite texto)")
+    comprimir_parser.add_argument('--binary', action='store_true',
+                                  help="Codificar como bytes aunque el archivo sea texto UTF-8")
+    comprimir_parser.add_argument('--max-length', type=int, default=None,
+                                  help="Longitud máxima de los códigos en bits")
+
+    subcomandos.add_parser('decompress', aliases=['descomprimir'], parents=[comun, escritura],
+                           help="Descomprimir archivos .bin")
+    subcomandos.add_parser('info', parents=[comun], help="Describir archivos .bin (solo cabecera)")
+    subcomandos.add_parser('verify', aliases=['verificar'], parents=[comun],
+                           help="Decodificar y verificar archivos .bin")
+    return parser
+
+ALIAS = {'comprimir': 'compress', 'descomprimir': 'decompress', 'verificar': 'verify'}
+
+def main(argumentos=None):
+    """
+    Punto de entrada de la línea de comandos.
+
+    Args:
+        argumentos (list): Argumentos (por defecto, los de sys.argv)
+
+    Returns:
+        int: 0 si todos los archivos se procesaron bien, 1 si hubo errores, 2 si
+        los argumentos son inválidos
+    """
+    parser = crear_parser()
+    opciones = parser.parse_args(argumentos)
+    comando = ALIAS.get(opciones.comando, opciones.comando)
+
+    try:
+        entradas = expandir_entradas(opciones.archivos)
+    except ValueError as e:
+        parser.error(str(e))
+    if entradas.count(ESTANDAR) > 1:
+        parser.error("La entrada estándar solo se puede usar una vez")
+    if opciones.jobs < 1:
+        parser.error("--jobs debe ser al menos 1")
+
+    salida_opcion = getattr(opciones, 'output', None)
+    varias = len(entradas) > 1
+    if varias and salida_opcion == ESTANDAR and comando in ('compress', 'decompress'):
+        parser.error("Con varias entradas, -o debe ser un directorio")
+    if varias and salida_opcion not in (None, ESTANDAR):
+        os.makedirs(salida_opcion, exist_ok=True)
+
+    if comando in ('compress', 'decompress'):
+        salidas = [nombre_salida(entrada, comando, salida_opcion, varias) for entrada in entradas]
+    else:
+        salidas = [None] * len(entradas)
+
+    parametros = {
+        'version': getattr(opciones, 'format_version', VERSION_BLOQUES),
+        'binario': getattr(opciones, 'binary', False),
+        'longitud_maxima': getattr(opciones, 'max_length', None),
+        'forzar': getattr(opciones, 'force', False),
+    }
+
+    # Si los datos van a stdout, el reporte va a stderr
+    reporte = sys.stderr if ESTANDAR in salidas else sys.stdout
+
+    inicio = time.perf_counter()
+    resultados = []
+    for resultado in ejecutar(comando, entradas, salidas, parametros, opciones.jobs,
+                              opciones.diccionario):
+        resultados.append(resultado)
+        if not opciones.quiet or resultado['error'] is not None:
+            mostrar_resultado(comando, resultado, reporte)
+    segundos = time.perf_counter() - inicio
+
+    if comando != 'info' and varias:
+        mostrar_total(resultados, segundos, reporte)
+    return 1 if any(resultado['error'] is not None for resultado in resultados) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
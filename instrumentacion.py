@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Instrumentación por Etapas
+
+Este módulo mide, a pedido, el tiempo, los bytes y los símbolos de cada etapa
+de codificar_mensaje() y decodificar_archivo() (lectura del archivo,
+cabecera, tablas, recorrido de bits, escritura...). Está desactivado por
+defecto: mientras no haya una medición ni observadores activos, cada etapa
+cuesta una comprobación de lista vacía y no se toma ningún tiempo.
+
+Uso:
+    with medir_etapas() as registro:
+        decodificar_archivo('mensaje.bin')
+    print(registro.como_dict())
+    print(registro.como_prometheus())
+
+También se pueden registrar funciones con agregar_observador(), que reciben
+(etapa, segundos, num_bytes, simbolos) al terminar cada etapa.
+"""
+
+import time
+from contextlib import contextmanager
+
+# Destinos activos: funciones (etapa, segundos, num_bytes, simbolos). Vacía = desactivado
+_destinos = []
+
+# --------------------------------------------------
+# Etapas
+# --------------------------------------------------
+class _EtapaInactiva:
+    """Etapa que no mide nada; se comparte mientras la instrumentación está apagada."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        return False
+
+    def contar(self, num_bytes=None, simbolos=None):
+        pass
+
+_ETAPA_INACTIVA = _EtapaInactiva()
+
+class _Etapa:
+    """Etapa en curso: toma el tiempo al entrar y lo informa al salir."""
+
+    __slots__ = ('nombre', 'num_bytes', 'simbolos', '_inicio')
+
+    def __init__(self, nombre, num_bytes, simbolos):
+        self.nombre = nombre
+        self.num_bytes = num_bytes
+        self.simbolos = simbolos
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        segundos = time.perf_counter() - self._inicio
+        for destino in tuple(_destinos):
+            destino(self.nombre, segundos, self.num_bytes, self.simbolos)
+        return False
+
+    def contar(self, num_bytes=None, simbolos=None):
+        """
+        Registra los bytes o símbolos procesados cuando se conocen al final.
+
+        Args:
+            num_bytes (int): Bytes procesados por la etapa
+            simbolos (int): Símbolos procesados por la etapa
+        """
+        if num_bytes is not None:
+            self.num_bytes = num_bytes
+        if simbolos is not None:
+            self.simbolos = simbolos
+
+def etapa(nombre, num_bytes=0, simbolos=0):
+    """
+    Delimita una etapa medible con un bloque ``with``.
+
+    Args:
+        nombre (str): Nombre de la etapa
+        num_bytes (int): Bytes procesados, si ya se conocen
+        simbolos (int): Símbolos procesados, si ya se conocen
+
+    Returns:
+        Context manager cuyo método contar() actualiza los contadores. Con la
+        instrumentación apagada es un objeto compartido que no hace nada.
+    """
+    if not _destinos:
+        return _ETAPA_INACTIVA
+    return _Etapa(nombre, num_bytes, simbolos)
+
+def activa():
+    """
+    Returns:
+        bool: True si hay alguna medición u observador activo
+    """
+    return bool(_destinos)
+
+# --------------------------------------------------
+# Observadores
+# --------------------------------------------------
+def agregar_observador(funcion):
+    """
+    Registra una función que se llama al terminar cada etapa.
+
+    Args:
+        funcion (callable): Recibe (etapa, segundos, num_bytes, simbolos)
+    """
+    _destinos.append(funcion)
+
+def quitar_observador(funcion):
+    """
+    Quita una función registrada con agregar_observador().
+
+    Args:
+        funcion (callable): Función a quitar
+
+    Raises:
+        ValueError: Si la función no estaba registrada
+    """
+    _destinos.remove(funcion)
+
+# --------------------------------------------------
+# Registro de Estadísticas
+# --------------------------------------------------
+class RegistroEtapas:
+    """
+    Acumula llamadas, tiempo, bytes y símbolos por etapa.
+    """
+
+    def __init__(self):
+        self.etapas = {}
+
+    def registrar(self, nombre, segundos, num_bytes=0, simbolos=0):
+        """
+        Suma una ejecución de una etapa.
+
+        Args:
+            nombre (str): Nombre de la etapa
+            segundos (float): Tiempo de reloj de la ejecución
+            num_bytes (int): Bytes procesados
+            simbolos (int): Símbolos procesados
+        """
+        estadisticas = self.etapas.get(nombre)
+        if estadisticas is None:
+            estadisticas = self.etapas[nombre] = {
+                'llamadas': 0, 'segundos': 0.0, 'bytes': 0, 'simbolos': 0
+            }
+        estadisticas['llamadas'] += 1
+        estadisticas['segundos'] += segundos
+        estadisticas['bytes'] += num_bytes
+        estadisticas['simbolos'] += simbolos
+
+    def __call__(self, nombre, segundos, num_bytes, simbolos):
+        self.registrar(nombre, segundos, num_bytes, simbolos)
+
+    def limpiar(self):
+        """Descarta lo acumulado."""
+        self.etapas.clear()
+
+    def como_dict(self):
+        """
+        Returns:
+            dict: {etapa: {'llamadas', 'segundos', 'bytes', 'simbolos', 'mb_s'}}
+            en el orden en que se ejecutaron las etapas por primera vez;
+            'mb_s' es None si la etapa no informa bytes
+        """
+        resultado = {}
+        for nombre, estadisticas in self.etapas.items():
+            segundos = estadisticas['segundos']
+            resultado[nombre] = dict(
+                estadisticas,
+                mb_s=estadisticas['bytes'] / (1024 * 1024) / segundos
+                if segundos > 0 and estadisticas['bytes'] else None
+            )
+        return resultado
+
+    def como_prometheus(self, prefijo='huffman'):
+        """
+        Exporta las estadísticas en el formato de texto de Prometheus.
+
+        Args:
+            prefijo (str): Prefijo de los nombres de las métricas
+
+        Returns:
+            str: Contadores por etapa, uno por línea
+        """
+        metricas = (
+            ('segundos', 'etapa_segundos_total', 'Tiempo de reloj acumulado por etapa'),
+            ('llamadas', 'etapa_llamadas_total', 'Ejecuciones de cada etapa'),
+            ('bytes', 'etapa_bytes_total', 'Bytes procesados por etapa'),
+            ('simbolos', 'etapa_simbolos_total', 'Símbolos procesados por etapa'),
+        )
+        lineas = []
+        for clave, nombre, ayuda in metricas:
+            metrica = f"{prefijo}_{nombre}"
+            lineas.append(f"# HELP {metrica} {ayuda}")
+            lineas.append(f"# TYPE {metrica} counter")
+            for etapa_nombre, estadisticas in self.etapas.items():
+                lineas.append(f'{metrica}{{etapa="{etapa_nombre}"}} {estadisticas[clave]}')
+        return '\n'.join(lineas) + '\n'
+
+@contextmanager
+def medir_etapas(registro=None):
+    """
+    Activa la instrumentación dentro de un bloque ``with``.
+
+    Args:
+        registro (RegistroEtapas): Registro donde acumular (por defecto, uno nuevo)
+
+    Yields:
+        RegistroEtapas: El registro con las etapas ejecutadas en el bloque
+    """
+    if registro is None:
+        registro = RegistroEtapas()
+    _destinos.append(registro)
+    try:
+        yield registro
+    finally:
+        _destinos.remove(registro)
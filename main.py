@@ -1,10 +1,21 @@
-import tkinter as tk
-from tkinter import filedialog, simpledialog, messagebox
 import os
 
+# tkinter se importa al crear la primera ventana (ver _cargar_tkinter()), así
+# que importar este módulo no requiere una pantalla ni paga la carga de Tk
+tk = filedialog = simpledialog = messagebox = None
+
+def _cargar_tkinter():
+    """Importa tkinter y sus diálogos la primera vez que se abre una ventana."""
+    global tk, filedialog, simpledialog, messagebox
+    if tk is None:
+        import tkinter
+        from tkinter import filedialog, simpledialog, messagebox
+        tk = tkinter
+
 # Visualización gráfica (Tkinter)
 class VisualizadorHuffman:
     def __init__(self, raiz, bits=""):
+        _cargar_tkinter()
         self.raiz = raiz
         self.bits = bits
         self.ventana = tk.Tk()
@@ -325,12 +336,12 @@ class VisualizadorHuffman:
 
 from codificador import (
     codificar_mensaje, 
+    codificar_archivo,
     analizar_compresion, 
     obtener_estadisticas_codificacion
 )
 from decodificador import (
-    decodificar_archivo, 
-    validar_archivo, 
+    ArchivoHuffman,
     analizar_archivo
 )
 
@@ -338,9 +349,10 @@ from decodificador import (
 
 class InterfazPrincipal:
     def __init__(self):
+        _cargar_tkinter()
         self.ventana = tk.Tk()
         self.ventana.title("The Turing's Forest")
-        self.ventana.geometry("700x500")
+        self.ventana.geometry("700x620")
         self.ventana.configure(bg='#f5f5f5')
         
         # Frame principal
@@ -375,6 +387,20 @@ class InterfazPrincipal:
         )
         boton_codificar.pack(pady=15)
         
+        # Botón para codificar un archivo de texto
+        boton_codificar_archivo = tk.Button(
+            frame_botones, 
+            text="Codificar Archivo", 
+            command=self.codificar_archivo,
+            width=25, height=3,
+            font=("Arial", 14, "bold"),
+            bg='#FF9800',
+            fg='white',
+            relief=tk.RAISED,
+            cursor='hand2'
+        )
+        boton_codificar_archivo.pack(pady=15)
+        
         # Botón para decodificar
         boton_decodificar = tk.Button(
             frame_botones, 
@@ -442,6 +468,42 @@ class InterfazPrincipal:
                 except Exception as e:
                     messagebox.showerror("Error", f"Error al codificar el mensaje: {str(e)}")
     
+    def codificar_archivo(self):
+        """Permite al usuario codificar un archivo de texto completo."""
+        origen = filedialog.askopenfilename(
+            filetypes=[("Archivos de texto", "*.txt *.log"), ("Todos los archivos", "*.*")],
+            title="Seleccionar archivo de texto para codificar"
+        )
+        
+        if not origen:
+            return
+        
+        archivo = filedialog.asksaveasfilename(
+            defaultextension=".bin",
+            filetypes=[("Archivos binarios", "*.bin"), ("Todos los archivos", "*.*")],
+            title="Guardar archivo codificado"
+        )
+        
+        if archivo:
+            try:
+                # Codificar en streaming, sin cargar el archivo en memoria
+                raiz, codigos, bits = codificar_archivo(origen, archivo)
+                
+                tamaño_original = os.path.getsize(origen)
+                tamaño_comprimido = os.path.getsize(archivo)
+                messagebox.showinfo(
+                    "Codificación Exitosa",
+                    f"Archivo codificado exitosamente!\n\n"
+                    f"Archivo guardado: {os.path.basename(archivo)}\n"
+                    f"Tamaño original: {tamaño_original} bytes\n"
+                    f"Tamaño comprimido: {tamaño_comprimido} bytes\n"
+                    f"Caracteres únicos: {len(codigos)}\n"
+                    f"Bits codificados: {bits}"
+                )
+                
+            except Exception as e:
+                messagebox.showerror("Error", f"Error al codificar el archivo: {str(e)}")
+    
     def decodificar_archivo(self):
         """Permite al usuario decodificar un archivo."""
         archivo = filedialog.askopenfilename(
@@ -451,14 +513,14 @@ class InterfazPrincipal:
         
         if archivo:
             try:
-                # Validar archivo primero
-                validacion = validar_archivo(archivo)
+                # Abrir el archivo una sola vez para validar y decodificar
+                archivo_huffman = ArchivoHuffman(archivo)
+                validacion = archivo_huffman.validar()
                 if not validacion['valido']:
                     messagebox.showerror("Error", f"Archivo inválido: {validacion['error']}")
                     return
                 
-                # Usar función del módulo de decodificación
-                mensaje, raiz, bits = decodificar_archivo(archivo)
+                mensaje, raiz, bits = archivo_huffman.decodificar()
                 
                 # Mostrar mensaje decodificado
                 messagebox.showinfo(